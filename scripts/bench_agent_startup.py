@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark AgentBuilder-style startup of many agents: one database client per
+agent vs. the shared process-wide client registry
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def run_mode(mode: str, agents: int, persist_directory: str):
+    """Create the agents in this process and print a JSON result line"""
+    from src import embedding_cache, vector_store
+    from src.agent_builder import Agent
+
+    config = {
+        "rag_settings": {
+            "embedding_model": "local-hashing",
+            "vector_store": "chroma",
+            "persist_directory": persist_directory
+        }
+    }
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    created = []
+    for i in range(agents):
+        if mode == "per-agent":
+            # Emulate the old behaviour: nothing is shared between agents
+            vector_store._chroma_clients.clear()
+            embedding_cache._caches.clear()
+            if hasattr(vector_store, "chromadb"):
+                # chromadb >= 0.4 also keeps its own per-path system cache
+                vector_store.chromadb.api.client.SharedSystemClient.clear_system_cache()
+        agent = Agent(name=f"agent {i}", description="benchmark agent", config=config)
+        agent.memory  # Make sure the memory is built even if it is lazy
+        created.append(agent)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "mode": mode,
+        "seconds": elapsed,
+        "rss_growth_mb": (rss_after - rss_before) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--mode", choices=["per-agent", "shared"], help=argparse.SUPPRESS)
+    parser.add_argument("--persist-directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.agents, args.persist_directory)
+        return
+
+    # Each mode runs in a fresh interpreter so RSS numbers do not bleed over
+    print(f"Starting {args.agents} agents")
+    for mode in ("per-agent", "shared"):
+        with tempfile.TemporaryDirectory() as persist_directory:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--agents", str(args.agents),
+                 "--persist-directory", persist_directory],
+                check=True, capture_output=True, text=True
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<10} {result['seconds']:8.3f} s   "
+            f"RSS growth {result['rss_growth_mb']:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
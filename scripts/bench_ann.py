@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the IVF index of the NumPy vector store against brute-force search:
+recall@k and queries/sec per nprobe on synthetic clustered embeddings
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ann_index import IVFIndex
+from src.vector_store import NumpyVectorStore
+
+
+def available_memory() -> int:
+    """Free physical memory in bytes (unbounded where it cannot be read)"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return sys.maxsize
+
+
+class ClusteredEmbeddings:
+    """Embedding-like data: points scattered around random topic centres"""
+
+    def __init__(self, dimensions: int, topics: int, spread: float, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.centres = self.rng.standard_normal((topics, dimensions)).astype(np.float32)
+        self.spread = spread
+
+    def sample(self, count: int) -> np.ndarray:
+        topics = self.rng.integers(0, len(self.centres), count)
+        noise = self.rng.standard_normal((count, self.centres.shape[1]), dtype=np.float32)
+        return self.centres[topics] + self.spread * noise
+
+
+def timed_queries(store: NumpyVectorStore, queries: np.ndarray, k: int):
+    """Query one at a time, as search_memory does; returns (ids, queries/sec)"""
+    ids = []
+    start = time.perf_counter()
+    for query in queries:
+        ids.append(store.query([query], n_results=k)["ids"][0])
+    return ids, len(queries) / (time.perf_counter() - start)
+
+
+def recall(found, truth) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def bench(size: int, args):
+    data = ClusteredEmbeddings(args.dimensions, args.topics, args.spread, seed=size)
+    ann = IVFIndex(nlist=args.nlist, min_size=args.min_size)
+    store = NumpyVectorStore(initial_capacity=size, ann=ann)
+
+    # Incremental adds, as add_memory/ingest do: training happens on the way
+    start = time.perf_counter()
+    for first in range(0, size, args.batch_size):
+        count = min(args.batch_size, size - first)
+        ids = [f"mem_{first + i}" for i in range(count)]
+        store.add(ids, data.sample(count), [""] * count, [{}] * count)
+    build = time.perf_counter() - start
+    print(f"\n{size} vectors x {args.dimensions} dims: built in {build:.1f} s "
+          f"({len(ann.centroids)} lists, last trained at {ann.trained_size})")
+
+    queries = data.sample(args.queries)
+    ann.min_size = size + 1  # exact search on the same store
+    truth, exact_qps = timed_queries(store, queries, args.k)
+    ann.min_size = args.min_size
+    print(f"  {'brute force':<12} recall@{args.k} 1.000   {exact_qps:8.1f} QPS")
+
+    for nprobe in args.nprobe:
+        ann.nprobe = nprobe
+        found, qps = timed_queries(store, queries, args.k)
+        print(f"  nprobe {nprobe:<5} recall@{args.k} {recall(found, truth):.3f}   "
+              f"{qps:8.1f} QPS   {qps / exact_qps:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100000,1000000",
+                        help="Comma-separated collection sizes")
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", default="1,2,4,8,16,32",
+                        help="Comma-separated nprobe values")
+    parser.add_argument("--nlist", type=int, default=0, help="0 = about sqrt(size)")
+    parser.add_argument("--min-size", type=int, default=10000,
+                        help="Size at which the index is first trained")
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=0.6,
+                        help="Noise around each topic centre (relative)")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    args.nprobe = [int(n) for n in args.nprobe.split(",")]
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        # The matrix plus a sampling batch must fit in memory
+        needed = size * args.dimensions * 4 + args.batch_size * args.dimensions * 16
+        if needed > available_memory():
+            print(f"\n{size} vectors x {args.dimensions} dims: skipped, needs "
+                  f"{needed / 2**30:.1f} GiB, {available_memory() / 2**30:.1f} GiB free")
+            continue
+        bench(size, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark opening a collection in fresh worker processes: the NumPy store's
+log replay (and optionally ChromaDB) vs. the memory-mapped snapshot store,
+and how much memory concurrent memmap workers share
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.vector_store import ChromaVectorStore, MemmapVectorStore, NumpyVectorStore
+from bench_ann import ClusteredEmbeddings, available_memory
+
+
+def memory_status() -> dict:
+    """This process's resident memory in MiB: private (anon), file-backed, and proportional share"""
+    status = {}
+    for path, keys in (("/proc/self/status", ("RssAnon", "RssFile")), ("/proc/self/smaps_rollup", ("Pss",))):
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    name, _, value = line.partition(":")
+                    if name in keys:
+                        status[name] = int(value.split()[0]) / 1024
+        except OSError:
+            pass
+    return status
+
+
+def open_store(kind: str, directory: str):
+    if kind == "numpy":
+        return NumpyVectorStore(directory)
+    if kind == "chroma":
+        return ChromaVectorStore("bench_memmap", directory)
+    return MemmapVectorStore(directory)
+
+
+def worker(kind: str, directory: str, queries, k: int, opened_all, finished_all, results):
+    """Open the store, then (once every worker has opened) run the queries"""
+    start = time.perf_counter()
+    store = open_store(kind, directory)
+    opened = time.perf_counter() - start
+
+    opened_all.wait()
+    start = time.perf_counter()
+    store.query([queries[0]], n_results=k)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for query in queries[1:]:
+        store.query([query], n_results=k)
+    qps = (len(queries) - 1) / (time.perf_counter() - start)
+    # Measure while every worker is still mapping the files
+    finished_all.wait()
+    results.put({"kind": kind, "open": opened, "first": first, "qps": qps, **memory_status()})
+
+
+def run_workers(kind: str, directory: str, queries, k: int, count: int):
+    context = multiprocessing.get_context("spawn")
+    opened_all, finished_all, results = context.Barrier(count + 1), context.Barrier(count), context.Queue()
+    processes = [
+        context.Process(target=worker, args=(kind, directory, queries, k, opened_all, finished_all, results))
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    opened_all.wait()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def report(label: str, reports):
+    mean = {key: sum(r.get(key, 0.0) for r in reports) / len(reports)
+            for key in ("open", "first", "qps", "RssAnon", "RssFile", "Pss")}
+    total_pss = sum(r.get("Pss", 0.0) for r in reports)
+    print(f"  {label:<22} open {mean['open'] * 1000:9.1f} ms   first query {mean['first'] * 1000:7.1f} ms   "
+          f"{mean['qps']:6.1f} QPS   private {mean['RssAnon']:6.0f} MiB   "
+          f"file {mean['RssFile']:6.0f} MiB   PSS total {total_pss:6.0f} MiB")
+
+
+def build(directory: str, args, chroma_directory: str = None):
+    data = ClusteredEmbeddings(args.dimensions, args.topics, args.spread)
+    numpy_store = NumpyVectorStore(os.path.join(directory, "numpy"), initial_capacity=args.size)
+    chroma_store = ChromaVectorStore("bench_memmap", chroma_directory) if chroma_directory else None
+    for first in range(0, args.size, args.batch_size):
+        count = min(args.batch_size, args.size - first)
+        ids = [f"mem_{first + i}" for i in range(count)]
+        vectors = data.sample(count)
+        documents = [f"memory {first + i} about topic {(first + i) % 97}" for i in range(count)]
+        metadatas = [{"type": "general", "importance": 0.5} for _ in range(count)]
+        numpy_store.add(ids, vectors, documents, metadatas)
+        if chroma_store is not None:
+            chroma_store.add(ids, vectors, documents, metadatas)
+
+    for dtype in args.dtypes:
+        start = time.perf_counter()
+        MemmapVectorStore(os.path.join(directory, f"memmap-{dtype}"), dtype=dtype).import_collection(numpy_store)
+        print(f"  exported {dtype} snapshot in {time.perf_counter() - start:.1f} s")
+    return data.sample(args.queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent memmap workers")
+    parser.add_argument("--dtypes", default="float32,float16", help="Comma-separated snapshot dtypes")
+    parser.add_argument("--chroma", action="store_true", help="Also time opening a ChromaDB copy")
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=0.6)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    args.dtypes = args.dtypes.split(",")
+
+    directory = tempfile.mkdtemp(prefix="bench_memmap_")
+    try:
+        print(f"{args.size} vectors x {args.dimensions} dims")
+        chroma_directory = os.path.join(directory, "chroma") if args.chroma else None
+        queries = build(directory, args, chroma_directory)
+        print("One fresh process each (page cache warm from the build):")
+
+        matrix_bytes = args.size * args.dimensions * 4
+        if matrix_bytes * 2 < available_memory():
+            report("numpy (log replay)", run_workers("numpy", os.path.join(directory, "numpy"),
+                                                     queries, args.k, 1))
+        else:
+            print(f"  numpy (log replay)     skipped, needs {matrix_bytes * 2 / 2**30:.1f} GiB")
+        if chroma_directory:
+            report("chroma", run_workers("chroma", chroma_directory, queries, args.k, 1))
+        for dtype in args.dtypes:
+            report(f"memmap {dtype}", run_workers("memmap", os.path.join(directory, f"memmap-{dtype}"),
+                                                  queries, args.k, 1))
+
+        print(f"{args.workers} concurrent workers:")
+        for dtype in args.dtypes:
+            report(f"memmap {dtype} x{args.workers}",
+                   run_workers("memmap", os.path.join(directory, f"memmap-{dtype}"), queries, args.k, args.workers))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
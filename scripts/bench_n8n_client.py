@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call n8n API latency: one connection per call vs. pooled session
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.n8n_client import N8NClient
+from n8n_stub_server import start_stub_server
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label, samples):
+    """Print latency stats in milliseconds"""
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<28} mean {statistics.mean(ms):7.3f} ms   "
+        f"p50 {percentile(ms, 50):7.3f} ms   p99 {percentile(ms, 99):7.3f} ms"
+    )
+
+
+def bench_unpooled(base_url, workflow_id, calls):
+    """Module-level requests calls, as the client did before pooling"""
+    headers = {"X-N8N-API-KEY": "bench", "Content-Type": "application/json"}
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = requests.post(
+            f"{base_url}/api/v1/workflows/{workflow_id}/execute",
+            headers=headers,
+            json={"query": "ping"}
+        )
+        response.raise_for_status()
+        response.json()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_pooled(client, workflow_id, calls):
+    """Calls through N8NClient's keep-alive session"""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.execute_workflow(workflow_id, {"query": "ping"})
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500, help="Calls per mode")
+    parser.add_argument("--base-url", help="Benchmark a real n8n instance instead of the stub")
+    parser.add_argument("--workflow-id", help="Workflow to execute when using --base-url")
+    args = parser.parse_args()
+
+    if args.base_url:
+        base_url, workflow_id = args.base_url, args.workflow_id
+    else:
+        server, base_url = start_stub_server()
+        workflow_id = None
+
+    client = N8NClient(api_key=os.getenv("N8N_API_KEY", "bench"), base_url=base_url)
+    if workflow_id is None:
+        workflow_id = client.create_workflow({"name": "bench", "nodes": [], "connections": {}})["id"]
+
+    # Warm up both paths so the first connection is not counted
+    bench_unpooled(base_url, workflow_id, 5)
+    bench_pooled(client, workflow_id, 5)
+
+    print(f"{args.calls} execute calls against {base_url}")
+    unpooled = bench_unpooled(base_url, workflow_id, args.calls)
+    pooled = bench_pooled(client, workflow_id, args.calls)
+    report("before (new connection)", unpooled)
+    report("after (pooled session)", pooled)
+    print(f"speedup (mean): {statistics.mean(unpooled) / statistics.mean(pooled):.2f}x")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
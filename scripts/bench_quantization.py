@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Report memory saved vs. recall lost for the NumPy store's quantizations,
+with and without exact re-scoring from the full-precision vector file
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.quantization import QUANTIZATIONS
+from src.vector_store import NumpyVectorStore
+from bench_ann import ClusteredEmbeddings, recall, timed_queries
+
+
+def build(directory: str, quantization: str, vectors, batch_size: int, pq_subvectors: int) -> NumpyVectorStore:
+    store = NumpyVectorStore(
+        directory,
+        initial_capacity=len(vectors),
+        quantization=quantization,
+        pq_subvectors=pq_subvectors
+    )
+    for first in range(0, len(vectors), batch_size):
+        batch = vectors[first:first + batch_size]
+        ids = [f"mem_{first + i}" for i in range(len(batch))]
+        store.add(ids, batch, [""] * len(batch), [{}] * len(batch))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4,
+                        help="Candidates re-scored per result")
+    parser.add_argument("--pq-subvectors", type=int, default=0, help="0 = dimensions / 16")
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=0.6)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    data = ClusteredEmbeddings(args.dimensions, args.topics, args.spread)
+    vectors = data.sample(args.size)
+    queries = data.sample(args.queries)
+    print(f"{args.size} vectors x {args.dimensions} dims, recall@{args.k} vs. exact float32, "
+          f"re-scoring {args.k * args.rescore_factor} candidates")
+    print(f"{'encoding':<9} {'memory':>10} {'saved':>7}   {'recall':>6} {'QPS':>7}   "
+          f"{'rescored':>8} {'QPS':>7}   build")
+
+    truth = None
+    baseline = None
+    for quantization in QUANTIZATIONS:
+        directory = tempfile.mkdtemp(prefix=f"bench_{quantization}_")
+        try:
+            start = time.perf_counter()
+            store = build(directory, quantization, vectors, args.batch_size, args.pq_subvectors)
+            elapsed = time.perf_counter() - start
+
+            store.rescore_factor = 1
+            approximate, approximate_qps = timed_queries(store, queries, args.k)
+            store.rescore_factor = args.rescore_factor
+            rescored, rescored_qps = timed_queries(store, queries, args.k)
+            if truth is None:
+                truth, baseline = approximate, store.memory_bytes
+
+            line = (f"{quantization:<9} {store.memory_bytes / 2**20:>7.1f} MiB "
+                    f"{1 - store.memory_bytes / baseline:>6.1%}   "
+                    f"{recall(approximate, truth):>6.3f} {approximate_qps:>7.1f}   ")
+            if store.quantizer.lossy:
+                line += f"{recall(rescored, truth):>8.3f} {rescored_qps:>7.1f}"
+            else:
+                line += f"{'-':>8} {'-':>7}"
+            print(f"{line}   {elapsed:.1f} s")
+            del store
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark AgentBuilder cold start from a persisted agent registry
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent_builder import Agent, AgentBuilder
+from src.agent_registry import AgentRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry_path = os.path.join(directory, "agents.jsonl")
+        config = {"agent_settings": {"registry_path": registry_path}}
+
+        registry = AgentRegistry(registry_path)
+        start = time.perf_counter()
+        for i in range(args.agents):
+            registry.put(Agent(
+                name=f"agent {i}",
+                description=f"Benchmark agent number {i}",
+                workflow_id=str(i)
+            ).to_dict())
+        write_seconds = time.perf_counter() - start
+
+        # The client is never contacted during startup; dummy credentials do
+        os.environ.setdefault("N8N_API_KEY", "bench")
+        os.environ.setdefault("N8N_BASE_URL", "http://127.0.0.1:9")
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            builder = AgentBuilder(config=config)
+            timings.append(time.perf_counter() - start)
+            assert len(builder.list_agents()) == args.agents
+
+        size_kb = os.path.getsize(registry_path) / 1024
+        print(f"{args.agents} agents, registry {size_kb:.0f} KB")
+        print(f"incremental writes: {write_seconds * 1e6 / args.agents:8.1f} us/agent")
+        print(f"cold start (best of {args.runs}): {min(timings) * 1000:8.1f} ms")
+        print(f"cold start (mean):      {sum(timings) / len(timings) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark run_agent latency with serial vs. pipelined memory write-back
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent_builder import AgentBuilder
+from src.embeddings import HashingEmbeddingProvider
+from src.rag_memory import RAGMemory
+from n8n_stub_server import start_stub_server
+from bench_n8n_client import percentile
+
+
+class RemoteLikeProvider(HashingEmbeddingProvider):
+    """Local embeddings with an artificial per-call delay, standing in for a remote API"""
+
+    def __init__(self, delay: float, dimensions: int = 1536):
+        super().__init__(dimensions)
+        self.delay = delay
+
+    def embed(self, texts):
+        time.sleep(self.delay)
+        return super().embed(texts)
+
+
+def build(directory: str, base_url: str, embed_latency: float) -> AgentBuilder:
+    """Create a builder with one agent wired to the stub server"""
+    os.environ["N8N_API_KEY"] = "bench"
+    os.environ["N8N_BASE_URL"] = base_url
+    config = {
+        "rag_settings": {
+            "vector_store": "numpy",
+            "persist_directory": directory,
+            "embedding_model": "local-hashing"
+        },
+        "agent_settings": {"registry_path": None}
+    }
+    builder = AgentBuilder(config=config)
+    agent = builder.create_agent(
+        name="bench",
+        description="benchmark agent",
+        workflow_template={"nodes": [], "connections": {}}
+    )
+    agent._memory = RAGMemory(
+        collection_name=agent.memory_collection,
+        config=config,
+        embedding_provider=RemoteLikeProvider(embed_latency)
+    )
+    return builder
+
+
+def bench(builder: AgentBuilder, calls: int, pipelined: bool):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        # Distinct queries per mode so the shared embedding cache never hits
+        query = f"{'pipelined' if pipelined else 'serial'} question number {i}"
+        builder.run_agent("bench", {"query": query}, pipelined=pipelined)
+        samples.append(time.perf_counter() - start)
+    flush_start = time.perf_counter()
+    builder.flush()
+    return samples, time.perf_counter() - flush_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--embed-latency", type=float, default=0.02,
+                        help="Simulated embedding API latency per call (seconds)")
+    parser.add_argument("--n8n-latency", type=float, default=0.01,
+                        help="Simulated n8n execution latency (seconds)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.n8n_latency)
+    print(f"{args.calls} run_agent calls, embed {args.embed_latency * 1000:.0f} ms, "
+          f"n8n {args.n8n_latency * 1000:.0f} ms")
+
+    for pipelined in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            builder = build(directory, base_url, args.embed_latency)
+            samples, flush_seconds = bench(builder, args.calls, pipelined)
+            ms = [s * 1000 for s in samples]
+            label = "pipelined" if pipelined else "serial"
+            print(
+                f"{label:<10} p50 {percentile(ms, 50):7.2f} ms   p99 {percentile(ms, 99):7.2f} ms   "
+                f"final flush {flush_seconds * 1000:7.1f} ms   "
+                f"stored {builder.get_agent('bench').memory.store.count()}"
+            )
+            builder.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
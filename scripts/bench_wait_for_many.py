@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark wait_for_many on a busy instance: the executions being waited for
+are buried under more than a page (250) of newer executions
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.async_n8n_client import AsyncN8NClient
+from src.n8n_client import N8NClient
+from n8n_stub_server import start_stub_server
+
+
+def start_executions(client: N8NClient, pending: int, newer: int):
+    """Start the executions to wait for, then newer ones of another workflow"""
+    waited = client.create_workflow({"name": "waited", "nodes": []})["id"]
+    busy = client.create_workflow({"name": "busy", "nodes": []})["id"]
+    ids = [client.execute_workflow(waited, {"i": i})["id"] for i in range(pending)]
+    for i in range(newer):
+        client.execute_workflow(busy, {"i": i})
+    return ids
+
+
+def report(label: str, stats):
+    print(f"  {label:<6} {stats.polls:3d} polls   {stats.list_requests:4d} list + "
+          f"{stats.get_requests:4d} single GETs   {stats.elapsed:5.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pending", type=int, default=50, help="Executions waited for")
+    parser.add_argument("--newer", type=int, default=1000, help="Newer executions listed before them")
+    parser.add_argument("--execution-duration", type=float, default=5.0,
+                        help="Simulated workflow run time (seconds)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(execution_duration=args.execution_duration)
+    config = {"n8n_settings": {"execution_poll_initial_interval": 0.1}}
+    print(f"Waiting for {args.pending} executions behind {args.newer} newer ones "
+          f"(each runs {args.execution_duration} s)")
+
+    client = N8NClient(api_key="bench", base_url=base_url, config=config)
+    ids = start_executions(client, args.pending, args.newer)
+    finished = client.wait_for_many(ids, timeout=60)
+    assert len(finished) == args.pending
+    report("sync", client.last_wait_stats)
+
+    async_client = AsyncN8NClient(api_key="bench", base_url=base_url, config=config)
+    ids = start_executions(client, args.pending, args.newer)
+
+    async def wait():
+        try:
+            return await async_client.wait_for_many(ids, timeout=60)
+        finally:
+            await async_client.aclose()
+
+    finished = asyncio.run(wait())
+    assert len(finished) == args.pending
+    report("async", async_client.last_wait_stats)
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
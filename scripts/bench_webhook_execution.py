@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark run_agent through the workflow webhook vs. the REST execute endpoint
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent_builder import AgentBuilder
+from n8n_stub_server import start_stub_server
+from bench_n8n_client import percentile
+
+TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "templates", "workflows", "basic_chat_agent.json"
+)
+
+
+def timed(calls: int, fn):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated server latency per request (seconds)")
+    parser.add_argument("--execution-duration", type=float, default=0.02,
+                        help="Simulated workflow run time (seconds)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.latency, execution_duration=args.execution_duration)
+    os.environ["N8N_API_KEY"] = "bench"
+    os.environ["N8N_BASE_URL"] = base_url
+
+    with open(TEMPLATE_PATH) as f:
+        template = json.load(f)
+
+    config = {
+        "agent_settings": {"registry_path": None},
+        "n8n_settings": {"use_webhooks": True, "execution_poll_initial_interval": 0.005}
+    }
+    builder = AgentBuilder(config=config)
+    agent = builder.create_agent(name="bench", description="benchmark agent", workflow_template=template)
+    client = builder.n8n_client
+    print(f"webhook: {agent.webhook_method} {agent.webhook_url}")
+    print(f"{args.calls} calls, latency {args.latency * 1000:.0f} ms, "
+          f"workflow run {args.execution_duration * 1000:.0f} ms")
+
+    def run(i):
+        builder.run_agent("bench", {"query": f"question {i}"}, use_memory=False)
+
+    def rest_until_finished(i):
+        execution = client.execute_workflow(agent.workflow_id, {"query": f"question {i}"})
+        client.wait_for_execution(execution["id"])
+
+    results = {}
+    config["n8n_settings"]["use_webhooks"] = False
+    results["REST execute (returns while running)"] = timed(args.calls, run)
+    results["REST execute + wait for result"] = timed(args.calls, rest_until_finished)
+
+    config["n8n_settings"]["use_webhooks"] = True
+    results["webhook, workflow inactive (404 fallback)"] = timed(args.calls, run)
+    builder.activate_agent("bench")
+    results["webhook (result in response)"] = timed(args.calls, run)
+
+    for label, ms in results.items():
+        print(f"{label:<44} p50 {percentile(ms, 50):7.2f} ms   p99 {percentile(ms, 99):7.2f} ms")
+
+    builder.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -79,13 +79,8 @@ Be friendly, helpful, and informative."""
         }
     ]
 
+    builder.add_agent_memories(agent_name=agent_name, items=knowledge_items)
     for i, item in enumerate(knowledge_items, 1):
-        memory_id = builder.add_agent_memory(
-            agent_name=agent_name,
-            content=item["content"],
-            metadata=item["metadata"],
-            importance=item["importance"]
-        )
         print(f"  ✓ Added memory {i}/{len(knowledge_items)}: {item['metadata']['category']}")
 
     # Activate the workflow
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Export a collection (ChromaDB or NumPy store) to a memory-mapped snapshot
+for the "memmap" vector store
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent_registry import AgentRegistry
+from src.vector_store import create_vector_store
+
+
+def load_config(path: str):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agent", help="Agent whose memory collection is exported")
+    parser.add_argument("--collection", help="Collection name (instead of --agent)")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--source", choices=("chroma", "numpy"),
+                        help="Backend to read (defaults to rag_settings.vector_store)")
+    parser.add_argument("--dtype", choices=("float32", "float16"),
+                        help="Matrix type (defaults to rag_settings.memmap_dtype)")
+    parser.add_argument("--batch-size", type=int, default=10000,
+                        help="Embeddings fetched per source call")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    rag_settings = config.get("rag_settings", {})
+
+    # Reading the registry directly avoids needing n8n credentials
+    if args.collection:
+        collection = args.collection
+    elif args.agent:
+        registry_path = config.get("agent_settings", {}).get("registry_path", "./data/agents.jsonl")
+        agents = AgentRegistry(registry_path).load() if registry_path else {}
+        if args.agent not in agents:
+            parser.error(f"Agent '{args.agent}' not found in {registry_path}")
+        collection = agents[args.agent]["memory_collection"]
+    else:
+        parser.error("one of --agent or --collection is required")
+
+    source_backend = args.source or rag_settings.get("vector_store", "chroma")
+    if source_backend == "memmap":
+        parser.error("the configured vector_store is already memmap; pass --source")
+    source = create_vector_store(collection, {
+        **config, "rag_settings": {**rag_settings, "vector_store": source_backend}
+    })
+    target = create_vector_store(collection, {
+        **config,
+        "rag_settings": {
+            **rag_settings,
+            "vector_store": "memmap",
+            "memmap_dtype": args.dtype or rag_settings.get("memmap_dtype", "float32")
+        }
+    })
+
+    print(f"Exporting {source.count()} memories of '{collection}' from {source_backend} "
+          f"to {target.persist_directory} ({target.dtype})")
+    start = time.perf_counter()
+    target.import_collection(source, batch_size=args.batch_size)
+    print(f"Exported {target.count()} memories in {time.perf_counter() - start:.2f} s")
+    print('Set "vector_store": "memmap" in rag_settings to serve from the snapshot')
+
+
+if __name__ == "__main__":
+    main()
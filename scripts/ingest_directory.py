@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Ingest a directory of documents into an agent's memory collection
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent_registry import AgentRegistry
+from src.ingestion import iter_source_files
+from src.rag_memory import RAGMemory
+
+
+def load_config(path: str):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", help="Directory to ingest (recursively)")
+    parser.add_argument("--agent", help="Agent whose memory collection receives the documents")
+    parser.add_argument("--collection", help="Collection name (instead of --agent)")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Extraction/chunking processes")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="Chunks per embedding batch and store write")
+    parser.add_argument("--chunk-size", type=int, help="Defaults to rag_settings.chunk_size")
+    parser.add_argument("--chunk-overlap", type=int, help="Defaults to rag_settings.chunk_overlap")
+    parser.add_argument("--no-recursive", action="store_true")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Keep chunks of previously ingested files that no longer exist")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+
+    # Reading the registry directly avoids needing n8n credentials
+    if args.collection:
+        collection = args.collection
+    elif args.agent:
+        registry_path = config.get("agent_settings", {}).get("registry_path", "./data/agents.jsonl")
+        agents = AgentRegistry(registry_path).load() if registry_path else {}
+        if args.agent not in agents:
+            parser.error(f"Agent '{args.agent}' not found in {registry_path}")
+        collection = agents[args.agent]["memory_collection"]
+    else:
+        parser.error("one of --agent or --collection is required")
+
+    files = list(iter_source_files(args.directory, recursive=not args.no_recursive))
+    print(f"Ingesting {len(files)} files from {args.directory} into '{collection}' "
+          f"with {args.workers} worker(s)")
+
+    def progress(stats):
+        print(f"\r  {stats.chunks} chunks, {stats.chunks_per_second:.0f} chunks/sec", end="", flush=True)
+
+    memory = RAGMemory(collection_name=collection, config=config)
+    stats = memory.ingest(
+        files,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        batch_size=args.batch_size,
+        on_batch=progress,
+        workers=args.workers,
+        prune=not args.no_prune
+    )
+    memory.store.persist()
+
+    print()
+    print(f"Sources:     {stats.sources} changed, {stats.unchanged_sources} unchanged, "
+          f"{stats.removed_sources} removed")
+    print(f"Chunks:      {stats.chunks} written, {stats.unchanged_chunks} already stored, "
+          f"{stats.duplicates} duplicates, {stats.deleted_chunks} deleted")
+    print(f"Elapsed:     {stats.elapsed:.2f} s")
+    print(f"Throughput:  {stats.chunks_per_second:.0f} chunks/sec, "
+          f"{stats.sources / stats.elapsed if stats.elapsed else 0:.1f} files/sec")
+    for name, error in stats.errors.items():
+        print(f"  failed: {name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
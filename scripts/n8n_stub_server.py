@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Minimal in-memory stand-in for the n8n REST API, used by the benchmark scripts
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubState:
+    """Workflows and executions held by the stub server"""
+
+    def __init__(self, latency: float = 0.0, execution_duration: float = 0.0):
+        self.latency = latency
+        self.execution_duration = execution_duration
+        self.lock = threading.Lock()
+        self.workflows = {}
+        self.executions = {}
+        self.next_id = 1
+
+    def new_id(self) -> str:
+        with self.lock:
+            value = str(self.next_id)
+            self.next_id += 1
+            return value
+
+    def view(self, execution, include_data: bool = True):
+        """Execution as the API reports it now; runs finish after execution_duration"""
+        finished = time.monotonic() >= execution["_finishes_at"]
+        view = {k: v for k, v in execution.items() if not k.startswith("_")}
+        view["finished"] = finished
+        view["status"] = "success" if finished else "running"
+        if not include_data:
+            view.pop("data", None)
+        return view
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the subset of n8n's API the client uses"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send_page(self, items, query):
+        """Send one page of a list endpoint using offset-based cursors"""
+        limit = min(int(query.get("limit", 100)), 250)
+        offset = int(query.get("cursor", 0))
+        page = items[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(items) else None
+        return self._send(200, {"data": page, "nextCursor": next_cursor})
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        state = self.state
+
+        match = re.fullmatch(r"/webhook/(.+)", path)
+        if match:
+            return self._webhook(method, match.group(1), query)
+
+        if path == "/api/v1/workflows":
+            if method == "GET":
+                workflows = list(state.workflows.values())
+                if "active" in query:
+                    workflows = [w for w in workflows if bool(w.get("active")) == (query["active"] == "true")]
+                return self._send_page(workflows, query)
+            if method == "POST":
+                workflow = {**self._read_json(), "id": state.new_id()}
+                state.workflows[workflow["id"]] = workflow
+                return self._send(200, workflow)
+
+        match = re.fullmatch(r"/api/v1/workflows/([^/]+)(/execute)?", path)
+        if match:
+            workflow = state.workflows.get(match.group(1))
+            if workflow is None:
+                return self._send(404, {"message": "Workflow not found"})
+            if match.group(2) and method == "POST":
+                execution = {
+                    "id": state.new_id(),
+                    "workflowId": workflow["id"],
+                    "data": self._read_json(),
+                    "_finishes_at": time.monotonic() + state.execution_duration
+                }
+                state.executions[execution["id"]] = execution
+                return self._send(200, state.view(execution))
+            if method == "GET":
+                return self._send(200, workflow)
+            if method == "PATCH":
+                workflow.update(self._read_json())
+                return self._send(200, workflow)
+            if method == "DELETE":
+                del state.workflows[workflow["id"]]
+                return self._send(200, workflow)
+
+        if path == "/api/v1/executions" and method == "GET":
+            include_data = query.get("includeData") == "true"
+            executions = [
+                state.view(e, include_data)
+                for e in sorted(state.executions.values(), key=lambda e: -int(e["id"]))
+                if "workflowId" not in query or e["workflowId"] == query["workflowId"]
+            ]
+            if "status" in query:
+                executions = [e for e in executions if e["status"] == query["status"]]
+            return self._send_page(executions, query)
+
+        match = re.fullmatch(r"/api/v1/executions/([^/]+)", path)
+        if match and method == "GET":
+            execution = state.executions.get(match.group(1))
+            if execution is None:
+                return self._send(404, {"message": "Execution not found"})
+            return self._send(200, state.view(execution, query.get("includeData") != "false"))
+
+        return self._send(404, {"message": "Not found"})
+
+    def _webhook(self, method: str, webhook_path: str, query):
+        """Answer like an active workflow with a Webhook trigger and a Respond node"""
+        # Always consume the body so the keep-alive connection stays usable
+        body = query if method == "GET" else self._read_json()
+        for workflow in list(self.state.workflows.values()):
+            if not workflow.get("active"):
+                continue
+            for node in workflow.get("nodes", []):
+                if node.get("type") != "n8n-nodes-base.webhook":
+                    continue
+                parameters = node.get("parameters", {})
+                node_path = parameters.get("path") or node.get("webhookId")
+                if node_path == webhook_path and parameters.get("httpMethod", "GET") == method:
+                    # "Respond to Webhook" answers once the workflow has run
+                    time.sleep(self.state.execution_duration)
+                    return self._send(200, {"output": f"Echo: {body.get('query', '')}"})
+        return self._send(404, {"message": f"The requested webhook \"{method} {webhook_path}\" is not registered."})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def start_stub_server(port: int = 0, latency: float = 0.0, execution_duration: float = 0.0):
+    """
+    Start the stub server on a background thread
+
+    Args:
+        port: Port to bind (0 picks a free port)
+        latency: Artificial per-request server latency in seconds
+        execution_duration: Seconds an execution stays "running"
+
+    Returns:
+        Tuple of (server, base_url)
+    """
+    state = StubState(latency, execution_duration)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5679
+    server, url = start_stub_server(port)
+    print(f"n8n stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Stress memory ID generation across many threads and processes and check
+that no two IDs collide
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.memory_ids import new_memory_id, new_memory_ids
+from src.rag_memory import RAGMemory
+
+
+def generate(count: int):
+    """Generate count IDs one at a time, as concurrent add_memory calls do"""
+    return [new_memory_id() for _ in range(count)]
+
+
+def threaded(threads: int, per_thread: int):
+    """IDs from threads sharing one process, each thread's list in order"""
+    barrier = threading.Barrier(threads)
+
+    def worker(_):
+        barrier.wait()
+        return generate(per_thread)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(worker, range(threads)))
+
+
+def process_worker(args):
+    """Bulk IDs in the main thread, then more from a burst of threads"""
+    threads, per_thread = args
+    bulk = [new_memory_ids(per_thread // 2) for _ in range(threads)]
+    sequences = threaded(threads, per_thread - per_thread // 2)
+    return [first + rest for first, rest in zip(bulk, sequences)]
+
+
+def multiprocess(method: str, processes: int, threads: int, per_thread: int):
+    """IDs from processes started with method, each running several threads"""
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        results = pool.map(process_worker, [(threads, per_thread)] * processes)
+        return [ids for per_process in results for ids in per_process]
+
+
+def check(label: str, sequences, elapsed: float = 0.0) -> bool:
+    """Report collisions and per-sequence ordering"""
+    total = sum(len(ids) for ids in sequences)
+    unique = len({memory_id for ids in sequences for memory_id in ids})
+    unordered = sum(1 for ids in sequences if ids != sorted(ids))
+    ok = unique == total and unordered == 0
+    rate = f"{total / elapsed:>10.0f} ids/sec" if elapsed else " " * 18
+    print(f"{label:<36} {total:>9} ids  {total - unique:>3} collisions  "
+          f"{unordered:>3} unordered  {rate}  {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def concurrent_writes(threads: int, per_thread: int) -> bool:
+    """add_memory from many threads into one collection: every write must land"""
+    with tempfile.TemporaryDirectory() as directory:
+        config = {
+            "rag_settings": {
+                "vector_store": "numpy",
+                "persist_directory": directory,
+                "embedding_model": "local-hashing",
+                "embedding_dimensions": 64
+            }
+        }
+        memory = RAGMemory(collection_name="stress_ids", config=config)
+        barrier = threading.Barrier(threads)
+
+        def worker(t):
+            barrier.wait()
+            return [memory.add_memory(f"thread {t} memory {i}") for i in range(per_thread)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            sequences = list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - start
+
+        ok = check(f"add_memory x {threads} threads", sequences, elapsed)
+        stored = memory.store.count()
+        if stored != threads * per_thread:
+            print(f"  stored {stored} of {threads * per_thread} memories  FAIL")
+            ok = False
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--per-thread", type=int, default=5000)
+    parser.add_argument("--writes-per-thread", type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+
+    start = time.perf_counter()
+    sequences = threaded(args.threads, args.per_thread)
+    results.append(check(f"{args.threads} threads", sequences, time.perf_counter() - start))
+
+    everything = list(sequences)
+    for method in multiprocessing.get_all_start_methods():
+        start = time.perf_counter()
+        sequences = multiprocess(method, args.processes, args.threads // 4 or 1, args.per_thread)
+        results.append(check(f"{args.processes} processes ({method})", sequences, time.perf_counter() - start))
+        everything.extend(sequences)
+
+    # Every run above shares one ID space: nothing may repeat across them
+    results.append(check("all of the above combined", everything))
+
+    results.append(concurrent_writes(args.threads, args.writes_per_thread))
+
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,26 @@ AI agent builder using n8n API with RAG memory capabilities
 """
 
 from .n8n_client import N8NClient
+from .async_n8n_client import AsyncN8NClient
+from .resilience import CircuitOpenError
 from .rag_memory import RAGMemory, MemoryItem
+from .vector_store import VectorStore, ChromaVectorStore, NumpyVectorStore, MemmapVectorStore
+from .embeddings import EmbeddingProvider, OpenAIEmbeddingProvider, HashingEmbeddingProvider
 from .agent_builder import Agent, AgentBuilder
 
 __all__ = [
     "N8NClient",
+    "AsyncN8NClient",
+    "CircuitOpenError",
     "RAGMemory",
     "MemoryItem",
+    "VectorStore",
+    "ChromaVectorStore",
+    "NumpyVectorStore",
+    "MemmapVectorStore",
+    "EmbeddingProvider",
+    "OpenAIEmbeddingProvider",
+    "HashingEmbeddingProvider",
     "Agent",
     "AgentBuilder"
 ]
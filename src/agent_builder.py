@@ -5,12 +5,17 @@ Creates and manages AI agents with n8n workflows and RAG memory.
 
 import os
 import json
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
+import requests
 from dotenv import load_dotenv
 
-from .n8n_client import N8NClient
+from .n8n_client import N8NClient, assign_webhook_paths
 from .rag_memory import RAGMemory
+from .agent_registry import AgentRegistry
+from .memory_writer import BackgroundMemoryWriter
 
 load_dotenv()
 
@@ -23,7 +28,10 @@ class Agent:
         name: str,
         description: str,
         workflow_id: Optional[str] = None,
-        memory_collection: Optional[str] = None
+        memory_collection: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        webhook_url: Optional[str] = None,
+        webhook_method: str = "POST"
     ):
         """
         Initialize an agent
@@ -33,15 +41,41 @@ class Agent:
             description: Agent description
             workflow_id: Associated n8n workflow ID
             memory_collection: Memory collection name
+            config: Application config passed on to the agent's memory
+            webhook_url: Production webhook URL of the workflow, if it has
+                a webhook trigger
+            webhook_method: HTTP method the webhook listens on
         """
         self.name = name
         self.description = description
         self.workflow_id = workflow_id
+        self.webhook_url = webhook_url
+        self.webhook_method = webhook_method
         self.memory_collection = memory_collection or f"agent_{name.lower().replace(' ', '_')}"
         self.created_at = datetime.now().isoformat()
 
-        # Initialize memory
-        self.memory = RAGMemory(collection_name=self.memory_collection)
+        # Memory is built on first access so that loading or listing agents
+        # never opens embedding or vector store clients
+        self.config = config
+        self._memory: Optional[RAGMemory] = None
+        self._memory_lock = threading.Lock()
+
+    @property
+    def memory(self) -> RAGMemory:
+        """Agent memory, created on first access"""
+        if self._memory is None:
+            with self._memory_lock:
+                if self._memory is None:
+                    self._memory = RAGMemory(
+                        collection_name=self.memory_collection,
+                        config=self.config
+                    )
+        return self._memory
+
+    @property
+    def memory_loaded(self) -> bool:
+        """Whether the memory has been created yet"""
+        return self._memory is not None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert agent to dictionary"""
@@ -49,19 +83,81 @@ class Agent:
             "name": self.name,
             "description": self.description,
             "workflow_id": self.workflow_id,
+            "webhook_url": self.webhook_url,
+            "webhook_method": self.webhook_method,
             "memory_collection": self.memory_collection,
             "created_at": self.created_at
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> "Agent":
+        """
+        Rebuild an agent from its dictionary form
+
+        Args:
+            data: Agent dictionary as produced by to_dict
+            config: Application config passed on to the agent's memory
+
+        Returns:
+            Agent (memory is still created lazily)
+        """
+        agent = cls(
+            name=data["name"],
+            description=data["description"],
+            workflow_id=data.get("workflow_id"),
+            memory_collection=data.get("memory_collection"),
+            config=config,
+            webhook_url=data.get("webhook_url"),
+            webhook_method=data.get("webhook_method", "POST")
+        )
+        agent.created_at = data.get("created_at", agent.created_at)
+        return agent
+
 
 class AgentBuilder:
     """Builds and manages AI agents"""
 
-    def __init__(self):
-        """Initialize the agent builder"""
-        self.n8n_client = N8NClient()
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the agent builder
+
+        Args:
+            config: Application config (defaults to config.json)
+        """
+        self.config = config if config is not None else self._load_config()
+        self.n8n_client = N8NClient(config=self.config)
         self.agents: Dict[str, Agent] = {}
-        self.config = self._load_config()
+        self._memory_writer: Optional[BackgroundMemoryWriter] = None
+        self._memory_writer_lock = threading.Lock()
+        self._shared_webhook_urls: Set[str] = set()
+
+        # Reload previously created agents; this only reads the registry
+        # file and never touches n8n or the vector store
+        registry_path = self.config.get("agent_settings", {}).get(
+            "registry_path", "./data/agents.jsonl"
+        )
+        self.registry = AgentRegistry(registry_path) if registry_path else None
+        if self.registry:
+            for name, data in self.registry.load().items():
+                self.agents[name] = Agent.from_dict(data, config=self.config)
+            self._drop_shared_webhooks()
+
+    def _drop_shared_webhooks(self):
+        """
+        Forget webhook URLs cached by more than one agent
+
+        Agents created before webhook paths were made unique kept their
+        template's path, which n8n routes to whichever of those workflows is
+        active. Such agents run through the REST endpoint.
+        """
+        owners: Dict[str, int] = {}
+        for agent in self.agents.values():
+            if agent.webhook_url:
+                owners[agent.webhook_url] = owners.get(agent.webhook_url, 0) + 1
+        self._shared_webhook_urls = {url for url, count in owners.items() if count > 1}
+        for agent in self.agents.values():
+            if agent.webhook_url in self._shared_webhook_urls:
+                agent.webhook_url = None
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration"""
@@ -92,23 +188,28 @@ class AgentBuilder:
         """
         # Create workflow if template provided
         workflow_id = None
+        webhook = None
         if workflow_template:
             workflow_data = {
                 "name": f"{name} Workflow",
-                "nodes": workflow_template.get("nodes", []),
+                "nodes": assign_webhook_paths(workflow_template.get("nodes", []), name),
                 "connections": workflow_template.get("connections", {}),
                 "settings": workflow_template.get("settings", {}),
                 "active": False
             }
             workflow = self.n8n_client.create_workflow(workflow_data)
             workflow_id = workflow["id"]
+            webhook = self.n8n_client.resolve_webhook(workflow if "nodes" in workflow else workflow_data)
 
         # Create agent
         agent = Agent(
             name=name,
             description=description,
-            workflow_id=workflow_id
+            workflow_id=workflow_id,
+            config=self.config
         )
+        if webhook:
+            agent.webhook_method, agent.webhook_url = webhook
 
         # Add initial instructions to memory
         if initial_instructions:
@@ -120,6 +221,8 @@ class AgentBuilder:
 
         # Store agent
         self.agents[name] = agent
+        if self.registry:
+            self.registry.put(agent.to_dict())
 
         return agent
 
@@ -131,11 +234,67 @@ class AgentBuilder:
         """List all agents"""
         return [agent.to_dict() for agent in self.agents.values()]
 
+    def activate_agent(self, agent_name: str) -> Agent:
+        """
+        Activate an agent's workflow and refresh its cached webhook URL
+
+        Production webhooks only answer while the workflow is active.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            The agent
+        """
+        agent = self.get_agent(agent_name)
+        if not agent:
+            raise ValueError(f"Agent '{agent_name}' not found")
+        if not agent.workflow_id:
+            raise ValueError(f"Agent '{agent_name}' has no workflow")
+
+        workflow = self.n8n_client.activate_workflow(agent.workflow_id)
+        if "nodes" in workflow:
+            webhook = self.n8n_client.resolve_webhook(workflow)
+            if webhook and webhook[1] in self._shared_webhook_urls:
+                webhook = None
+            agent.webhook_method, agent.webhook_url = webhook or ("POST", None)
+            if self.registry:
+                self.registry.put(agent.to_dict())
+        return agent
+
+    def _execute(self, agent: Agent, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run an agent's workflow
+
+        Uses the cached webhook URL when there is one (and
+        n8n_settings.use_webhooks is on), falling back to the REST execute
+        endpoint when the webhook is not registered, e.g. because the
+        workflow is inactive.
+
+        Args:
+            agent: Agent whose workflow to run
+            data: Workflow input
+
+        Returns:
+            The execution from the REST endpoint, or {"data": <webhook
+            response>} when the webhook answered
+        """
+        use_webhooks = self.config.get("n8n_settings", {}).get("use_webhooks", True)
+        if agent.webhook_url and use_webhooks:
+            try:
+                return {"data": self.n8n_client.call_webhook(agent.webhook_url, data, agent.webhook_method)}
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+
+        return self.n8n_client.execute_workflow(workflow_id=agent.workflow_id, data=data)
+
     def run_agent(
         self,
         agent_name: str,
         input_data: Dict[str, Any],
-        use_memory: bool = True
+        use_memory: bool = True,
+        pipelined: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Run an agent
@@ -144,6 +303,10 @@ class AgentBuilder:
             agent_name: Name of the agent to run
             input_data: Input data for the agent
             use_memory: Whether to use RAG memory
+            pipelined: Hand the interaction write-back to the background
+                memory writer and return as soon as n8n responds (defaults
+                to agent_settings.pipeline_memory_writes). Pipelined writes
+                become searchable once the writer flushes them.
 
         Returns:
             Execution result
@@ -155,13 +318,15 @@ class AgentBuilder:
         if not agent.workflow_id:
             raise ValueError(f"Agent '{agent_name}' has no workflow")
 
-        # Get relevant context from memory if enabled
+        # Get relevant context from memory if enabled, packed into the
+        # context token budget
         context = ""
         if use_memory and "query" in input_data:
             memories = agent.memory.search_memory(
                 query=input_data["query"],
                 top_k=self.config.get("rag_settings", {}).get("top_k_results", 5)
             )
+            memories = agent.memory.select_context(memories, self._max_context_tokens())
             context = "\n".join([m["content"] for m in memories])
 
         # Prepare execution data
@@ -172,24 +337,187 @@ class AgentBuilder:
         }
 
         # Execute workflow
-        result = self.n8n_client.execute_workflow(
-            workflow_id=agent.workflow_id,
-            data=execution_data
-        )
+        result = self._execute(agent, execution_data)
 
         # Store interaction in memory
         if use_memory:
-            agent.memory.add_memory(
-                content=f"Query: {input_data.get('query', '')}\nResponse: {result.get('data', '')}",
-                metadata={
-                    "type": "interaction",
-                    "execution_id": result.get("id"),
-                    "timestamp": datetime.now().isoformat()
-                }
-            )
+            interaction = self._interaction_memory(input_data, result)
+            if self._pipelined(pipelined):
+                self.memory_writer.submit(agent.memory, **interaction)
+            else:
+                agent.memory.add_memory(**interaction)
 
         return result
 
+    def run_agents_batch(
+        self,
+        items: List[Dict[str, Any]],
+        use_memory: bool = True,
+        pipelined: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run many agent inputs at once
+
+        Queries are embedded and searched in one batched call per agent,
+        workflows are executed concurrently up to
+        n8n_settings.max_concurrent_workflows, and interactions are written
+        back in bulk. A failing or malformed item does not abort the batch.
+
+        Args:
+            items: Dicts with "agent_name" and "input_data" (a dict) keys
+            use_memory: Whether to use RAG memory
+            pipelined: Hand interaction write-back to the background writer
+                (defaults to agent_settings.pipeline_memory_writes)
+
+        Returns:
+            One {"agent_name", "success", "result", "error"} dict per item,
+            in order; "error" is None on success
+        """
+        outcomes: List[Dict[str, Any]] = []
+        contexts = [""] * len(items)
+
+        runnable: List[int] = []
+        for i, item in enumerate(items):
+            agent_name = item.get("agent_name") if isinstance(item, dict) else None
+            outcomes.append({"agent_name": agent_name, "result": None, "error": None})
+            if not isinstance(item, dict):
+                outcomes[i]["error"] = "Item must be a dict"
+            elif not isinstance(item.get("input_data"), dict):
+                outcomes[i]["error"] = "Item needs an 'input_data' dict"
+            elif not isinstance(agent_name, str) or not self.get_agent(agent_name):
+                outcomes[i]["error"] = f"Agent '{agent_name}' not found"
+            elif not self.agents[agent_name].workflow_id:
+                outcomes[i]["error"] = f"Agent '{agent_name}' has no workflow"
+            else:
+                runnable.append(i)
+
+        # Get relevant context with one batched search per agent
+        if use_memory:
+            top_k = self.config.get("rag_settings", {}).get("top_k_results", 5)
+            by_agent: Dict[str, List[int]] = {}
+            for i in runnable:
+                if "query" in items[i]["input_data"]:
+                    by_agent.setdefault(items[i]["agent_name"], []).append(i)
+
+            max_context_tokens = self._max_context_tokens()
+            for agent_name, indices in by_agent.items():
+                memory = self.agents[agent_name].memory
+                try:
+                    hits = memory.search_memory_batch(
+                        [items[i]["input_data"]["query"] for i in indices],
+                        top_k=top_k
+                    )
+                except Exception as e:
+                    for i in indices:
+                        outcomes[i]["error"] = f"Memory search failed: {e}"
+                    continue
+                for i, memories in zip(indices, hits):
+                    memories = memory.select_context(memories, max_context_tokens)
+                    contexts[i] = "\n".join([m["content"] for m in memories])
+
+            runnable = [i for i in runnable if outcomes[i]["error"] is None]
+
+        # Execute workflows concurrently over the pooled session
+        max_workers = self.config.get("n8n_settings", {}).get("max_concurrent_workflows", 5)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    self._execute,
+                    self.agents[items[i]["agent_name"]],
+                    {
+                        **items[i]["input_data"],
+                        "context": contexts[i],
+                        "agent_name": items[i]["agent_name"]
+                    }
+                ): i
+                for i in runnable
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    outcomes[i]["result"] = future.result()
+                except Exception as e:
+                    outcomes[i]["error"] = str(e)
+
+        # Write interactions back in bulk, one batch per agent
+        if use_memory:
+            written: Dict[str, List[int]] = {}
+            for i in runnable:
+                if outcomes[i]["error"] is None:
+                    written.setdefault(items[i]["agent_name"], []).append(i)
+
+            for agent_name, indices in written.items():
+                memory = self.agents[agent_name].memory
+                interactions = [
+                    self._interaction_memory(items[i]["input_data"], outcomes[i]["result"])
+                    for i in indices
+                ]
+                try:
+                    if self._pipelined(pipelined):
+                        for interaction in interactions:
+                            self.memory_writer.submit(memory, **interaction)
+                    else:
+                        memory.add_memories(interactions)
+                except Exception as e:
+                    for i in indices:
+                        outcomes[i]["error"] = f"Memory write failed: {e}"
+
+        for outcome in outcomes:
+            outcome["success"] = outcome["error"] is None
+        return outcomes
+
+    def _max_context_tokens(self) -> int:
+        """Token budget for memory context passed to workflows"""
+        return int(self.config.get("rag_settings", {}).get("max_context_tokens", 2000))
+
+    def _pipelined(self, pipelined: Optional[bool]) -> bool:
+        """Resolve the pipelined flag against agent_settings"""
+        if pipelined is None:
+            return self.config.get("agent_settings", {}).get("pipeline_memory_writes", False)
+        return pipelined
+
+    @staticmethod
+    def _interaction_memory(input_data: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the memory recorded for one agent run"""
+        metadata = {"type": "interaction", "timestamp": datetime.now().isoformat()}
+        # Webhook runs don't report an execution ID
+        if result.get("id") is not None:
+            metadata["execution_id"] = result["id"]
+        return {
+            "content": f"Query: {input_data.get('query', '')}\nResponse: {result.get('data', '')}",
+            "metadata": metadata
+        }
+
+    @property
+    def memory_writer(self) -> BackgroundMemoryWriter:
+        """Background writer for pipelined memory writes, started on first use"""
+        if self._memory_writer is None:
+            with self._memory_writer_lock:
+                if self._memory_writer is None:
+                    settings = self.config.get("agent_settings", {})
+                    self._memory_writer = BackgroundMemoryWriter(
+                        max_queue_size=settings.get("memory_write_queue_size", 1000),
+                        batch_size=settings.get("memory_write_batch_size", 64)
+                    )
+        return self._memory_writer
+
+    def flush(self):
+        """Wait for all pipelined memory writes to land"""
+        if self._memory_writer is not None:
+            self._memory_writer.flush()
+
+    def close(self):
+        """Flush pending memory writes and release network connections"""
+        if self._memory_writer is not None:
+            self._memory_writer.close()
+        self.n8n_client.close()
+
+    def __enter__(self) -> "AgentBuilder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def add_agent_memory(
         self,
         agent_name: str,
@@ -219,11 +547,34 @@ class AgentBuilder:
             importance=importance
         )
 
+    def add_agent_memories(
+        self,
+        agent_name: str,
+        items: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Add many memories to an agent in batches
+
+        Args:
+            agent_name: Name of the agent
+            items: Memories as dicts with "content" and optional
+                "metadata" and "importance" keys
+
+        Returns:
+            Memory IDs
+        """
+        agent = self.get_agent(agent_name)
+        if not agent:
+            raise ValueError(f"Agent '{agent_name}' not found")
+
+        return agent.memory.add_memories(items)
+
     def search_agent_memory(
         self,
         agent_name: str,
         query: str,
-        top_k: int = 5
+        top_k: int = 5,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Search agent memory
@@ -232,6 +583,8 @@ class AgentBuilder:
             agent_name: Name of the agent
             query: Search query
             top_k: Number of results
+            mode: "vector", "lexical" or "hybrid" (defaults to
+                rag_settings.search_mode)
 
         Returns:
             Search results
@@ -240,7 +593,7 @@ class AgentBuilder:
         if not agent:
             raise ValueError(f"Agent '{agent_name}' not found")
 
-        return agent.memory.search_memory(query=query, top_k=top_k)
+        return agent.memory.search_memory(query=query, top_k=top_k, mode=mode)
 
     def create_workflow_from_template(
         self,
@@ -266,7 +619,7 @@ class AgentBuilder:
 
         workflow_data = {
             "name": f"{agent_name} - {template['name']}",
-            "nodes": template["nodes"],
+            "nodes": assign_webhook_paths(template["nodes"], agent_name),
             "connections": template["connections"],
             "settings": template.get("settings", {}),
             "active": False
@@ -0,0 +1,157 @@
+"""
+Agent Registry
+Durable JSON-lines index of agents so AgentBuilder survives restarts without
+re-creating workflows or re-embedding instructions.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# load compacts the file once it holds at least this many records and
+# COMPACT_RATIO times as many records as live agents
+COMPACT_MIN_RECORDS = 100
+COMPACT_RATIO = 4
+
+
+class AgentRegistry:
+    """Append-only JSON-lines store of agent records keyed by name"""
+
+    def __init__(self, path: str = "./data/agents.jsonl"):
+        """
+        Initialize the registry
+
+        Args:
+            path: JSON-lines file holding the registry
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._tail_checked = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Replay the registry file
+
+        Later records for the same name replace earlier ones and "delete"
+        records drop them. A torn final line from an interrupted write is
+        ignored. A file mostly made of superseded records is compacted.
+
+        Returns:
+            Mapping of agent name to its latest record
+        """
+        agents, records = self._replay()
+        if self.needs_compaction(records, len(agents)):
+            self._rewrite(agents)
+        return agents
+
+    @staticmethod
+    def needs_compaction(records: int, live: int) -> bool:
+        """Whether a file of this many records for this many live agents should be compacted"""
+        return records >= COMPACT_MIN_RECORDS and records >= COMPACT_RATIO * live
+
+    def _replay(self) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        agents: Dict[str, Dict[str, Any]] = {}
+        records = 0
+        if not os.path.exists(self.path):
+            return agents, records
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping unreadable line %d of agent registry %s", number, self.path)
+                    continue
+                records += 1
+                if record["op"] == "put":
+                    agents[record["agent"]["name"]] = record["agent"]
+                elif record["op"] == "delete":
+                    agents.pop(record["name"], None)
+        return agents, records
+
+    def _append(self, record: Dict[str, Any]):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._tail_checked:
+                self._repair_tail()
+                self._tail_checked = True
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def _repair_tail(self):
+        """
+        Make sure the file ends with a newline before appending to it
+
+        A write interrupted by a crash can leave a final line without its
+        newline; appending to it would fuse the next record onto the
+        fragment and lose both. A complete record just gets its newline, a
+        torn one is cut off.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if not end:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Find the start of the final line
+            start = end
+            while start > 0:
+                step = min(start, 4096)
+                f.seek(start - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    start = start - step + newline + 1
+                    break
+                start -= step
+            f.seek(start)
+            try:
+                json.loads(f.read())
+            except ValueError:
+                logger.warning("Cutting torn final line (%d bytes) from agent registry %s",
+                               end - start, self.path)
+                f.truncate(start)
+            else:
+                f.write(b"\n")
+
+    def put(self, agent: Dict[str, Any]):
+        """
+        Record an agent (insert or update)
+
+        Args:
+            agent: Agent record as produced by Agent.to_dict
+        """
+        self._append({"op": "put", "agent": agent})
+
+    def delete(self, name: str):
+        """
+        Record an agent's removal
+
+        Args:
+            name: Agent name
+        """
+        self._append({"op": "delete", "name": name})
+
+    def compact(self):
+        """Rewrite the file with one record per live agent"""
+        self._rewrite(self._replay()[0])
+
+    def _rewrite(self, agents: Dict[str, Dict[str, Any]]):
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for agent in agents.values():
+                    f.write(json.dumps({"op": "put", "agent": agent}, separators=(",", ":")) + "\n")
+            os.replace(tmp_path, self.path)
+            self._tail_checked = True
@@ -0,0 +1,203 @@
+"""
+ANN Index
+Inverted-file (IVF) approximate nearest-neighbour index in NumPy for the
+in-process vector store: spherical k-means coarse quantizer plus nprobe
+search over the closest lists.
+"""
+
+import math
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+DEFAULT_NPROBE = 8
+DEFAULT_ANN_MIN_SIZE = 10000
+DEFAULT_KMEANS_ITERATIONS = 10
+
+# Training sample per list, and the growth that triggers retraining
+TRAINING_POINTS_PER_LIST = 64
+RETRAIN_GROWTH = 4
+
+# Rows scored per matrix product while assigning, to bound temporaries
+ASSIGN_CHUNK_ROWS = 16384
+
+
+def auto_nlist(size: int) -> int:
+    """Number of lists for a collection size (about sqrt(n), at least 1)"""
+    return max(1, int(math.sqrt(size)))
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int = DEFAULT_KMEANS_ITERATIONS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity
+
+    Args:
+        vectors: Unit-length rows
+        k: Number of clusters (at most len(vectors))
+        iterations: Lloyd iterations
+        seed: Random seed for initialization and empty-cluster reseeding
+
+    Returns:
+        Unit-length centroids, one row per cluster
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign_lists(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=k)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], starts[filled], axis=0)
+        empty = int((~filled).sum())
+        if empty:
+            sums[~filled] = vectors[rng.choice(len(vectors), empty, replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+    return centroids
+
+
+def assign_lists(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest (highest cosine) centroid for each row"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        block = vectors[start:start + ASSIGN_CHUNK_ROWS]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+class IVFIndex:
+    """
+    Coarse quantizer for NumpyVectorStore
+
+    The store keeps each row's list number next to its vector; a query
+    scores only the rows in the nprobe lists whose centroids are nearest,
+    trading recall for latency. Training runs once the store reaches
+    min_size and again whenever it has grown RETRAIN_GROWTH times since;
+    in between, new rows are assigned to the nearest existing centroid as
+    they are added.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 0,
+        nprobe: int = DEFAULT_NPROBE,
+        min_size: int = DEFAULT_ANN_MIN_SIZE,
+        iterations: int = DEFAULT_KMEANS_ITERATIONS
+    ):
+        """
+        Initialize an untrained index
+
+        Args:
+            nlist: Number of lists (0 = about sqrt(n) at training time)
+            nprobe: Lists scanned per query (higher = better recall, slower)
+            min_size: Collection size below which searches stay exact
+            iterations: k-means iterations per training
+        """
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_size = min_size
+        self.iterations = iterations
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def needs_training(self, size: int) -> bool:
+        """Whether a store of this size should (re)train the quantizer"""
+        if size < self.min_size:
+            return False
+        return not self.trained or size >= RETRAIN_GROWTH * self.trained_size
+
+    def training_rows(self, size: int) -> np.ndarray:
+        """Rows to fit the centroids on, for a store of this size"""
+        sample_size = min(size, (self.nlist or auto_nlist(size)) * TRAINING_POINTS_PER_LIST)
+        if sample_size == size:
+            return np.arange(size)
+        return np.sort(np.random.default_rng(0).choice(size, sample_size, replace=False))
+
+    def train(self, sample: np.ndarray, size: int):
+        """
+        Fit the centroids
+
+        Args:
+            sample: Unit-length vectors of the store's training_rows
+            size: Store size the index is trained for
+        """
+        self.centroids = spherical_kmeans(sample, self.nlist or auto_nlist(size), self.iterations)
+        self.trained_size = size
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """List number of each row (-1 for every row while untrained)"""
+        if not self.trained:
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return assign_lists(vectors, self.centroids)
+
+    def probe(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Numbers of the nprobe lists nearest to a unit-length query"""
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        scores = self.centroids @ query
+        if nprobe == len(scores):
+            return np.arange(len(scores), dtype=np.int32)
+        return np.argpartition(-scores, nprobe - 1)[:nprobe].astype(np.int32)
+
+    def reset(self):
+        """Forget the centroids (the store was cleared)"""
+        self.centroids = None
+        self.trained_size = 0
+
+    def save(self, path: str):
+        """Write the centroids atomically (nothing while untrained)"""
+        if not self.trained:
+            return
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, centroids=self.centroids, trained_size=self.trained_size)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """Read centroids saved by save; returns whether there were any"""
+        if not os.path.exists(path):
+            self.reset()
+            return False
+        with np.load(path) as saved:
+            self.centroids = saved["centroids"].astype(np.float32)
+            self.trained_size = int(saved["trained_size"])
+        return True
+
+
+def create_ann_index(config: Optional[Dict[str, Any]] = None) -> Optional[IVFIndex]:
+    """
+    Create the ANN index selected by rag_settings.ann_index
+
+    Args:
+        config: Application config
+
+    Returns:
+        IVFIndex for "ivf", None for exact search (the default)
+    """
+    rag_settings = (config or {}).get("rag_settings", {})
+    kind = rag_settings.get("ann_index")
+    if not kind:
+        return None
+    if kind != "ivf":
+        raise ValueError(f"Unknown ANN index: {kind}")
+    return IVFIndex(
+        nlist=int(rag_settings.get("ivf_nlist", 0)),
+        nprobe=int(rag_settings.get("ivf_nprobe", DEFAULT_NPROBE)),
+        min_size=int(rag_settings.get("ann_min_size", DEFAULT_ANN_MIN_SIZE))
+    )
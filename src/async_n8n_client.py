@@ -0,0 +1,391 @@
+"""
+Async N8N API Client
+Asyncio counterpart of N8NClient built on a shared httpx.AsyncClient.
+"""
+
+import asyncio
+import json
+import os
+import httpx
+from typing import Dict, List, Optional, Any, Iterable, AsyncIterator, Tuple
+from dotenv import load_dotenv
+
+from .n8n_client import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_WEBHOOK_TIMEOUT,
+    DEFAULT_POLL_INITIAL_INTERVAL,
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_WORKFLOW_CHECK_INTERVAL,
+    EXECUTIONS_PAGE_LIMIT,
+    IDEMPOTENT_METHODS,
+    ExecutionWaiter,
+    WaitStats,
+    endpoint_key,
+    find_webhook,
+    is_server_failure
+)
+from .resilience import (
+    UNPROCESSED_STATUSES,
+    create_circuit_breakers,
+    create_retry_policy,
+    settings_from_config
+)
+
+load_dotenv()
+
+DEFAULT_MAX_CONCURRENT_WORKFLOWS = 5
+
+
+class AsyncN8NClient:
+    """Asyncio client for interacting with n8n API"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize async N8N client
+
+        Args:
+            api_key: n8n API key (defaults to N8N_API_KEY env var)
+            base_url: n8n instance URL (defaults to N8N_BASE_URL env var)
+            config: Application config; connection, timeout and concurrency
+                settings are read from its "n8n_settings" section, retry and
+                circuit breaker settings via resilience.settings_from_config
+        """
+        self.api_key = api_key or os.getenv("N8N_API_KEY")
+        self.base_url = (base_url or os.getenv("N8N_BASE_URL", "")).rstrip("/")
+
+        if not self.api_key:
+            raise ValueError("N8N_API_KEY not provided")
+        if not self.base_url:
+            raise ValueError("N8N_BASE_URL not provided")
+
+        self.headers = {
+            "X-N8N-API-KEY": self.api_key,
+            "Content-Type": "application/json"
+        }
+
+        settings = (config or {}).get("n8n_settings", {})
+        pool_maxsize = int(settings.get("pool_maxsize", DEFAULT_POOL_MAXSIZE))
+        self.max_concurrent_workflows = int(
+            settings.get("max_concurrent_workflows", DEFAULT_MAX_CONCURRENT_WORKFLOWS)
+        )
+
+        headers = dict(self.headers)
+        if not settings.get("keep_alive", True):
+            headers["Connection"] = "close"
+
+        connect_timeout = float(settings.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT))
+        self.webhook_timeout = httpx.Timeout(
+            float(settings.get("webhook_timeout", DEFAULT_WEBHOOK_TIMEOUT)),
+            connect=connect_timeout
+        )
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(
+                float(settings.get("read_timeout", DEFAULT_READ_TIMEOUT)),
+                connect=connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=max(pool_maxsize, self.max_concurrent_workflows),
+                max_keepalive_connections=pool_maxsize
+            )
+        )
+
+        resilience = settings_from_config(config)
+        self.retry_policy = create_retry_policy(resilience, "n8n", (httpx.TransportError,))
+        self.circuit_breakers = create_circuit_breakers(resilience)
+
+        # Bounds in-flight workflow executions; other API calls only share
+        # the connection pool limits. Created on first use: before Python 3.10
+        # a semaphore binds to the loop current at construction, which is not
+        # the one asyncio.run() starts later.
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.poll_initial_interval = float(
+            settings.get("execution_poll_initial_interval", DEFAULT_POLL_INITIAL_INTERVAL)
+        )
+        self.poll_backoff = float(settings.get("execution_poll_backoff", DEFAULT_POLL_BACKOFF))
+        self.poll_max_interval = float(
+            settings.get("workflow_check_interval", DEFAULT_WORKFLOW_CHECK_INTERVAL)
+        )
+        self.last_wait_stats: Optional[WaitStats] = None
+
+    def _execution_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight executions on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent_workflows)
+            self._slots_loop = loop
+        return self._slots
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        authenticated: bool = True,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request to the n8n API over the shared async client, with the
+        same retry and circuit breaker rules as N8NClient._request
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, or an absolute URL
+            authenticated: Send the API key header (see N8NClient._request)
+            **kwargs: Extra arguments passed to httpx
+
+        Returns:
+            Successful response
+        """
+        breaker = self.circuit_breakers.get(endpoint_key(method, path))
+
+        async def send() -> httpx.Response:
+            breaker.before_call()
+            try:
+                request = self.client.build_request(method, path, **kwargs)
+                if not authenticated:
+                    del request.headers["X-N8N-API-KEY"]
+                response = await self.client.send(request)
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if is_server_failure(e.response.status_code):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                raise
+            except httpx.TransportError:
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+            return response
+
+        if method.upper() in IDEMPOTENT_METHODS:
+            return await self.retry_policy.call_async(send)
+        return await self.retry_policy.call_async(
+            send, statuses=UNPROCESSED_STATUSES, exceptions=(httpx.ConnectError, httpx.ConnectTimeout)
+        )
+
+    async def aclose(self):
+        """Close all pooled connections"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncN8NClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _iter_pages(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily follow cursor pagination (see N8NClient._iter_pages)
+
+        When breaking out early, close the iterator (contextlib.aclosing)
+        so a pending prefetch is cancelled promptly.
+        """
+        async def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+            page_params = {**params, "cursor": cursor} if cursor else params
+            return (await self._request("GET", path, params=page_params)).json()
+
+        upcoming: Optional[asyncio.Task] = None
+        try:
+            page = await fetch(None)
+            while True:
+                cursor = page.get("nextCursor")
+                if prefetch and cursor:
+                    upcoming = asyncio.ensure_future(fetch(cursor))
+                    # An abandoned prefetch must not log "exception never retrieved"
+                    upcoming.add_done_callback(lambda task: task.cancelled() or task.exception())
+                for item in page["data"]:
+                    yield item
+                if not cursor:
+                    return
+                page = await upcoming if upcoming else await fetch(cursor)
+                upcoming = None
+        finally:
+            if upcoming and not upcoming.done():
+                upcoming.cancel()
+
+    def iter_workflows(
+        self,
+        active: Optional[bool] = None,
+        limit: int = 100,
+        prefetch: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all workflows (see N8NClient.iter_workflows)"""
+        params: Dict[str, Any] = {"limit": limit}
+        if active is not None:
+            params["active"] = "true" if active else "false"
+        return self._iter_pages("/api/v1/workflows", params, prefetch)
+
+    def iter_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        include_data: bool = False,
+        limit: int = 100,
+        prefetch: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over executions, newest first (see N8NClient.iter_executions)"""
+        params: Dict[str, Any] = {"limit": limit}
+        if workflow_id:
+            params["workflowId"] = workflow_id
+        if status:
+            params["status"] = status
+        if include_data:
+            params["includeData"] = "true"
+        return self._iter_pages("/api/v1/executions", params, prefetch)
+
+    async def list_workflows(self) -> List[Dict[str, Any]]:
+        """List all workflows (every page)"""
+        return [workflow async for workflow in self.iter_workflows(limit=EXECUTIONS_PAGE_LIMIT)]
+
+    async def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """Get a specific workflow by ID"""
+        response = await self._request("GET", f"/api/v1/workflows/{workflow_id}")
+        return response.json()
+
+    async def create_workflow(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new workflow"""
+        response = await self._request("POST", "/api/v1/workflows", json=workflow_data)
+        return response.json()
+
+    async def update_workflow(self, workflow_id: str, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing workflow"""
+        response = await self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json=workflow_data)
+        return response.json()
+
+    async def delete_workflow(self, workflow_id: str) -> bool:
+        """Delete a workflow"""
+        await self._request("DELETE", f"/api/v1/workflows/{workflow_id}")
+        return True
+
+    async def activate_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """Activate a workflow"""
+        response = await self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json={"active": True})
+        return response.json()
+
+    async def deactivate_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """Deactivate a workflow"""
+        response = await self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json={"active": False})
+        return response.json()
+
+    async def execute_workflow(self, workflow_id: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a workflow, waiting for a free slot under max_concurrent_workflows"""
+        async with self._execution_slots():
+            response = await self._request(
+                "POST",
+                f"/api/v1/workflows/{workflow_id}/execute",
+                json=data or {}
+            )
+        return response.json()
+
+    def resolve_webhook(self, workflow: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Resolve the production webhook URL of a workflow (see N8NClient.resolve_webhook)"""
+        webhook = find_webhook(workflow)
+        if webhook is None:
+            return None
+        method, path = webhook
+        return method, f"{self.base_url}/webhook/{path}"
+
+    async def call_webhook(self, url: str, data: Optional[Dict[str, Any]] = None, method: str = "POST") -> Any:
+        """
+        Trigger a workflow through its webhook (see N8NClient.call_webhook)
+
+        Shares the max_concurrent_workflows slots with execute_workflow.
+        """
+        if method.upper() == "GET":
+            params = {
+                key: value if isinstance(value, str) else json.dumps(value)
+                for key, value in (data or {}).items()
+            }
+            kwargs: Dict[str, Any] = {"params": params}
+        else:
+            kwargs = {"json": data or {}}
+
+        async with self._execution_slots():
+            response = await self._request(
+                method,
+                url,
+                authenticated=False,
+                timeout=self.webhook_timeout,
+                **kwargs
+            )
+        if not response.content:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    async def get_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get workflow executions (every page; use iter_executions to stream)"""
+        return [
+            execution async for execution in self.iter_executions(
+                workflow_id=workflow_id,
+                status=status,
+                limit=EXECUTIONS_PAGE_LIMIT,
+                prefetch=True
+            )
+        ]
+
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Get a specific execution by ID"""
+        response = await self._request("GET", f"/api/v1/executions/{execution_id}")
+        return response.json()
+
+    async def wait_for_execution(self, execution_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until an execution finishes (see N8NClient.wait_for_execution)"""
+        results = await self.wait_for_many([execution_id], timeout=timeout, include_data=True)
+        return results[str(execution_id)]
+
+    async def wait_for_many(
+        self,
+        execution_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        include_data: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until several executions finish (see N8NClient.wait_for_many)
+
+        Executions missing from the listed pages are fetched concurrently.
+        """
+        waiter = ExecutionWaiter(
+            execution_ids, timeout, include_data,
+            self.poll_initial_interval, self.poll_backoff, self.poll_max_interval
+        )
+        self.last_wait_stats = waiter.stats
+
+        while True:
+            params = waiter.begin_round()
+            while params is not None:
+                page = (await self._request("GET", "/api/v1/executions", params=params)).json()
+                params = waiter.add_page(params, page)
+
+            unlisted = waiter.unlisted()
+            if unlisted:
+                fetched = await asyncio.gather(*[self.get_execution(i) for i in unlisted])
+                for execution_id, execution in zip(unlisted, fetched):
+                    waiter.add_fetched(execution_id, execution)
+
+            delay = waiter.finish_round()
+            if delay is None:
+                return waiter.finished
+            await asyncio.sleep(delay)
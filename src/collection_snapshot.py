@@ -0,0 +1,211 @@
+"""
+Collection Snapshots
+Read-optimized on-disk format for a collection: a contiguous embedding
+matrix, an ID table and a separate record file, opened through memory maps
+so every process on a machine shares one page-cached copy.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .quantization import create_quantizer
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_DTYPES = ("float32", "float16")
+
+# Files of a snapshot directory
+HEADER_FILE = "header.json"
+VECTORS_FILE = "vectors.bin"          # count x dimensions, row-major
+IDS_FILE = "ids.npy"                  # UTF-8 ID of each row
+SORTED_IDS_FILE = "sorted_ids.npy"    # IDs sorted, for binary search
+SORTED_ROWS_FILE = "sorted_rows.npy"  # row of each sorted ID
+RECORDS_FILE = "records.jsonl"        # {"document", "metadata"} per row
+OFFSETS_FILE = "offsets.npy"          # byte offset of each record, plus the end
+
+
+class SnapshotWriter:
+    """
+    Write a snapshot directory row by row
+
+    Vectors and records are streamed to disk as they are appended; close
+    writes the ID tables and offsets, then moves the finished directory
+    into place, so a snapshot is never seen half-written.
+    """
+
+    def __init__(self, directory: str, dtype: str = "float32", dimensions: int = 0):
+        """
+        Start a snapshot
+
+        Args:
+            directory: Directory to create (replaced if it exists)
+            dtype: Matrix element type, one of SNAPSHOT_DTYPES
+            dimensions: Vector dimensions (0 = taken from the first append)
+        """
+        if dtype not in SNAPSHOT_DTYPES:
+            raise ValueError(f"Unknown snapshot dtype: {dtype}")
+        self.directory = directory
+        self.dtype = dtype
+        self.dimensions = dimensions
+        self._tmp_directory = f"{directory}.tmp"
+        shutil.rmtree(self._tmp_directory, ignore_errors=True)
+        os.makedirs(self._tmp_directory)
+        self._vectors = open(os.path.join(self._tmp_directory, VECTORS_FILE), "wb")
+        self._records = open(os.path.join(self._tmp_directory, RECORDS_FILE), "wb")
+        self._ids: List[str] = []
+        self._offsets: List[int] = [0]
+
+    def append(self, ids: Sequence[str], vectors: np.ndarray, documents: Sequence[str], metadatas):
+        """Add rows (vectors are stored as given, so normalize them first)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(ids):
+            return
+        if not self.dimensions:
+            self.dimensions = vectors.shape[1]
+        if vectors.shape != (len(ids), self.dimensions):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.dimensions}, got {vectors.shape}")
+
+        self._vectors.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        for document, metadata in zip(documents, metadatas):
+            line = (json.dumps({"document": document, "metadata": metadata}) + "\n").encode("utf-8")
+            self._records.write(line)
+            self._offsets.append(self._offsets[-1] + len(line))
+        self._ids.extend(ids)
+
+    def close(self):
+        """Finish the snapshot and move it into place"""
+        self._vectors.close()
+        self._records.close()
+        ids = np.array([memory_id.encode("utf-8") for memory_id in self._ids], dtype=np.bytes_)
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        if len(ids) > 1 and (sorted_ids[1:] == sorted_ids[:-1]).any():
+            self.abort()
+            raise ValueError("Duplicate memory IDs in snapshot")
+
+        def path(name: str) -> str:
+            return os.path.join(self._tmp_directory, name)
+
+        np.save(path(IDS_FILE), ids)
+        np.save(path(SORTED_IDS_FILE), sorted_ids)
+        np.save(path(SORTED_ROWS_FILE), order.astype(np.int64))
+        np.save(path(OFFSETS_FILE), np.array(self._offsets, dtype=np.int64))
+        with open(path(HEADER_FILE), "w") as f:
+            json.dump({
+                "format": SNAPSHOT_FORMAT,
+                "count": len(ids),
+                "dimensions": self.dimensions,
+                "dtype": self.dtype
+            }, f)
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(self._tmp_directory, self.directory)
+
+    def abort(self):
+        """Discard the partial snapshot"""
+        self._vectors.close()
+        self._records.close()
+        shutil.rmtree(self._tmp_directory, ignore_errors=True)
+
+
+class CollectionSnapshot:
+    """
+    Read-only view of a snapshot directory
+
+    Nothing is read up front: the matrix, ID tables and offsets are memory
+    maps and records are decoded only for the rows asked for, so opening
+    costs a few system calls at any collection size. Pages are loaded on
+    first use and shared, through the page cache, with every other process
+    that maps the same files.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open a snapshot written by SnapshotWriter
+
+        Args:
+            directory: Snapshot directory
+        """
+        with open(os.path.join(directory, HEADER_FILE), "r") as f:
+            header = json.load(f)
+        if header["format"] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {header['format']}")
+        self.directory = directory
+        self.count = header["count"]
+        self.dimensions = header["dimensions"]
+        self.dtype = header["dtype"]
+        self.quantizer = create_quantizer(self.dtype, self.dimensions)
+
+        def path(name: str) -> str:
+            return os.path.join(directory, name)
+
+        if not self.count:
+            # Empty files cannot be mapped
+            self._set_empty()
+            return
+
+        self.vectors = np.memmap(path(VECTORS_FILE), dtype=self.dtype, mode="r",
+                                 shape=(self.count, self.dimensions))
+        self.ids = np.load(path(IDS_FILE), mmap_mode="r")
+        self.sorted_ids = np.load(path(SORTED_IDS_FILE), mmap_mode="r")
+        self.sorted_rows = np.load(path(SORTED_ROWS_FILE), mmap_mode="r")
+        self.offsets = np.load(path(OFFSETS_FILE), mmap_mode="r")
+        with open(path(RECORDS_FILE), "rb") as f:
+            self._records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def empty(cls, dtype: str = "float32") -> "CollectionSnapshot":
+        """A snapshot with no rows and no directory (a collection never persisted)"""
+        snapshot = cls.__new__(cls)
+        snapshot.directory = None
+        snapshot.count = 0
+        snapshot.dimensions = 0
+        snapshot.dtype = dtype
+        snapshot.quantizer = create_quantizer(dtype, 0)
+        snapshot._set_empty()
+        return snapshot
+
+    def _set_empty(self):
+        self.vectors = np.zeros((0, self.dimensions), dtype=self.dtype)
+        self.ids = self.sorted_ids = np.zeros(0, dtype="S1")
+        self.sorted_rows = np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self._records: Any = b""
+
+    def __len__(self) -> int:
+        return self.count
+
+    def id(self, row: int) -> str:
+        return bytes(self.ids[row]).decode("utf-8")
+
+    def record(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        """Document and metadata of a row"""
+        record = json.loads(self._records[self.offsets[row]:self.offsets[row + 1]])
+        return record["document"], record["metadata"]
+
+    def rows_for(self, ids: Sequence[str]) -> np.ndarray:
+        """Row of each ID (-1 where absent), by binary search of the sorted table"""
+        if not len(ids) or not self.count:
+            return np.full(len(ids), -1, dtype=np.int64)
+        keys = np.array([memory_id.encode("utf-8") for memory_id in ids], dtype=np.bytes_)
+        positions = np.minimum(np.searchsorted(self.sorted_ids, keys), self.count - 1)
+        found = self.sorted_ids[positions] == keys
+        return np.where(found, self.sorted_rows[positions], -1)
+
+    def embeddings(self, rows) -> np.ndarray:
+        """float32 vectors of rows (an index array or slice)"""
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """Inner products of every row with each query, shape (len(queries), count)"""
+        return np.asarray(self.quantizer.scores(self.vectors, queries))
+
+    def close(self):
+        """Release the record map (the arrays are released with the object)"""
+        if isinstance(self._records, mmap.mmap):
+            self._records.close()
+
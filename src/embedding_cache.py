@@ -0,0 +1,199 @@
+"""
+Embedding Cache
+Content-addressed cache for embeddings with an in-memory LRU tier bounded by
+bytes and an optional SQLite tier on local disk.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by (model name, hash of text)"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for cached vectors in the LRU tier
+            path: SQLite file for the on-disk tier (disabled when None)
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """
+        Build the cache key for a text embedded with a model
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+
+        Returns:
+            Hex digest identifying the (model, text) pair
+        """
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up many keys, memory tier first and then disk
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to their vectors
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+
+            if missing and self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+
+            self.misses += sum(1 for key in missing if key not in found)
+
+        return found
+
+    def put_many(self, entries: Dict[str, np.ndarray]):
+        """
+        Store vectors in both tiers
+
+        Args:
+            entries: Mapping of cache keys to vectors
+        """
+        with self._lock:
+            for key, vector in entries.items():
+                self._remember(key, np.asarray(vector, dtype=np.float32))
+
+            if self._db is not None and entries:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, np.asarray(vector, dtype=np.float32).tobytes())
+                        for key, vector in entries.items()
+                    ]
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU tier and evict down to the byte budget"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous.nbytes
+
+        if vector.nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = vector
+        self.current_bytes += vector.nbytes
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory tier usage"""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes
+        }
+
+    def clear(self):
+        """Drop every cached vector from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def close(self):
+        """Close the on-disk tier"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_caches: Dict[Tuple[int, Optional[str]], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    path: Optional[str] = None
+) -> EmbeddingCache:
+    """
+    Get the process-wide cache for a (budget, path) pair, creating it lazily
+
+    Args:
+        max_bytes: Memory budget for the LRU tier
+        path: SQLite file for the on-disk tier
+
+    Returns:
+        Shared embedding cache
+    """
+    key = (max_bytes, os.path.abspath(path) if path else None)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(max_bytes=max_bytes, path=path)
+            _caches[key] = cache
+    return cache
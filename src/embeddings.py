@@ -0,0 +1,228 @@
+"""
+Embedding Providers
+Pluggable backends that turn batches of text into embedding matrices.
+"""
+
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .resilience import TokenBucket, create_retry_policy, settings_from_config
+from .tokens import estimate_tokens
+
+try:
+    from openai import APIConnectionError, APITimeoutError, OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+LOCAL_EMBEDDING_MODELS = ("local-hashing", "hashing")
+
+# OpenAI embeddings API per-request limits
+EMBEDDING_MAX_BATCH_ITEMS = 2048
+EMBEDDING_MAX_BATCH_TOKENS = 300000
+
+# Client-side rate limits, overridable through config.json "resilience_settings"
+DEFAULT_EMBEDDING_REQUESTS_PER_MINUTE = 3000
+DEFAULT_EMBEDDING_TOKENS_PER_MINUTE = 1000000
+
+
+class EmbeddingProvider:
+    """Interface for embedding backends"""
+
+    model_name: str = ""
+    dimensions: int = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 matrix with one row per text, in input order
+        """
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeddings from the OpenAI API, packed into as few requests as allowed
+
+    Requests pass through client-side request and token buckets and are
+    retried on 429/5xx and connection errors (see resilience).
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        dimensions: int = 1536,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the OpenAI backend
+
+        Args:
+            model_name: OpenAI embedding model
+            dimensions: Expected embedding size
+            config: Application config; retry and rate limit settings are
+                read via resilience.settings_from_config
+        """
+        if not OPENAI_AVAILABLE:
+            raise ImportError("openai not installed. Run: pip install openai")
+
+        # Retries are handled by retry_policy so they show up in the counters
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+        self.model_name = model_name
+        self.dimensions = dimensions
+
+        settings = settings_from_config(config)
+        self.retry_policy = create_retry_policy(
+            settings, "embeddings", (APIConnectionError, APITimeoutError)
+        )
+        requests_per_minute = settings.get("embedding_requests_per_minute", DEFAULT_EMBEDDING_REQUESTS_PER_MINUTE)
+        tokens_per_minute = settings.get("embedding_tokens_per_minute", DEFAULT_EMBEDDING_TOKENS_PER_MINUTE)
+        self.request_limiter = (
+            TokenBucket(requests_per_minute / 60, name="embeddings.requests") if requests_per_minute else None
+        )
+        self.token_limiter = (
+            TokenBucket(tokens_per_minute / 60, name="embeddings.tokens") if tokens_per_minute else None
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        rows: List[List[float]] = []
+        for batch in self.pack_requests(texts):
+            if self.request_limiter:
+                self.request_limiter.acquire()
+            if self.token_limiter:
+                self.token_limiter.acquire(sum(estimate_tokens(text) for text in batch))
+            response = self.retry_policy.call(
+                lambda: self.client.embeddings.create(model=self.model_name, input=batch)
+            )
+            # The API may return items out of order; index restores it
+            rows.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+
+        if not rows:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.asarray(rows, dtype=np.float32)
+
+    @staticmethod
+    def pack_requests(texts: List[str]) -> List[List[str]]:
+        """
+        Split texts into request-sized batches
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Batches that each fit in a single embeddings request
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if current and (
+                len(current) >= EMBEDDING_MAX_BATCH_ITEMS
+                or current_tokens + tokens > EMBEDDING_MAX_BATCH_TOKENS
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    CPU-only local embeddings via signed feature hashing
+
+    Word unigrams and bigrams are hashed into a fixed number of buckets with
+    sublinear term frequency, then L2-normalized. No model download or
+    network access is needed, which makes it suitable for offline tests and
+    benchmarks; quality is lexical rather than semantic.
+    """
+
+    _token_pattern = re.compile(r"\w+")
+
+    def __init__(self, dimensions: int = 1536):
+        """
+        Initialize the hashing backend
+
+        Args:
+            dimensions: Number of hash buckets (embedding size)
+        """
+        self.dimensions = dimensions
+        self.model_name = f"local-hashing-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = self._token_pattern.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in features),
+                dtype=np.uint32,
+                count=len(features)
+            )
+            buckets = (hashes % self.dimensions).astype(np.intp)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], buckets, signs)
+
+        # Sublinear term frequency keeps repeated words from dominating
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+_providers: Dict[Tuple[str, int], EmbeddingProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_embedding_provider(config: Optional[Dict[str, Any]] = None) -> EmbeddingProvider:
+    """
+    Get the process-wide embedding provider selected by config
+
+    The model comes from rag_settings.embedding_model, falling back to the
+    EMBEDDING_MODEL env var. "local-hashing" (or "hashing") selects the local
+    backend; anything else is treated as an OpenAI model name. Providers are
+    created once per (model, dimensions) and shared, so their rate limiters
+    apply process-wide.
+
+    Args:
+        config: Application config
+
+    Returns:
+        Embedding provider
+    """
+    rag_settings = (config or {}).get("rag_settings", {})
+    model = rag_settings.get("embedding_model") or os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+    dimensions = int(rag_settings.get("embedding_dimensions", 1536))
+
+    key = (model, dimensions)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            if model in LOCAL_EMBEDDING_MODELS:
+                provider = HashingEmbeddingProvider(dimensions)
+            else:
+                provider = OpenAIEmbeddingProvider(model, dimensions, config)
+            _providers[key] = provider
+    return provider
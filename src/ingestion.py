@@ -0,0 +1,549 @@
+"""
+Document Ingestion
+Generator pipeline that streams PDF, DOCX, HTML, Markdown and text sources
+into overlapping, de-duplicated chunks for RAGMemory.ingest.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+try:
+    import docx
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+try:
+    import markdown
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    MARKDOWN_AVAILABLE = False
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 200
+DEFAULT_INGEST_BATCH_SIZE = 256
+
+# Characters read from plain-text sources at a time
+TEXT_READ_SIZE = 64 * 1024
+
+FORMATS_BY_EXTENSION = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".html": "html",
+    ".htm": "html",
+    ".md": "markdown",
+    ".markdown": "markdown",
+}
+TEXT_EXTENSIONS = {".txt", ".text", ".rst", ".csv", ".log"}
+
+Source = Union[str, "os.PathLike[str]", BinaryIO, TextIO]
+
+_whitespace = re.compile(r"\s+")
+_trailing_word = re.compile(r"\s\S+\Z")
+
+
+@dataclass
+class Chunk:
+    """A piece of a source document ready to embed"""
+    source: str
+    index: int
+    text: str
+    hash: str
+
+    @property
+    def memory_id(self) -> str:
+        """Deterministic ID: identical text always maps to the same memory"""
+        return chunk_id(self.hash)
+
+    def to_memory(self, metadata: Optional[Dict[str, Any]] = None, importance: float = 1.0) -> Dict[str, Any]:
+        """As an item for RAGMemory.add_memories"""
+        return {
+            "id": self.memory_id,
+            "content": self.text,
+            "importance": importance,
+            "metadata": {
+                "type": "document",
+                "source": self.source,
+                "chunk_index": self.index,
+                "content_hash": self.hash,
+                **(metadata or {})
+            }
+        }
+
+
+@dataclass
+class IngestStats:
+    """Counters for one ingest run"""
+    sources: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+    # Incremental re-ingestion (see IngestManifest)
+    unchanged_sources: int = 0
+    unchanged_chunks: int = 0
+    removed_sources: int = 0
+    deleted_chunks: int = 0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sources": self.sources,
+            "chunks": self.chunks,
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "elapsed": self.elapsed,
+            "chunks_per_second": self.chunks_per_second,
+            "errors": dict(self.errors),
+            "unchanged_sources": self.unchanged_sources,
+            "unchanged_chunks": self.unchanged_chunks,
+            "removed_sources": self.removed_sources,
+            "deleted_chunks": self.deleted_chunks
+        }
+
+
+class IngestManifest:
+    """
+    Per-collection record of ingested sources
+
+    Maps each source file (absolute path) to the mtime and size it had when
+    ingested, the chunk_size and chunk_overlap it was chunked with, and the
+    content hashes of its chunks. Re-ingestion skips files whose fingerprint
+    is unchanged, so changing the chunking settings re-chunks every file, and
+    a chunk is deleted only when no recorded source still contains it.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        """
+        Load the manifest (an empty one if the file does not exist)
+
+        Args:
+            path: Manifest JSON file
+        """
+        self.path = path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.sources = json.load(f).get("sources", {})
+
+    @staticmethod
+    def fingerprint(path: str, chunk_size: int, chunk_overlap: int) -> Dict[str, Any]:
+        stat = os.stat(path)
+        return {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap
+        }
+
+    def is_unchanged(self, path: str, fingerprint: Dict[str, Any]) -> bool:
+        # Entries missing a field (older manifests) count as changed
+        entry = self.sources.get(path)
+        return entry is not None and all(entry.get(key) == value for key, value in fingerprint.items())
+
+    def referenced_hashes(self) -> set:
+        """Content hashes of every chunk of every recorded source"""
+        return {h for entry in self.sources.values() for h in entry.get("chunks", [])}
+
+    def record(self, path: str, fingerprint: Dict[str, Any], hashes: List[str]):
+        self.sources[path] = {**fingerprint, "chunks": hashes}
+
+    def remove(self, path: str):
+        self.sources.pop(path, None)
+
+    def save(self):
+        """Write atomically, so a crash never leaves a torn manifest"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "sources": self.sources}, f)
+        os.replace(tmp_path, self.path)
+
+
+def source_name(source: Source) -> str:
+    """Display name of a path or stream (streams use their .name if any)"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return str(getattr(source, "name", "<stream>"))
+
+
+def detect_format(source: Source) -> str:
+    """Document format from the source's file extension ("text" by default)"""
+    extension = os.path.splitext(source_name(source))[1].lower()
+    return FORMATS_BY_EXTENSION.get(extension, "text")
+
+
+def _html_text(html: str) -> str:
+    if not BS4_AVAILABLE:
+        raise ImportError("beautifulsoup4 not installed. Run: pip install beautifulsoup4")
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style"]):
+        element.decompose()
+    return soup.get_text(" ")
+
+
+def _open_binary(source: Source) -> BinaryIO:
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb")
+    return source
+
+
+def _open_text(source: Source) -> TextIO:
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "r", encoding="utf-8", errors="replace")
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding="utf-8", errors="replace")
+
+
+def _iter_text(source: Source) -> Iterator[str]:
+    # Blocks end on whitespace: a word cut off by a read is held back until
+    # the next one, as chunk_text joins blocks with a space. A run without
+    # whitespace longer than a read is passed on as is, so memory stays
+    # bounded by TEXT_READ_SIZE.
+    stream = _open_text(source)
+    try:
+        partial = ""
+        while True:
+            block = stream.read(TEXT_READ_SIZE)
+            if not block:
+                if partial:
+                    yield partial
+                return
+            block = partial + block
+            partial = ""
+            cut = _trailing_word.search(block)
+            if cut and len(block) - cut.start() < TEXT_READ_SIZE:
+                block, partial = block[:cut.start()], block[cut.start():]
+            if block:
+                yield block
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def _iter_markdown(source: Source) -> Iterator[str]:
+    # Paragraph by paragraph, so a long document never sits in memory whole
+    def render(lines: List[str]) -> str:
+        text = "".join(lines)
+        if MARKDOWN_AVAILABLE and BS4_AVAILABLE:
+            return _html_text(markdown.markdown(text))
+        return text  # Raw Markdown is still readable text
+
+    stream = _open_text(source)
+    try:
+        paragraph: List[str] = []
+        size = 0
+        for line in stream:
+            if line.strip():
+                paragraph.append(line)
+                size += len(line)
+                if size < TEXT_READ_SIZE:
+                    continue
+            if paragraph:
+                yield render(paragraph)
+                paragraph, size = [], 0
+        if paragraph:
+            yield render(paragraph)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def _iter_pdf(source: Source) -> Iterator[str]:
+    if not PYPDF_AVAILABLE:
+        raise ImportError("pypdf not installed. Run: pip install pypdf")
+    stream = _open_binary(source)
+    try:
+        for page in PdfReader(stream).pages:
+            yield page.extract_text() or ""
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def _iter_docx(source: Source) -> Iterator[str]:
+    if not DOCX_AVAILABLE:
+        raise ImportError("python-docx not installed. Run: pip install python-docx")
+    document = docx.Document(source if not isinstance(source, os.PathLike) else os.fspath(source))
+    for paragraph in document.paragraphs:
+        yield paragraph.text
+    for table in document.tables:
+        for row in table.rows:
+            yield " | ".join(cell.text for cell in row.cells)
+
+
+def _iter_html(source: Source) -> Iterator[str]:
+    # HTML has to be parsed as a whole; pages are small compared to PDFs
+    yield _html_text("".join(_iter_text(source)))
+
+
+_EXTRACTORS = {
+    "pdf": _iter_pdf,
+    "docx": _iter_docx,
+    "html": _iter_html,
+    "markdown": _iter_markdown,
+    "text": _iter_text,
+}
+
+
+def extract_text(source: Source, format: Optional[str] = None) -> Iterator[str]:
+    """
+    Stream the text of a document in blocks (pages, paragraphs, reads)
+
+    Args:
+        source: File path or open stream
+        format: "pdf", "docx", "html", "markdown" or "text" (detected from
+            the file extension when omitted)
+
+    Returns:
+        Iterator of text blocks
+    """
+    format = format or detect_format(source)
+    if format not in _EXTRACTORS:
+        raise ValueError(f"Unsupported document format: {format}")
+    return _EXTRACTORS[format](source)
+
+
+def _check_chunking(chunk_size: int, chunk_overlap: int):
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_overlap must be at least 0 and smaller than chunk_size")
+
+
+def chunk_text(
+    blocks: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> Iterator[str]:
+    """
+    Split streamed text into overlapping chunks of at most chunk_size characters
+
+    Whitespace is collapsed, and chunks end (and overlaps start) on word
+    boundaries when there is one nearby. Only about one chunk of text is
+    buffered at a time. Blocks are joined with a space, so they should break
+    between words, as the blocks from extract_text do.
+
+    Args:
+        blocks: Text blocks, e.g. from extract_text
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Characters repeated between consecutive chunks
+
+    Returns:
+        Iterator of chunks
+    """
+    _check_chunking(chunk_size, chunk_overlap)
+
+    buffer = ""
+    carried = 0  # Leading characters of buffer already emitted as overlap
+
+    for block in blocks:
+        block = _whitespace.sub(" ", block).strip()
+        if not block:
+            continue
+        buffer = f"{buffer} {block}" if buffer else block
+
+        while len(buffer) > chunk_size:
+            # End on the last space in the final fifth of the window
+            end = buffer.rfind(" ", chunk_size * 4 // 5, chunk_size + 1)
+            if end <= 0:
+                end = chunk_size
+            yield buffer[:end].strip()
+
+            start = end
+            if chunk_overlap:
+                start = max(end - chunk_overlap, 1)
+                space = buffer.find(" ", start, end)
+                if space != -1:
+                    start = space + 1
+            rest = buffer[start:]
+            buffer = rest.lstrip()
+            carried = max(end - start - (len(rest) - len(buffer)), 0)
+
+    if len(buffer.strip()) > carried:
+        yield buffer.strip()
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a chunk's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(content_hash: str) -> str:
+    """Memory ID of the chunk with this content hash"""
+    return f"chunk_{content_hash[:32]}"
+
+
+def iter_chunks(
+    sources: Iterable[Source],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    stats: Optional[IngestStats] = None
+) -> Iterator[Chunk]:
+    """
+    Extract and chunk sources one after another
+
+    A source that fails to extract is recorded in stats.errors and skipped.
+
+    Args:
+        sources: File paths or open streams
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Characters repeated between consecutive chunks
+        stats: Counters to update
+
+    Returns:
+        Iterator of chunks
+    """
+    _check_chunking(chunk_size, chunk_overlap)
+    for source in sources:
+        name = source_name(source)
+        if stats is not None:
+            stats.sources += 1
+        try:
+            pieces = chunk_text(extract_text(source), chunk_size, chunk_overlap)
+            for index, text in enumerate(pieces):
+                yield Chunk(source=name, index=index, text=text, hash=content_hash(text))
+        except ImportError:
+            raise
+        except Exception as e:
+            if stats is None:
+                raise
+            stats.errors[name] = str(e)
+
+
+def _chunk_file(path: str, chunk_size: int, chunk_overlap: int) -> Tuple[List[Chunk], Optional[str]]:
+    """Worker-process task: every chunk of one file, or the extraction error"""
+    try:
+        return [
+            Chunk(source=path, index=index, text=text, hash=content_hash(text))
+            for index, text in enumerate(chunk_text(extract_text(path), chunk_size, chunk_overlap))
+        ], None
+    except ImportError:
+        raise
+    except Exception as e:
+        return [], str(e)
+
+
+def iter_chunks_parallel(
+    sources: Iterable[Source],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    workers: Optional[int] = None,
+    stats: Optional[IngestStats] = None
+) -> Iterator[Chunk]:
+    """
+    Extract and chunk file paths in a process pool
+
+    Same output as iter_chunks, in the same order. Only a window of
+    2 * workers files is in flight, so memory is bounded by the chunks of
+    those files. Open streams cannot be sent to other processes and are
+    chunked in the calling process.
+
+    Args:
+        sources: File paths or open streams
+        chunk_size: Maximum chunk length in characters
+        chunk_overlap: Characters repeated between consecutive chunks
+        workers: Worker processes (defaults to the CPU count)
+        stats: Counters to update
+
+    Returns:
+        Iterator of chunks
+    """
+    _check_chunking(chunk_size, chunk_overlap)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[str, Future]] = deque()
+
+        def drain(limit: int) -> Iterator[Chunk]:
+            while len(pending) > limit:
+                name, future = pending.popleft()
+                chunks, error = future.result()
+                if error is not None:
+                    if stats is None:
+                        raise RuntimeError(f"Failed to ingest {name}: {error}")
+                    stats.errors[name] = error
+                yield from chunks
+
+        for source in sources:
+            if not isinstance(source, (str, os.PathLike)):
+                yield from drain(0)
+                yield from iter_chunks([source], chunk_size, chunk_overlap, stats)
+                continue
+            if stats is not None:
+                stats.sources += 1
+            path = os.fspath(source)
+            pending.append((path, pool.submit(_chunk_file, path, chunk_size, chunk_overlap)))
+            yield from drain(2 * workers)
+
+        yield from drain(0)
+
+
+def iter_source_files(directory: str, recursive: bool = True) -> Iterator[str]:
+    """
+    List ingestible files under a directory, in sorted order
+
+    Args:
+        directory: Root directory
+        recursive: Descend into subdirectories
+
+    Returns:
+        Iterator of file paths with a supported extension
+    """
+    extensions = set(FORMATS_BY_EXTENSION) | TEXT_EXTENSIONS
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".")) if recursive else []
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(root, name)
+
+
+def dedupe_chunks(chunks: Iterable[Chunk], stats: Optional[IngestStats] = None) -> Iterator[Chunk]:
+    """Drop chunks whose text was already seen in this run"""
+    seen = set()
+    for chunk in chunks:
+        if chunk.hash in seen:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        seen.add(chunk.hash)
+        yield chunk
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
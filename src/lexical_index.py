@@ -0,0 +1,211 @@
+"""
+Lexical Index
+In-memory BM25 inverted index over a collection's documents, maintained
+incrementally as memories are added and deleted.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_BM25_K1 = 1.2
+DEFAULT_BM25_B = 0.75
+DEFAULT_RRF_K = 60
+
+# Words, and compounds such as SKUs, order numbers or versions
+# ("SKU-4411-B", "INV/2024/0042", "v1.2.3") kept as one token as well
+_WORD_PATTERN = re.compile(r"\w+")
+# A word can only end at a non-word character, so a plain word fails in
+# linear time without possessive quantifiers (which need Python 3.11)
+_COMPOUND_PATTERN = re.compile(r"\b\w+(?:[-./#:]\w+)+")
+
+# Process-wide registry so every RAGMemory on a collection shares one index
+_indexes: Dict[Hashable, "BM25Index"] = {}
+_indexes_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms
+
+    A compound token is indexed whole and as its parts, so "SKU-4411"
+    matches both "sku-4411" and "4411".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms with repeats: words, then compounds
+    """
+    text = text.lower()
+    return _WORD_PATTERN.findall(text) + _COMPOUND_PATTERN.findall(text)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = DEFAULT_RRF_K) -> Dict[str, float]:
+    """
+    Fuse rankings with reciprocal rank fusion
+
+    Each ranking contributes 1 / (k + rank) to an item's score (rank from
+    1), so an item near the top of either list ranks well without the two
+    lists' raw scores needing to be comparable.
+
+    Args:
+        rankings: Item IDs per ranking, best first
+        k: Damping constant (60 in the original paper)
+
+    Returns:
+        Fused score per item
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index
+
+    Documents occupy integer slots; each term's posting list maps slot to
+    term frequency. A query turns its terms' posting lists into arrays and
+    accumulates scores into one dense vector, so scoring is vectorized
+    however many documents contain the terms. Adding an existing ID
+    replaces it, which keeps updates idempotent.
+    """
+
+    def __init__(self, k1: float = DEFAULT_BM25_K1, b: float = DEFAULT_BM25_B):
+        """
+        Initialize an empty index
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 = none, 1 = full)
+        """
+        self.k1 = k1
+        self.b = b
+        # Set once the index holds the whole collection (see RAGMemory)
+        self.built = False
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._terms: List[Tuple[str, ...]] = []
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._free: List[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._slots
+
+    def add(self, ids: Sequence[str], documents: Sequence[str]):
+        """Index documents (replacing any already indexed under the same ID)"""
+        with self.lock:
+            self.remove([memory_id for memory_id in ids if memory_id in self._slots])
+            for memory_id, document in zip(ids, documents):
+                terms = tokenize(document)
+                counts = Counter(terms)
+
+                slot = self._free.pop() if self._free else self._new_slot()
+                self._slots[memory_id] = slot
+                self._ids[slot] = memory_id
+                self._terms[slot] = tuple(counts)
+                self._lengths[slot] = len(terms)
+                self._total_length += len(terms)
+                for term, count in counts.items():
+                    self._postings.setdefault(term, {})[slot] = count
+
+    def _new_slot(self) -> int:
+        slot = len(self._ids)
+        if slot == len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros(max(1024, slot), dtype=np.float64)])
+        self._ids.append(None)
+        self._terms.append(())
+        return slot
+
+    def remove(self, ids: Sequence[str]):
+        """Remove documents by ID (unknown IDs are ignored)"""
+        with self.lock:
+            for memory_id in ids:
+                slot = self._slots.pop(memory_id, None)
+                if slot is None:
+                    continue
+                for term in self._terms[slot]:
+                    postings = self._postings[term]
+                    del postings[slot]
+                    if not postings:
+                        del self._postings[term]
+                self._total_length -= int(self._lengths[slot])
+                self._lengths[slot] = 0
+                self._ids[slot] = None
+                self._terms[slot] = ()
+                self._free.append(slot)
+
+    def clear(self):
+        """Remove every document"""
+        with self.lock:
+            self._reset()
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank documents by BM25 score for a query
+
+        Args:
+            query: Query text
+            limit: Maximum results (all matching documents when None)
+
+        Returns:
+            (memory ID, score) pairs, best first; only documents sharing
+            at least one term with the query
+        """
+        with self.lock:
+            count = len(self._slots)
+            if not count:
+                return []
+            average_length = self._total_length / count or 1.0
+            lengths = self._lengths[:len(self._ids)]
+            norms = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+
+            scores = np.zeros(len(self._ids), dtype=np.float64)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                tf = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+                idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                scores[slots] += idf * tf * (self.k1 + 1.0) / (tf + norms[slots])
+
+            matched = np.flatnonzero(scores > 0)
+            if limit is not None and len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            matched = matched[np.argsort(-scores[matched], kind="stable")]
+            return [(self._ids[slot], float(scores[slot])) for slot in matched]
+
+
+def get_lexical_index(key: Hashable) -> BM25Index:
+    """
+    Get the shared BM25 index for a collection, creating it lazily
+
+    Args:
+        key: Collection identity (backend, persist directory, name)
+
+    Returns:
+        Index shared by every RAGMemory on the collection in this process
+    """
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = BM25Index()
+            _indexes[key] = index
+    return index
@@ -0,0 +1,119 @@
+"""
+Memory IDs
+Compact, time-sortable, collision-free IDs for memories written concurrently
+from many threads and processes.
+"""
+
+import itertools
+import os
+import secrets
+import time
+from datetime import datetime
+from typing import List
+
+# 128-bit layout, most significant first:
+#   48 bits  Unix time in milliseconds   -> IDs sort by creation time
+#   40 bits  random node ID per process  -> processes/hosts never overlap
+#   40 bits  per-process sequence        -> unique within a process
+TIMESTAMP_BITS = 48
+NODE_BITS = 40
+SEQUENCE_BITS = 40
+
+ENCODED_LENGTH = 26  # Crockford base32 of 128 bits, like a ULID
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: value for value, char in enumerate(_ALPHABET)}
+
+
+def _encode(value: int) -> str:
+    chars = []
+    for _ in range(ENCODED_LENGTH):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _decode(encoded: str) -> int:
+    value = 0
+    for char in encoded.upper():
+        value = (value << 5) | _DECODE[char]
+    return value
+
+
+class MemoryIdGenerator:
+    """
+    ULID/Snowflake-style ID generator
+
+    Thread-safe without locks: the sequence comes from itertools.count,
+    whose next() is atomic under the GIL, and each process (including
+    forked children, see os.register_at_fork) draws its own random node ID.
+    IDs from one thread are strictly increasing; across threads and
+    processes they sort by millisecond.
+    """
+
+    def __init__(self):
+        self.reseed()
+
+    def reseed(self):
+        """Pick a fresh node ID and sequence (called in forked children)"""
+        self._node = secrets.randbits(NODE_BITS)
+        self._sequence = itertools.count(secrets.randbits(SEQUENCE_BITS - 8))
+        self._last_millis = 0
+
+    def _next_value(self) -> int:
+        # Never let the timestamp go backwards if the wall clock is stepped
+        millis = max(time.time_ns() // 1_000_000, self._last_millis)
+        self._last_millis = millis
+        sequence = next(self._sequence) & ((1 << SEQUENCE_BITS) - 1)
+        return (
+            (millis << (NODE_BITS + SEQUENCE_BITS))
+            | (self._node << SEQUENCE_BITS)
+            | sequence
+        )
+
+    def new_id(self, prefix: str = "mem") -> str:
+        """
+        Generate one ID
+
+        Args:
+            prefix: Prefix joined with "_" (empty for the bare 26 characters)
+
+        Returns:
+            ID such as "mem_01HF3Z6W7K8Q9R0S1T2V3W4X5Y"
+        """
+        encoded = _encode(self._next_value())
+        return f"{prefix}_{encoded}" if prefix else encoded
+
+    def new_ids(self, count: int, prefix: str = "mem") -> List[str]:
+        """Generate count IDs in increasing order"""
+        return [self.new_id(prefix) for _ in range(count)]
+
+
+_generator = MemoryIdGenerator()
+
+if hasattr(os, "register_at_fork"):
+    # A forked child would otherwise repeat the parent's node and sequence
+    os.register_at_fork(after_in_child=_generator.reseed)
+
+
+def new_memory_id(prefix: str = "mem") -> str:
+    """Generate a memory ID from the process-wide generator"""
+    return _generator.new_id(prefix)
+
+
+def new_memory_ids(count: int, prefix: str = "mem") -> List[str]:
+    """Generate count memory IDs from the process-wide generator"""
+    return _generator.new_ids(count, prefix)
+
+
+def memory_id_timestamp(memory_id: str) -> datetime:
+    """
+    Creation time encoded in an ID
+
+    Args:
+        memory_id: ID from new_memory_id (with or without prefix)
+
+    Returns:
+        Local naive datetime, millisecond precision
+    """
+    value = _decode(memory_id[-ENCODED_LENGTH:])
+    return datetime.fromtimestamp((value >> (NODE_BITS + SEQUENCE_BITS)) / 1000)
@@ -0,0 +1,138 @@
+"""
+Background Memory Writer
+Moves memory write-back off the caller's critical path: writes are queued,
+batched per memory and flushed by a worker thread.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .rag_memory import RAGMemory
+
+_STOP = object()
+
+
+class BackgroundMemoryWriter:
+    """Bounded-queue writer that batches add_memory calls per RAGMemory"""
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 0.05
+    ):
+        """
+        Initialize and start the writer thread
+
+        Args:
+            max_queue_size: Pending writes before submit() blocks
+            batch_size: Maximum memories written per batch
+            flush_interval: Seconds to wait for more writes before flushing
+                a partial batch
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(
+        self,
+        memory: RAGMemory,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        importance: float = 1.0
+    ):
+        """
+        Queue a memory for writing
+
+        Blocks when the queue is full, which applies back-pressure instead
+        of growing without bound.
+
+        Args:
+            memory: Target memory
+            content: Memory content
+            metadata: Additional metadata
+            importance: Importance score (0-1)
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundMemoryWriter is closed")
+        self._queue.put((memory, {"content": content, "metadata": metadata, "importance": importance}))
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+
+            pending: List[Tuple[RAGMemory, Dict[str, Any]]] = [first]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(pending) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                pending.append(entry)
+
+            self._write(pending)
+            for _ in pending:
+                self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _write(self, pending: List[Tuple[RAGMemory, Dict[str, Any]]]):
+        """Write one batch, grouped by target memory"""
+        groups: Dict[int, Tuple[RAGMemory, List[Dict[str, Any]]]] = {}
+        for memory, item in pending:
+            groups.setdefault(id(memory), (memory, []))[1].append(item)
+
+        for memory, items in groups.values():
+            try:
+                memory.add_memories(items)
+                self.written += len(items)
+                self.batches += 1
+            except Exception as e:
+                self.errors += len(items)
+                self.last_error = e
+
+    def flush(self):
+        """Block until every queued write has been attempted"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the worker thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, int]:
+        """Write counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "errors": self.errors
+        }
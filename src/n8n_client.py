@@ -3,24 +3,323 @@ N8N API Client
 Handles all interactions with n8n API for workflow management and execution.
 """
 
+import json
 import os
+import re
+import time
+import uuid
 import requests
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Set, Tuple
+from urllib.parse import urlsplit
+from urllib3.exceptions import NewConnectionError
 from dotenv import load_dotenv
 
+from .resilience import (
+    CircuitBreaker,
+    UNPROCESSED_STATUSES,
+    create_circuit_breakers,
+    create_retry_policy,
+    settings_from_config
+)
+
 load_dotenv()
 
+# Connection defaults, overridable through config.json "n8n_settings"
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_WEBHOOK_TIMEOUT = 30.0
+
+# Execution polling defaults; the interval backs off up to
+# n8n_settings.workflow_check_interval
+DEFAULT_POLL_INITIAL_INTERVAL = 0.2
+DEFAULT_POLL_BACKOFF = 2.0
+DEFAULT_WORKFLOW_CHECK_INTERVAL = 5.0
+EXECUTIONS_PAGE_LIMIT = 250
+
+FINISHED_STATUSES = {"success", "error", "crashed", "canceled"}
+
+# Methods that are safe to repeat after any transient failure. Other methods
+# are only retried when n8n cannot have processed the request.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "PATCH", "DELETE"}
+
+_ID_SEGMENT = re.compile(r"/(workflows|executions)/[^/]+")
+
+WEBHOOK_NODE_TYPE = "n8n-nodes-base.webhook"
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+class ConnectFailure(requests.ConnectionError):
+    """No connection could be established, so nothing reached n8n"""
+
+
+def connect_failure(error: requests.ConnectionError) -> Optional[ConnectFailure]:
+    """
+    The error as a ConnectFailure if it happened while connecting
+
+    Refused connections and DNS failures are safe to retry for any method;
+    a connection dropped after the request was sent is not.
+    """
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    if isinstance(reason, NewConnectionError):
+        return ConnectFailure(*error.args, request=error.request, response=error.response)
+    return None
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Circuit breaker key for a request, with resource IDs folded together"""
+    template = _ID_SEGMENT.sub(r"/\1/{id}", urlsplit(path).path)
+    return f"n8n {method.upper()} {template}"
+
+
+def find_webhook(workflow: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """
+    Find a workflow's webhook trigger
+
+    Args:
+        workflow: Workflow definition with its nodes
+
+    Returns:
+        (HTTP method, path) of the first enabled webhook node, or None.
+        The path is the node's "path" parameter, falling back to its
+        webhookId as n8n does.
+    """
+    for node in workflow.get("nodes", []):
+        if node.get("type") != WEBHOOK_NODE_TYPE or node.get("disabled"):
+            continue
+        parameters = node.get("parameters", {})
+        path = parameters.get("path") or node.get("webhookId")
+        if path:
+            # n8n's webhook node defaults to GET
+            return parameters.get("httpMethod", "GET").upper(), path.strip("/")
+    return None
+
+
+def assign_webhook_paths(nodes: List[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+    """
+    Give a workflow's webhook nodes paths of their own
+
+    Templates hard-code their webhook paths, and n8n routes a path to
+    whichever active workflow registered it, so every workflow created from
+    a template needs a fresh path before it is uploaded.
+
+    Args:
+        nodes: Workflow nodes (left unchanged)
+        name: Name the paths are derived from, e.g. the agent name
+
+    Returns:
+        Copies of the nodes, each webhook node with a new path and webhookId
+        of the form "<slugified name>-<uuid>"
+    """
+    slug = _SLUG_SEPARATORS.sub("-", name.lower()).strip("-") or "workflow"
+    assigned = []
+    for node in nodes:
+        if node.get("type") == WEBHOOK_NODE_TYPE:
+            webhook_id = str(uuid.uuid4())
+            node = {
+                **node,
+                "parameters": {**node.get("parameters", {}), "path": f"{slug}-{webhook_id}"},
+                "webhookId": webhook_id
+            }
+        assigned.append(node)
+    return assigned
+
+
+def is_server_failure(status: Optional[int]) -> bool:
+    """Whether a response status (None for transport errors) means n8n is unhealthy"""
+    return status is None or status >= 500
+
+
+def is_execution_finished(execution: Dict[str, Any]) -> bool:
+    """Whether an execution has reached a terminal state"""
+    status = execution.get("status")
+    if status:
+        return status in FINISHED_STATUSES
+    return bool(execution.get("finished")) or bool(execution.get("stoppedAt"))
+
+
+def keep_listing(
+    pending: Set[str],
+    found: Dict[str, Dict[str, Any]],
+    page: List[Dict[str, Any]],
+    cursor: Optional[str],
+    pages: int
+) -> bool:
+    """
+    Whether wait_for_many should request another page of executions
+
+    The list is newest first. Paging stops once every pending execution is
+    found, when the page has reached executions older than all the missing
+    ones (numeric n8n IDs), or when more pages have been read than the
+    single GETs the next one could save.
+
+    Args:
+        pending: Execution IDs being waited for
+        found: Pending executions found on the pages read so far
+        page: Items of the last page read
+        cursor: Cursor of the next page (None on the last page)
+        pages: Pages read so far this round
+    """
+    missing = [execution_id for execution_id in pending if execution_id not in found]
+    if not cursor or not missing or pages >= len(missing):
+        return False
+    last_id = str(page[-1].get("id")) if page else ""
+    if last_id.isdigit() and all(execution_id.isdigit() for execution_id in missing):
+        return int(last_id) > min(int(execution_id) for execution_id in missing)
+    return True
+
+
+@dataclass
+class WaitStats:
+    """Timing and request counters for a wait_for_execution/wait_for_many call"""
+    polls: int = 0
+    list_requests: int = 0
+    get_requests: int = 0
+    elapsed: float = 0.0
+    completion_times: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return self.list_requests + self.get_requests
+
+    def to_dict(self) -> Dict[str, Any]:
+        times = list(self.completion_times.values())
+        return {
+            "polls": self.polls,
+            "requests": self.requests,
+            "list_requests": self.list_requests,
+            "get_requests": self.get_requests,
+            "elapsed": self.elapsed,
+            "completed": len(times),
+            "mean_completion_time": sum(times) / len(times) if times else None,
+            "max_completion_time": max(times) if times else None
+        }
+
+
+class ExecutionWaiter:
+    """
+    Polling state of one wait_for_many call, shared by the sync and async
+    clients, which only perform the requests and sleeps it asks for
+
+    A round is begin_round, add_page for each listed page, add_fetched for
+    each unlisted execution, then finish_round.
+    """
+
+    def __init__(
+        self,
+        execution_ids: Iterable[str],
+        timeout: Optional[float],
+        include_data: bool,
+        initial_interval: float,
+        backoff: float,
+        max_interval: float
+    ):
+        self.pending = {str(execution_id) for execution_id in execution_ids}
+        self.finished: Dict[str, Dict[str, Any]] = {}
+        self.stats = WaitStats()
+        self.timeout = timeout
+        self.include_data = include_data
+        self.initial_interval = initial_interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.interval = initial_interval
+        self.start = time.monotonic()
+        self._found: Dict[str, Dict[str, Any]] = {}
+        self._pages = 0
+
+    def begin_round(self) -> Optional[Dict[str, Any]]:
+        """Start a poll; returns the params of the first executions page, or None to skip listing"""
+        self.stats.polls += 1
+        self._found = {}
+        self._pages = 0
+        if len(self.pending) < 2:
+            return None
+        params: Dict[str, Any] = {"limit": EXECUTIONS_PAGE_LIMIT}
+        if self.include_data:
+            params["includeData"] = "true"
+        return params
+
+    def add_page(self, params: Dict[str, Any], page: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record a listed page; returns the params of the next one, or None to stop (see keep_listing)"""
+        self.stats.list_requests += 1
+        self._pages += 1
+        for execution in page["data"]:
+            if str(execution.get("id")) in self.pending:
+                self._found[str(execution["id"])] = execution
+        cursor = page.get("nextCursor")
+        if not keep_listing(self.pending, self._found, page["data"], cursor, self._pages):
+            return None
+        return {**params, "cursor": cursor}
+
+    def unlisted(self) -> List[str]:
+        """Pending executions the listed pages did not contain"""
+        return [execution_id for execution_id in self.pending if execution_id not in self._found]
+
+    def add_fetched(self, execution_id: str, execution: Dict[str, Any]):
+        self.stats.get_requests += 1
+        self._found[execution_id] = execution
+
+    def finish_round(self) -> Optional[float]:
+        """
+        Collect the executions that finished this round
+
+        Returns:
+            Seconds to sleep before the next round, or None when every
+            execution has finished. The last sleep ends at the deadline so
+            a final poll happens there; TimeoutError is raised only when
+            executions are still running after it.
+        """
+        now = time.monotonic()
+        elapsed = now - self.start
+        progressed = False
+        for execution_id, execution in self._found.items():
+            if is_execution_finished(execution):
+                self.finished[execution_id] = execution
+                self.pending.discard(execution_id)
+                self.stats.completion_times[execution_id] = elapsed
+                progressed = True
+
+        self.stats.elapsed = elapsed
+        if not self.pending:
+            return None
+        if self.timeout is not None and elapsed >= self.timeout:
+            raise TimeoutError(
+                f"{len(self.pending)} execution(s) still running after {self.timeout}s: "
+                f"{sorted(self.pending)[:10]}"
+            )
+
+        delay = self.interval
+        if self.timeout is not None:
+            delay = min(delay, self.timeout - elapsed)
+        if progressed:
+            self.interval = max(self.initial_interval, self.interval / self.backoff)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return delay
+
 
 class N8NClient:
     """Client for interacting with n8n API"""
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None
+    ):
         """
         Initialize N8N client
 
         Args:
             api_key: n8n API key (defaults to N8N_API_KEY env var)
             base_url: n8n instance URL (defaults to N8N_BASE_URL env var)
+            config: Application config; connection pool and timeout
+                settings are read from its "n8n_settings" section, retry and
+                circuit breaker settings via resilience.settings_from_config
         """
         self.api_key = api_key or os.getenv("N8N_API_KEY")
         self.base_url = (base_url or os.getenv("N8N_BASE_URL", "")).rstrip("/")
@@ -35,98 +334,399 @@ class N8NClient:
             "Content-Type": "application/json"
         }
 
-    def list_workflows(self) -> List[Dict[str, Any]]:
-        """List all workflows"""
-        response = requests.get(
-            f"{self.base_url}/api/v1/workflows",
-            headers=self.headers
+        settings = (config or {}).get("n8n_settings", {})
+        connect_timeout = float(settings.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT))
+        self.timeout = (connect_timeout, float(settings.get("read_timeout", DEFAULT_READ_TIMEOUT)))
+        self.webhook_timeout = (
+            connect_timeout,
+            float(settings.get("webhook_timeout", DEFAULT_WEBHOOK_TIMEOUT))
+        )
+        self.session = self._create_session(settings)
+
+        resilience = settings_from_config(config)
+        self.retry_policy = create_retry_policy(
+            resilience, "n8n", (requests.ConnectionError, requests.Timeout)
         )
-        response.raise_for_status()
-        return response.json()["data"]
+        self.circuit_breakers = create_circuit_breakers(resilience)
+
+        self.poll_initial_interval = float(
+            settings.get("execution_poll_initial_interval", DEFAULT_POLL_INITIAL_INTERVAL)
+        )
+        self.poll_backoff = float(settings.get("execution_poll_backoff", DEFAULT_POLL_BACKOFF))
+        self.poll_max_interval = float(
+            settings.get("workflow_check_interval", DEFAULT_WORKFLOW_CHECK_INTERVAL)
+        )
+        self.last_wait_stats: Optional[WaitStats] = None
+
+    def _create_session(self, settings: Dict[str, Any]) -> requests.Session:
+        """
+        Create the pooled HTTP session shared by all API calls
+
+        Args:
+            settings: The "n8n_settings" config section
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        # pool_connections is the number of per-host pools kept around,
+        # pool_maxsize the number of keep-alive connections per host. With
+        # pool_block the client waits for a free connection instead of
+        # opening extra ones past the limit.
+        adapter = HTTPAdapter(
+            pool_connections=int(settings.get("pool_connections", DEFAULT_POOL_CONNECTIONS)),
+            pool_maxsize=int(settings.get("pool_maxsize", DEFAULT_POOL_MAXSIZE)),
+            pool_block=bool(settings.get("pool_block", False))
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if not settings.get("keep_alive", True):
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        authenticated: bool = True,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request to the n8n API over the pooled session
+
+        Transient failures are retried with jittered backoff. Non-idempotent
+        requests are only retried when n8n cannot have processed them
+        (connect failures, 429, 502, 503). Each endpoint has a circuit
+        breaker that raises CircuitOpenError while n8n keeps failing.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, or an absolute URL
+            authenticated: Send the API key header (webhooks must not
+                receive it, since n8n passes request headers to the workflow)
+            **kwargs: Extra arguments passed to requests
+
+        Returns:
+            Successful response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if not authenticated:
+            # A None value removes the session-level header for this request
+            kwargs["headers"] = {**kwargs.get("headers", {}), "X-N8N-API-KEY": None}
+        url = path if urlsplit(path).scheme else f"{self.base_url}{path}"
+        breaker = self.circuit_breakers.get(endpoint_key(method, path))
+
+        def send() -> requests.Response:
+            breaker.before_call()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self._record_outcome(breaker, e)
+                failure = connect_failure(e) if isinstance(e, requests.ConnectionError) else None
+                if failure is not None:
+                    raise failure from e
+                raise
+            breaker.record_success()
+            return response
+
+        if method.upper() in IDEMPOTENT_METHODS:
+            return self.retry_policy.call(send)
+        return self.retry_policy.call(
+            send, statuses=UNPROCESSED_STATUSES, exceptions=(requests.ConnectTimeout, ConnectFailure)
+        )
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, error: requests.RequestException):
+        """Count server and transport failures against the breaker; 4xx means n8n is up"""
+        response = getattr(error, "response", None)
+        if is_server_failure(getattr(response, "status_code", None)):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+    def __enter__(self) -> "N8NClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _iter_pages(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        prefetch: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily follow n8n's cursor pagination for a list endpoint
+
+        Args:
+            path: List endpoint path
+            params: Query parameters sent with every page request
+            prefetch: Request the next page in the background while the
+                caller consumes the current one
+
+        Yields:
+            Items across all pages
+        """
+        def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+            page_params = {**params, "cursor": cursor} if cursor else params
+            return self._request("GET", path, params=page_params).json()
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        upcoming = None
+        try:
+            page = fetch(None)
+            while True:
+                cursor = page.get("nextCursor")
+                upcoming = executor.submit(fetch, cursor) if executor and cursor else None
+                yield from page["data"]
+                if not cursor:
+                    return
+                page = upcoming.result() if upcoming else fetch(cursor)
+                upcoming = None
+        finally:
+            if executor:
+                # shutdown(cancel_futures=True) needs Python 3.9
+                if upcoming:
+                    upcoming.cancel()
+                executor.shutdown(wait=False)
+
+    def iter_workflows(
+        self,
+        active: Optional[bool] = None,
+        limit: int = 100,
+        prefetch: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all workflows, one page at a time
+
+        Args:
+            active: Only active (True) or inactive (False) workflows
+            limit: Page size requested from the server
+            prefetch: Fetch the next page while the current one is consumed
+
+        Yields:
+            Workflows
+        """
+        params: Dict[str, Any] = {"limit": limit}
+        if active is not None:
+            params["active"] = "true" if active else "false"
+        return self._iter_pages("/api/v1/workflows", params, prefetch)
+
+    def iter_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        include_data: bool = False,
+        limit: int = 100,
+        prefetch: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over executions, newest first, one page at a time
+
+        Args:
+            workflow_id: Only executions of this workflow
+            status: Only executions with this status (e.g. "error",
+                "success", "waiting")
+            include_data: Include execution data in each item
+            limit: Page size requested from the server
+            prefetch: Fetch the next page while the current one is consumed
+
+        Yields:
+            Executions
+        """
+        params: Dict[str, Any] = {"limit": limit}
+        if workflow_id:
+            params["workflowId"] = workflow_id
+        if status:
+            params["status"] = status
+        if include_data:
+            params["includeData"] = "true"
+        return self._iter_pages("/api/v1/executions", params, prefetch)
+
+    def list_workflows(self) -> List[Dict[str, Any]]:
+        """List all workflows (every page)"""
+        return list(self.iter_workflows(limit=EXECUTIONS_PAGE_LIMIT))
 
     def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Get a specific workflow by ID"""
-        response = requests.get(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}",
-            headers=self.headers
-        )
-        response.raise_for_status()
+        response = self._request("GET", f"/api/v1/workflows/{workflow_id}")
         return response.json()
 
     def create_workflow(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new workflow"""
-        response = requests.post(
-            f"{self.base_url}/api/v1/workflows",
-            headers=self.headers,
-            json=workflow_data
-        )
-        response.raise_for_status()
+        response = self._request("POST", "/api/v1/workflows", json=workflow_data)
         return response.json()
 
     def update_workflow(self, workflow_id: str, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing workflow"""
-        response = requests.patch(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}",
-            headers=self.headers,
-            json=workflow_data
-        )
-        response.raise_for_status()
+        response = self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json=workflow_data)
         return response.json()
 
     def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow"""
-        response = requests.delete(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}",
-            headers=self.headers
-        )
-        response.raise_for_status()
+        self._request("DELETE", f"/api/v1/workflows/{workflow_id}")
         return True
 
     def activate_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Activate a workflow"""
-        response = requests.patch(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}",
-            headers=self.headers,
-            json={"active": True}
-        )
-        response.raise_for_status()
+        response = self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json={"active": True})
         return response.json()
 
     def deactivate_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Deactivate a workflow"""
-        response = requests.patch(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}",
-            headers=self.headers,
-            json={"active": False}
-        )
-        response.raise_for_status()
+        response = self._request("PATCH", f"/api/v1/workflows/{workflow_id}", json={"active": False})
         return response.json()
 
     def execute_workflow(self, workflow_id: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute a workflow"""
-        response = requests.post(
-            f"{self.base_url}/api/v1/workflows/{workflow_id}/execute",
-            headers=self.headers,
+        response = self._request(
+            "POST",
+            f"/api/v1/workflows/{workflow_id}/execute",
             json=data or {}
         )
-        response.raise_for_status()
         return response.json()
 
-    def get_executions(self, workflow_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get workflow executions"""
-        url = f"{self.base_url}/api/v1/executions"
-        if workflow_id:
-            url += f"?workflowId={workflow_id}"
+    def resolve_webhook(self, workflow: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Resolve the production webhook URL of a workflow
+
+        Args:
+            workflow: Workflow definition with its nodes
+
+        Returns:
+            (HTTP method, URL) or None if the workflow has no webhook trigger.
+            The URL only answers while the workflow is active.
+        """
+        webhook = find_webhook(workflow)
+        if webhook is None:
+            return None
+        method, path = webhook
+        return method, f"{self.base_url}/webhook/{path}"
+
+    def call_webhook(self, url: str, data: Optional[Dict[str, Any]] = None, method: str = "POST") -> Any:
+        """
+        Trigger a workflow through its webhook
+
+        This is much cheaper for n8n than the REST execute endpoint, and with
+        a "Respond to Webhook" node the workflow's output comes back directly.
 
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()["data"]
+        Args:
+            url: Webhook URL (see resolve_webhook)
+            data: Payload; sent as query parameters for GET webhooks
+            method: HTTP method the webhook node listens on
+
+        Returns:
+            Decoded JSON response, the raw text if it is not JSON, or None
+            for an empty response
+        """
+        if method.upper() == "GET":
+            params = {
+                key: value if isinstance(value, str) else json.dumps(value)
+                for key, value in (data or {}).items()
+            }
+            kwargs: Dict[str, Any] = {"params": params}
+        else:
+            kwargs = {"json": data or {}}
+
+        response = self._request(
+            method,
+            url,
+            authenticated=False,
+            timeout=self.webhook_timeout,
+            **kwargs
+        )
+        if not response.content:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    def get_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get workflow executions (every page; use iter_executions to stream)"""
+        return list(self.iter_executions(
+            workflow_id=workflow_id,
+            status=status,
+            limit=EXECUTIONS_PAGE_LIMIT,
+            prefetch=True
+        ))
 
     def get_execution(self, execution_id: str) -> Dict[str, Any]:
         """Get a specific execution by ID"""
-        response = requests.get(
-            f"{self.base_url}/api/v1/executions/{execution_id}",
-            headers=self.headers
-        )
-        response.raise_for_status()
+        response = self._request("GET", f"/api/v1/executions/{execution_id}")
         return response.json()
+
+    def wait_for_execution(self, execution_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait until an execution finishes
+
+        Args:
+            execution_id: Execution ID
+            timeout: Seconds to wait before raising TimeoutError (None waits
+                indefinitely)
+
+        Returns:
+            The finished execution
+        """
+        return self.wait_for_many([execution_id], timeout=timeout, include_data=True)[str(execution_id)]
+
+    def wait_for_many(
+        self,
+        execution_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        include_data: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait until several executions finish
+
+        Each round checks the pending executions through the executions
+        list endpoint, paging back until all are found (see keep_listing),
+        and falls back to individual GETs only for executions not listed.
+        The poll interval starts at execution_poll_initial_interval, grows by
+        execution_poll_backoff while nothing finishes (capped at
+        workflow_check_interval) and shrinks again when executions complete.
+        The polling state is kept by ExecutionWaiter. Timing stats are kept
+        in last_wait_stats.
+
+        Args:
+            execution_ids: Execution IDs
+            timeout: Seconds to wait before raising TimeoutError; the last
+                poll happens at the deadline (None waits indefinitely)
+            include_data: Fetch full execution data for listed executions
+
+        Returns:
+            Mapping of execution ID to the finished execution
+        """
+        waiter = ExecutionWaiter(
+            execution_ids, timeout, include_data,
+            self.poll_initial_interval, self.poll_backoff, self.poll_max_interval
+        )
+        self.last_wait_stats = waiter.stats
+
+        while True:
+            params = waiter.begin_round()
+            while params is not None:
+                page = self._request("GET", "/api/v1/executions", params=params).json()
+                params = waiter.add_page(params, page)
+
+            for execution_id in waiter.unlisted():
+                waiter.add_fetched(execution_id, self.get_execution(execution_id))
+
+            delay = waiter.finish_round()
+            if delay is None:
+                return waiter.finished
+            time.sleep(delay)
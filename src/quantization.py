@@ -0,0 +1,335 @@
+"""
+Vector Quantization
+Compact in-memory encodings for the NumPy vector store: float16, int8 with a
+per-vector scale, and product quantization, all scored by inner product.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+QUANTIZATIONS = ("float32", "float16", "int8", "pq")
+
+# Candidates re-scored at full precision per result (see NumpyVectorStore)
+DEFAULT_RESCORE_FACTOR = 4
+
+# Rows decoded per block while scoring: small enough for the decoded block
+# to stay in cache, which matters more than the per-block overhead
+SCORE_CHUNK_ROWS = 1024
+
+# Rows per matrix product while assigning codes, to bound temporaries
+ASSIGN_CHUNK_ROWS = 16384
+
+PQ_CENTROIDS = 256
+PQ_SUBVECTOR_DIMENSIONS = 16
+PQ_TRAINING_POINTS = 65536
+PQ_KMEANS_ITERATIONS = 10
+PQ_RETRAIN_GROWTH = 4
+
+
+class Quantizer:
+    """
+    Full-precision float32 rows (no quantization)
+
+    Subclasses encode unit-length vectors into a code matrix with one row
+    per vector; scores approximates the inner product of each stored row
+    with each query.
+    """
+
+    name = "float32"
+    dtype = np.float32
+    # Whether scores are approximate (and worth re-scoring)
+    lossy = False
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    @property
+    def width(self) -> int:
+        """Code columns per vector"""
+        return self.dimensions
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.width * np.dtype(self.dtype).itemsize
+
+    @property
+    def trained(self) -> bool:
+        return True
+
+    def needs_training(self, size: int) -> bool:
+        return False
+
+    def empty(self, rows: int) -> np.ndarray:
+        """Zeroed code matrix with room for rows vectors"""
+        return np.zeros((rows, self.width), dtype=self.dtype)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes
+
+    def scores(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """
+        Inner products of stored rows with queries
+
+        Args:
+            codes: Code rows
+            queries: Unit-length queries, one per row
+
+        Returns:
+            Matrix of shape (len(queries), len(codes))
+        """
+        return queries @ codes.T
+
+    def save(self, path: str):
+        """Write learned parameters (none for fixed encodings)"""
+
+    def load(self, path: str) -> bool:
+        """Read parameters written by save; returns whether there were any"""
+        return False
+
+
+class Float16Quantizer(Quantizer):
+    """Half-precision rows: half the memory, ~3 significant digits"""
+
+    name = "float16"
+    dtype = np.float16
+    lossy = True
+
+    def encode(self, vectors):
+        return np.asarray(vectors, dtype=np.float16)
+
+    def decode(self, codes):
+        return codes.astype(np.float32)
+
+    def scores(self, codes, queries):
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+            block = self.decode(codes[start:start + SCORE_CHUNK_ROWS])
+            scores[:, start:start + len(block)] = queries @ block.T
+        return scores
+
+
+class Int8Quantizer(Quantizer):
+    """
+    Scalar int8 with a per-vector scale: a quarter of the memory
+
+    Each row holds round(x / scale) in dimensions int8 columns followed by
+    the float32 scale (max |x| / 127) packed into 4 more.
+    """
+
+    name = "int8"
+    dtype = np.int8
+    lossy = True
+
+    @property
+    def width(self):
+        return self.dimensions + 4
+
+    def encode(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1, keepdims=True) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.empty((len(vectors), self.width), dtype=np.int8)
+        codes[:, :self.dimensions] = np.rint(vectors / scales)
+        codes[:, self.dimensions:] = scales.astype(np.float32).view(np.int8)
+        return codes
+
+    def _scales(self, codes: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(codes[:, self.dimensions:]).view(np.float32)[:, 0]
+
+    def decode(self, codes):
+        return codes[:, :self.dimensions].astype(np.float32) * self._scales(codes)[:, None]
+
+    def scores(self, codes, queries):
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+            block = codes[start:start + SCORE_CHUNK_ROWS]
+            raw = queries @ block[:, :self.dimensions].astype(np.float32).T
+            scores[:, start:start + len(block)] = raw * self._scales(block)
+        return scores
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = PQ_KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """
+    Euclidean k-means
+
+    Args:
+        vectors: Points, one per row
+        k: Number of clusters (at most len(vectors))
+        iterations: Lloyd iterations
+        seed: Random seed for initialization and empty-cluster reseeding
+
+    Returns:
+        Centroids, one row per cluster
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        labels = nearest_centroids(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=k)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], starts[filled], axis=0)
+        empty = int((~filled).sum())
+        if empty:
+            sums[~filled] = vectors[rng.choice(len(vectors), empty, replace=False)]
+        centroids = sums / np.maximum(counts, 1)[:, None]
+    return centroids
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest (Euclidean) centroid for each row"""
+    # argmin |x - c|^2 = argmax (x.c - |c|^2 / 2)
+    half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        block = vectors[start:start + ASSIGN_CHUNK_ROWS]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T - half_norms, axis=1)
+    return labels
+
+
+class ProductQuantizer(Quantizer):
+    """
+    Product quantization: one byte per subvector
+
+    Vectors are split into subvectors of PQ_SUBVECTOR_DIMENSIONS (by
+    default); each is replaced by the nearest of PQ_CENTROIDS learned
+    centroids, so 1536 float32 dimensions (6 KiB) become 96 bytes. Queries
+    are scored asymmetrically: a per-query table of centroid inner products
+    is summed over each row's codes.
+
+    The codebooks are learned from the store's full-precision vectors, so
+    product quantization needs a persisted store. They are trained on the
+    first vectors and retrained whenever the store has grown
+    PQ_RETRAIN_GROWTH times since; until trained, codes are all zero.
+    """
+
+    name = "pq"
+    dtype = np.uint8
+    lossy = True
+
+    def __init__(self, dimensions: int, subvectors: int = 0):
+        super().__init__(dimensions)
+        if not subvectors:
+            # Largest count of subvectors of at least PQ_SUBVECTOR_DIMENSIONS
+            subvectors = max(1, dimensions // PQ_SUBVECTOR_DIMENSIONS)
+            while dimensions % subvectors:
+                subvectors -= 1
+        if dimensions % subvectors:
+            raise ValueError(f"pq_subvectors ({subvectors}) must divide the dimensions ({dimensions})")
+        self.subvectors = subvectors
+        self.codebooks: Optional[np.ndarray] = None
+        self.trained_size = 0
+
+    @property
+    def width(self):
+        return self.subvectors
+
+    @property
+    def trained(self):
+        return self.codebooks is not None
+
+    def needs_training(self, size):
+        return size > 0 and (not self.trained or size >= PQ_RETRAIN_GROWTH * self.trained_size)
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), self.subvectors, -1)
+
+    def training_rows(self, size: int) -> np.ndarray:
+        """Rows to learn the codebooks from, for a store of this size"""
+        if size <= PQ_TRAINING_POINTS:
+            return np.arange(size)
+        return np.sort(np.random.default_rng(0).choice(size, PQ_TRAINING_POINTS, replace=False))
+
+    def train(self, sample: np.ndarray, size: int):
+        """
+        Learn one codebook per subvector
+
+        Args:
+            sample: Full-precision vectors (see training_rows)
+            size: Store size the codebooks are trained for
+        """
+        parts = self._split(sample)
+        codebooks = np.zeros((self.subvectors, PQ_CENTROIDS, parts.shape[2]), dtype=np.float32)
+        for m in range(self.subvectors):
+            centroids = kmeans(parts[:, m], PQ_CENTROIDS)
+            codebooks[m] = centroids[0]  # Fewer points than centroids: pad with a real one
+            codebooks[m, :len(centroids)] = centroids
+        self.codebooks = codebooks
+        self.trained_size = size
+
+    def encode(self, vectors):
+        codes = np.zeros((len(vectors), self.subvectors), dtype=np.uint8)
+        if not self.trained:
+            return codes
+        parts = self._split(vectors)
+        for m in range(self.subvectors):
+            codes[:, m] = nearest_centroids(parts[:, m], self.codebooks[m])
+        return codes
+
+    def decode(self, codes):
+        if not self.trained:
+            return np.zeros((len(codes), self.dimensions), dtype=np.float32)
+        parts = self.codebooks[np.arange(self.subvectors), codes]
+        return parts.reshape(len(codes), self.dimensions)
+
+    def scores(self, codes, queries):
+        scores = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        if not self.trained:
+            return scores
+        # Flat index of (subvector m, centroid c) into each query's table
+        offsets = np.arange(self.subvectors) * PQ_CENTROIDS
+        for q, query in enumerate(self._split(queries)):
+            table = np.einsum("mcd,md->mc", self.codebooks, query).ravel()
+            for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+                block = codes[start:start + SCORE_CHUNK_ROWS]
+                scores[q, start:start + len(block)] = table[block + offsets].sum(axis=1)
+        return scores
+
+    def save(self, path):
+        if not self.trained:
+            return
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, codebooks=self.codebooks, trained_size=self.trained_size)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as saved:
+            if saved["codebooks"].shape[0] != self.subvectors:
+                return False
+            self.codebooks = saved["codebooks"].astype(np.float32)
+            self.trained_size = int(saved["trained_size"])
+        return True
+
+
+def create_quantizer(name: str, dimensions: int, pq_subvectors: int = 0) -> Quantizer:
+    """
+    Create a quantizer by name
+
+    Args:
+        name: One of QUANTIZATIONS
+        dimensions: Vector dimensions
+        pq_subvectors: Subvectors for "pq" (0 = dimensions / 16)
+
+    Returns:
+        Quantizer
+    """
+    if name == "float32":
+        return Quantizer(dimensions)
+    if name == "float16":
+        return Float16Quantizer(dimensions)
+    if name == "int8":
+        return Int8Quantizer(dimensions)
+    if name == "pq":
+        return ProductQuantizer(dimensions, pq_subvectors)
+    raise ValueError(f"Unknown quantization: {name}")
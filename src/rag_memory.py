@@ -5,26 +5,44 @@ Implements semantic memory storage and retrieval using vector embeddings.
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import time
+from typing import Callable, Iterable, List, Dict, Any, Optional, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import numpy as np
 from dotenv import load_dotenv
 
-load_dotenv()
+from .embedding_cache import EmbeddingCache, DEFAULT_CACHE_MAX_BYTES, get_embedding_cache
+from .embeddings import EmbeddingProvider, get_embedding_provider
+from .ingestion import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_INGEST_BATCH_SIZE,
+    IngestManifest,
+    IngestStats,
+    Source,
+    batched,
+    chunk_id,
+    dedupe_chunks,
+    iter_chunks,
+    iter_chunks_parallel
+)
+from .lexical_index import DEFAULT_RRF_K, BM25Index, get_lexical_index, reciprocal_rank_fusion
+from .memory_ids import new_memory_id, new_memory_ids
+from .tokens import (
+    DEFAULT_TOKEN_MODEL,
+    MEMORY_OVERHEAD_TOKENS,
+    count_tokens_many,
+    memory_tokens,
+    pack_knapsack
+)
+from .vector_store import VectorStore, create_vector_store, similarity_from_distances
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+load_dotenv()
 
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
+# "vector": embedding search, "lexical": BM25 only (no embedding call),
+# "hybrid": both, fused by reciprocal rank
+SEARCH_MODES = ("vector", "lexical", "hybrid")
 
 
 @dataclass
@@ -43,37 +61,65 @@ class MemoryItem:
 class RAGMemory:
     """RAG Memory system using vector embeddings and semantic search"""
 
-    def __init__(self, collection_name: str = "agent_memory"):
+    def __init__(
+        self,
+        collection_name: str = "agent_memory",
+        config: Optional[Dict[str, Any]] = None,
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        vector_store: Optional[VectorStore] = None
+    ):
         """
         Initialize RAG Memory system
 
         Args:
             collection_name: Name of the vector collection
+            config: Application config (rag_settings and friends)
+            embedding_provider: Embedding backend (defaults to the one
+                selected by rag_settings.embedding_model / EMBEDDING_MODEL)
+            vector_store: Storage backend (defaults to the one selected by
+                rag_settings.vector_store)
         """
-        if not CHROMADB_AVAILABLE:
-            raise ImportError("chromadb not installed. Run: pip install chromadb")
-
-        if not OPENAI_AVAILABLE:
-            raise ImportError("openai not installed. Run: pip install openai")
-
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.collection_name = collection_name
+        self.config = config or {}
+        self.embedding_provider = embedding_provider or get_embedding_provider(self.config)
 
-        # Initialize ChromaDB
-        self.chroma_client = chromadb.Client(Settings(
-            chroma_db_impl="duckdb+parquet",
-            persist_directory="./chroma_db"
-        ))
-
-        # Get or create collection
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=collection_name,
-            metadata={"description": "Agent memory with RAG capabilities"}
+        rag_settings = self.config.get("rag_settings", {})
+        self.embedding_cache = get_embedding_cache(
+            max_bytes=int(rag_settings.get("embedding_cache_max_bytes", DEFAULT_CACHE_MAX_BYTES)),
+            path=rag_settings.get("embedding_cache_path")
         )
 
+        self.store = vector_store or create_vector_store(collection_name, self.config)
+
+        # The BM25 index is shared per collection unless the store was injected
+        if vector_store is None:
+            self.lexical_index = get_lexical_index((
+                rag_settings.get("vector_store", "chroma"),
+                os.path.abspath(rag_settings.get("persist_directory", "./chroma_db")),
+                collection_name
+            ))
+        else:
+            self.lexical_index = BM25Index()
+        self.search_mode = rag_settings.get("search_mode", "vector")
+        if self.search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {self.search_mode}")
+        self.rrf_k = int(rag_settings.get("rrf_k", DEFAULT_RRF_K))
+
+        # Context budgets are counted with the tokenizer of the chat model
+        self.token_model = self.config.get("agent_settings", {}).get("default_model", DEFAULT_TOKEN_MODEL)
+
+        # Re-ranking: without config there is no decay and no thresholds
+        memory_settings = self.config.get("memory_settings", {})
+        self.rerank = bool(rag_settings.get("rerank", True))
+        self.rerank_overfetch = max(1, int(rag_settings.get("rerank_overfetch", 4)))
+        self.similarity_threshold = float(rag_settings.get("similarity_threshold", 0.0))
+        self.importance_threshold = float(memory_settings.get("importance_threshold", 0.0))
+        self.decay_factor = float(memory_settings.get("memory_decay_factor", 1.0))
+        self.decay_period = float(memory_settings.get("decay_period_hours", 24.0)) * 3600.0
+
     def generate_embedding(self, text: str) -> List[float]:
         """
-        Generate embedding for text using OpenAI
+        Generate embedding for text using the configured backend
 
         Args:
             text: Text to embed
@@ -81,11 +127,56 @@ class RAGMemory:
         Returns:
             List of embedding values
         """
-        response = self.openai_client.embeddings.create(
-            model=os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"),
-            input=text
-        )
-        return response.data[0].embedding
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in batched backend calls
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        return self._embed(texts).tolist()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as a float32 matrix, going through the embedding cache
+
+        Only uncached, distinct texts are sent to the backend, in one
+        batched embed call.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix with one row per text, in input order
+        """
+        model = self.embedding_provider.model_name
+        keys = [EmbeddingCache.make_key(model, text) for text in texts]
+        vectors = self.embedding_cache.get_many(keys)
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                pending.setdefault(key, text)
+
+        if pending:
+            matrix = self.embedding_provider.embed(list(pending.values()))
+            computed = {key: row.copy() for key, row in zip(pending, matrix)}
+            self.embedding_cache.put_many(computed)
+            vectors.update(computed)
+
+        if not keys:
+            return np.zeros((0, self.embedding_provider.dimensions), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Embedding cache hit/miss counters"""
+        return self.embedding_cache.stats()
 
     def add_memory(
         self,
@@ -104,64 +195,459 @@ class RAGMemory:
         Returns:
             Memory ID
         """
-        memory_id = f"mem_{datetime.now().timestamp()}"
+        memory_id = new_memory_id()
         timestamp = datetime.now().isoformat()
 
         # Generate embedding
-        embedding = self.generate_embedding(content)
+        embedding = self._embed([content])[0]
 
-        # Prepare metadata
+        # Prepare metadata; the token count is stored so that context
+        # packing never re-tokenizes
         full_metadata = {
             "timestamp": timestamp,
             "importance": importance,
+            "token_count": count_tokens_many([content], self.token_model)[0],
             **(metadata or {})
         }
 
         # Add to vector store
-        self.collection.add(
+        self.store.add(
             embeddings=[embedding],
             documents=[content],
             metadatas=[full_metadata],
             ids=[memory_id]
         )
+        self._index_documents([memory_id], [content])
 
         return memory_id
 
+    def add_memories(
+        self,
+        items: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> List[str]:
+        """
+        Add many memories with batched embedding and writes
+
+        Args:
+            items: Memories as dicts with "content" and optional
+                "metadata", "importance" and "id" keys
+            batch_size: Memories embedded and written per store write
+
+        Returns:
+            Memory IDs in the same order as items
+        """
+        memory_ids: List[str] = []
+
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            timestamp = datetime.now().isoformat()
+
+            generated = iter(new_memory_ids(sum(1 for item in batch if not item.get("id"))))
+            ids = [item.get("id") or next(generated) for item in batch]
+            documents = [item["content"] for item in batch]
+            token_counts = count_tokens_many(documents, self.token_model)
+            metadatas = [
+                {
+                    "timestamp": timestamp,
+                    "importance": item.get("importance", 1.0),
+                    "token_count": token_count,
+                    **(item.get("metadata") or {})
+                }
+                for item, token_count in zip(batch, token_counts)
+            ]
+
+            self.store.add(
+                embeddings=self._embed(documents),
+                documents=documents,
+                metadatas=metadatas,
+                ids=ids
+            )
+            self._index_documents(ids, documents)
+            memory_ids.extend(ids)
+
+        return memory_ids
+
+    @property
+    def manifest_path(self) -> str:
+        """Ingest manifest file of this collection"""
+        persist_directory = self.config.get("rag_settings", {}).get("persist_directory", "./chroma_db")
+        return os.path.join(persist_directory, "manifests", f"{self.collection_name}.json")
+
+    def ingest(
+        self,
+        sources: Union[Source, Iterable[Source]],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+        metadata: Optional[Dict[str, Any]] = None,
+        importance: float = 1.0,
+        on_batch: Optional[Callable[[IngestStats], None]] = None,
+        workers: Optional[int] = None,
+        incremental: bool = True,
+        prune: bool = True
+    ) -> IngestStats:
+        """
+        Ingest documents as chunked memories
+
+        Sources stream through extract -> chunk -> dedupe -> batch-embed ->
+        bulk-insert generators, so memory use is bounded by the batch size
+        rather than the document size. PDF, DOCX, HTML, Markdown and plain
+        text are recognised by file extension.
+
+        With workers > 1, extraction and chunking of file paths fan out to a
+        process pool while this process stays the single writer that
+        batches embeddings and owns the collection.
+
+        Chunk IDs are derived from the content hash, so a chunk that is
+        already stored is never embedded or written again. With
+        incremental, the collection's manifest (see IngestManifest) also
+        skips files whose mtime, size and chunking settings are unchanged,
+        deletes chunks that disappeared from a changed file, and with prune
+        deletes the chunks of recorded files that no longer exist.
+
+        Args:
+            sources: File path(s) or open stream(s)
+            chunk_size: Maximum chunk length in characters (defaults to
+                rag_settings.chunk_size)
+            chunk_overlap: Characters shared by consecutive chunks (defaults
+                to rag_settings.chunk_overlap)
+            batch_size: Chunks embedded and written per batch
+            metadata: Extra metadata for every chunk
+            importance: Importance score for every chunk
+            on_batch: Called with the running stats after each batch
+            workers: Extraction processes (defaults to
+                rag_settings.ingest_workers, 1 = in-process)
+            incremental: Track file sources in the manifest
+            prune: Delete chunks of recorded files that no longer exist
+
+        Returns:
+            Ingest stats; chunks counts the chunks written. Sources that
+            failed to extract are listed in errors and keep their previous
+            manifest entry.
+        """
+        rag_settings = self.config.get("rag_settings", {})
+        chunk_size = chunk_size or int(rag_settings.get("chunk_size", DEFAULT_CHUNK_SIZE))
+        if chunk_overlap is None:
+            chunk_overlap = int(rag_settings.get("chunk_overlap", DEFAULT_CHUNK_OVERLAP))
+        if isinstance(sources, (str, os.PathLike)) or hasattr(sources, "read"):
+            sources = [sources]
+
+        stats = IngestStats()
+        start = time.perf_counter()
+        manifest = IngestManifest(self.manifest_path) if incremental else None
+        stored = manifest.referenced_hashes() if manifest else set()
+
+        # Changed file sources by name: (absolute path, fingerprint) and the
+        # hashes of all their chunks, recorded before de-duplication
+        tracked: Dict[str, Any] = {}
+        source_hashes: Dict[str, List[str]] = {}
+
+        def changed(items: Iterable[Source]):
+            for source in items:
+                if manifest is not None and isinstance(source, (str, os.PathLike)):
+                    path = os.path.abspath(source)
+                    try:
+                        fingerprint = IngestManifest.fingerprint(path, chunk_size, chunk_overlap)
+                    except OSError:
+                        yield source  # Extraction reports the error
+                        continue
+                    if manifest.is_unchanged(path, fingerprint):
+                        stats.unchanged_sources += 1
+                        continue
+                    tracked[os.fspath(source)] = (path, fingerprint)
+                    source_hashes[os.fspath(source)] = []
+                yield source
+
+        def recorded(chunks):
+            for chunk in chunks:
+                if chunk.source in source_hashes:
+                    source_hashes[chunk.source].append(chunk.hash)
+                yield chunk
+
+        workers = workers or int(rag_settings.get("ingest_workers", 1))
+        if workers > 1:
+            chunks = iter_chunks_parallel(changed(sources), chunk_size, chunk_overlap, workers, stats)
+        else:
+            chunks = iter_chunks(changed(sources), chunk_size, chunk_overlap, stats)
+        chunks = dedupe_chunks(recorded(chunks), stats)
+
+        for batch in batched(chunks, batch_size):
+            fresh = [chunk for chunk in batch if chunk.hash not in stored]
+            if fresh:
+                existing = set(self.store.get(ids=[chunk.memory_id for chunk in fresh])["ids"])
+                fresh = [chunk for chunk in fresh if chunk.memory_id not in existing]
+            if fresh:
+                self.add_memories([chunk.to_memory(metadata, importance) for chunk in fresh], batch_size=batch_size)
+                stored.update(chunk.hash for chunk in fresh)
+            stats.unchanged_chunks += len(batch) - len(fresh)
+            stats.chunks += len(fresh)
+            stats.batches += 1
+            stats.elapsed = time.perf_counter() - start
+            if on_batch:
+                on_batch(stats)
+
+        if manifest is not None:
+            self._update_manifest(manifest, tracked, source_hashes, prune, stats)
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _update_manifest(
+        self,
+        manifest: IngestManifest,
+        tracked: Dict[str, Any],
+        source_hashes: Dict[str, List[str]],
+        prune: bool,
+        stats: IngestStats
+    ):
+        """Record re-ingested sources and delete chunks no source contains any more"""
+        candidates = set()
+        for name, (path, fingerprint) in tracked.items():
+            if name in stats.errors:
+                continue
+            candidates.update(manifest.sources.get(path, {}).get("chunks", []))
+            manifest.record(path, fingerprint, source_hashes[name])
+
+        if prune:
+            for path in list(manifest.sources):
+                if not os.path.exists(path):
+                    candidates.update(manifest.sources[path].get("chunks", []))
+                    manifest.remove(path)
+                    stats.removed_sources += 1
+
+        orphans = candidates - manifest.referenced_hashes()
+        if orphans:
+            ids = [chunk_id(h) for h in orphans]
+            self.store.delete(ids=ids)
+            self.lexical_index.remove(ids)
+            stats.deleted_chunks = len(orphans)
+        manifest.save()
+
     def search_memory(
         self,
         query: str,
         top_k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        rerank: Optional[bool] = None,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search for relevant memories using semantic search
+        Search for relevant memories using semantic and/or keyword search
 
         Args:
             query: Search query
             top_k: Number of results to return
             filter_metadata: Optional metadata filters
+            rerank: Re-rank by similarity, importance and recency (defaults
+                to rag_settings.rerank; see _rerank)
+            mode: "vector", "lexical" or "hybrid" (defaults to
+                rag_settings.search_mode; see search_memory_batch)
 
         Returns:
             List of relevant memories
         """
-        # Generate query embedding
-        query_embedding = self.generate_embedding(query)
+        return self.search_memory_batch([query], top_k, filter_metadata, rerank, mode)[0]
+
+    def search_memory_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        rerank: Optional[bool] = None,
+        mode: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for many queries with one embedding call and one store query
 
-        # Search in vector store
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
+        In "lexical" mode the collection's BM25 index answers alone and no
+        embedding is computed, which suits exact keywords such as order
+        numbers or SKUs. In "hybrid" mode the vector ranking (re-ranked
+        when enabled) and the BM25 ranking of top_k * rerank_overfetch
+        candidates each are fused by reciprocal rank (rag_settings.rrf_k).
+        Lexical and hybrid results carry "bm25" when the keyword search
+        matched them, and "score" is the BM25 or fused score.
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            filter_metadata: Optional metadata filters applied to every query
+            rerank: Re-rank by similarity, importance and recency (defaults
+                to rag_settings.rerank)
+            mode: "vector", "lexical" or "hybrid" (defaults to
+                rag_settings.search_mode)
+
+        Returns:
+            One result list per query, in input order
+        """
+        mode = mode or self.search_mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        if not queries:
+            return []
+        if mode == "lexical":
+            return [self._lexical_search(query, top_k, filter_metadata) for query in queries]
+
+        rerank = self.rerank if rerank is None else rerank
+        hybrid = mode == "hybrid"
+        candidates = top_k * self.rerank_overfetch
+        results = self.store.query(
+            query_embeddings=self._embed(queries),
+            n_results=candidates if rerank or hybrid else top_k,
             where=filter_metadata
         )
+        memories = [self._format_results(results, q) for q in range(len(queries))]
+        if rerank:
+            memories = [self._rerank(found, len(found) if hybrid else top_k) for found in memories]
+        if hybrid:
+            memories = [
+                self._fuse(found, self._lexical_search(query, candidates, filter_metadata), top_k)
+                for query, found in zip(queries, memories)
+            ]
+        return memories
+
+    def _lexical(self) -> BM25Index:
+        """The collection's BM25 index, built from the store on first use"""
+        index = self.lexical_index
+        with index.lock:
+            if not index.built:
+                everything = self.store.get()
+                index.add(everything["ids"], everything["documents"])
+                index.built = True
+        return index
+
+    def _index_documents(self, ids: List[str], documents: List[str]):
+        """Keep the BM25 index in step with a store write (once it is built)"""
+        index = self.lexical_index
+        with index.lock:
+            if index.built:
+                index.add(ids, documents)
+
+    def _lexical_search(
+        self,
+        query: str,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyword search through the BM25 index, without embedding the query
+
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            Matching memories, highest BM25 score first
+        """
+        ranked = self._lexical().search(query, None if filter_metadata else top_k)
+
+        # Documents and metadata come from the store; with a filter, pages
+        # of growing size are fetched until top_k candidates pass it
+        memories: List[Dict[str, Any]] = []
+        start, page_size = 0, max(top_k, 1)
+        while start < len(ranked) and len(memories) < top_k:
+            page = ranked[start:start + page_size]
+            found = self.store.get(ids=[memory_id for memory_id, _ in page], where=filter_metadata)
+            stored = {
+                memory_id: (document, metadata)
+                for memory_id, document, metadata in zip(found["ids"], found["documents"], found["metadatas"])
+            }
+            for memory_id, score in page:
+                if memory_id in stored and len(memories) < top_k:
+                    document, metadata = stored[memory_id]
+                    memories.append({
+                        "id": memory_id,
+                        "content": document,
+                        "metadata": metadata,
+                        "distance": None,
+                        "bm25": score,
+                        "score": score
+                    })
+            start += page_size
+            page_size *= 2
+        return memories
+
+    def _fuse(
+        self,
+        vector_memories: List[Dict[str, Any]],
+        lexical_memories: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Merge vector and keyword results by reciprocal rank fusion"""
+        fused = reciprocal_rank_fusion(
+            [[m["id"] for m in vector_memories], [m["id"] for m in lexical_memories]],
+            self.rrf_k
+        )
+        merged = {m["id"]: m for m in lexical_memories}
+        for memory in vector_memories:
+            bm25 = merged.get(memory["id"], {}).get("bm25")
+            merged[memory["id"]] = {**memory, "bm25": bm25} if bm25 is not None else memory
+        ranked = sorted(merged, key=lambda memory_id: -fused[memory_id])[:top_k]
+        return [{**merged[memory_id], "score": fused[memory_id]} for memory_id in ranked]
+
+    def _rerank(self, memories: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Re-rank over-fetched candidates and keep the top_k
+
+        score = similarity * importance * memory_decay_factor ** age, with
+        age in decay periods (memory_settings.decay_period_hours, default a
+        day). Candidates below rag_settings.similarity_threshold or
+        memory_settings.importance_threshold are dropped. Adds "similarity"
+        and "score" to each returned memory.
+
+        Args:
+            memories: Candidates from one query, nearest first
+            top_k: Number of results to keep
+
+        Returns:
+            Best memories, highest score first
+        """
+        if not memories:
+            return memories
 
-        # Format results
+        distances = np.array([m["distance"] or 0.0 for m in memories], dtype=np.float64)
+        similarity = np.clip(similarity_from_distances(distances, self.store.distance_metric), 0.0, 1.0)
+        importance = np.array(
+            [float(m["metadata"].get("importance", 1.0)) for m in memories], dtype=np.float64
+        )
+        ages = self._ages(memories) / self.decay_period
+        scores = similarity * importance * np.power(self.decay_factor, ages)
+
+        keep = (similarity >= self.similarity_threshold) & (importance >= self.importance_threshold)
+        ranked = np.argsort(-scores, kind="stable")
+        order = ranked[keep[ranked]][:top_k]
+        return [
+            {**memories[i], "similarity": float(similarity[i]), "score": float(scores[i])}
+            for i in order
+        ]
+
+    @staticmethod
+    def _ages(memories: List[Dict[str, Any]]) -> np.ndarray:
+        """Seconds since each memory's timestamp (0 when missing or unparsable)"""
+        now = datetime.now()
+        ages = np.zeros(len(memories), dtype=np.float64)
+        for i, memory in enumerate(memories):
+            try:
+                stamp = datetime.fromisoformat(memory["metadata"]["timestamp"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if stamp.tzinfo is not None:
+                # Stored timestamps are naive local time
+                stamp = stamp.astimezone().replace(tzinfo=None)
+            ages[i] = (now - stamp).total_seconds()
+        return np.clip(ages, 0.0, None)
+
+    @staticmethod
+    def _format_results(results: Dict[str, Any], q: int) -> List[Dict[str, Any]]:
+        """Turn the q-th query of a store result into memory dicts"""
         memories = []
-        for i in range(len(results["ids"][0])):
+        for i in range(len(results["ids"][q])):
             memories.append({
-                "id": results["ids"][0][i],
-                "content": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i] if "distances" in results else None
+                "id": results["ids"][q][i],
+                "content": results["documents"][q][i],
+                "metadata": results["metadatas"][q][i],
+                "distance": results["distances"][q][i] if results.get("distances") else None
             })
 
         return memories
@@ -177,7 +663,7 @@ class RAGMemory:
             Memory data or None
         """
         try:
-            result = self.collection.get(ids=[memory_id])
+            result = self.store.get(ids=[memory_id])
             if result["ids"]:
                 return {
                     "id": result["ids"][0],
@@ -199,11 +685,39 @@ class RAGMemory:
             Success status
         """
         try:
-            self.collection.delete(ids=[memory_id])
+            self.store.delete(ids=[memory_id])
+            self.lexical_index.remove([memory_id])
             return True
         except Exception:
             return False
 
+    def select_context(self, memories: List[Dict[str, Any]], max_tokens: int) -> List[Dict[str, Any]]:
+        """
+        Pick the memories that fit a token budget with the highest total value
+
+        A memory's value is its re-ranking score when present, otherwise its
+        importance scaled by relevance, importance / (1 + distance). Token
+        counts come from the token_count metadata stored at add time (older
+        memories are counted on the fly).
+
+        Args:
+            memories: Search results
+            max_tokens: Token budget, including a small per-memory overhead
+
+        Returns:
+            The chosen memories, in their original (relevance) order
+        """
+        items = []
+        for memory in memories:
+            value = memory.get("score")
+            if value is None:
+                metadata = memory.get("metadata") or {}
+                distance = memory.get("distance") or 0.0
+                value = float(metadata.get("importance", 1.0)) / (1.0 + max(distance, 0.0))
+            items.append((memory_tokens(memory, self.token_model) + MEMORY_OVERHEAD_TOKENS, value))
+
+        return [memories[i] for i in pack_knapsack(items, max_tokens)]
+
     def get_conversation_context(
         self,
         query: str,
@@ -216,29 +730,17 @@ class RAGMemory:
         Args:
             query: Current query
             max_tokens: Maximum context tokens
-            top_k: Number of memories to retrieve
+            top_k: Number of memories to consider
 
         Returns:
             Formatted context string
         """
-        memories = self.search_memory(query, top_k=top_k)
-
-        context_parts = []
-        total_length = 0
-
-        for memory in memories:
-            content = memory["content"]
-            if total_length + len(content) > max_tokens * 4:  # Rough token estimate
-                break
-            context_parts.append(f"- {content}")
-            total_length += len(content)
-
-        return "\n".join(context_parts)
+        memories = self.select_context(self.search_memory(query, top_k=top_k), max_tokens)
+        return "\n".join(f"- {memory['content']}" for memory in memories)
 
     def clear_collection(self):
-        """Clear all memories from the collection"""
-        self.chroma_client.delete_collection(name=self.collection_name)
-        self.collection = self.chroma_client.create_collection(
-            name=self.collection_name,
-            metadata={"description": "Agent memory with RAG capabilities"}
-        )
+        """Clear all memories from the collection (and its ingest manifest)"""
+        self.store.clear()
+        self.lexical_index.clear()
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
@@ -0,0 +1,384 @@
+"""
+Resilience
+Retry with jittered exponential backoff, per-endpoint circuit breakers and a
+token-bucket rate limiter, shared by N8NClient, AsyncN8NClient and the
+embedding providers. Everything reports into thread-safe counters.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses where the server (or the proxy in front of it) did not process the
+# request, so retrying a non-idempotent call cannot run it twice
+UNPROCESSED_STATUSES = frozenset({429, 502, 503})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+class ResilienceCounters:
+    """Thread-safe named counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+# Process-wide counters used unless a component is given its own
+RESILIENCE_COUNTERS = ResilienceCounters()
+
+
+def get_resilience_stats() -> Dict[str, float]:
+    """Snapshot of the process-wide resilience counters"""
+    return RESILIENCE_COUNTERS.snapshot()
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a requests/httpx/openai error, if any"""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Delay requested by a Retry-After header on the error's response"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After"""
+
+    def __init__(
+        self,
+        retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_exceptions: Tuple[Type[BaseException], ...] = (),
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        counters: Optional[ResilienceCounters] = None,
+        name: str = "retry"
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            retries: Retries after the first attempt
+            base_delay: Backoff base in seconds
+            max_delay: Cap on a single backoff (and on honoured Retry-After)
+            retry_exceptions: Transport errors that are always retried
+            retry_statuses: HTTP statuses that are retried
+            counters: Counters to report into
+            name: Counter name prefix
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_exceptions = retry_exceptions
+        self.retry_statuses = frozenset(retry_statuses)
+        self.counters = counters or RESILIENCE_COUNTERS
+        self.name = name
+
+    def is_retryable(
+        self,
+        exc: BaseException,
+        statuses: Optional[Iterable[int]] = None,
+        exceptions: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> bool:
+        exceptions = self.retry_exceptions if exceptions is None else exceptions
+        if exceptions and isinstance(exc, exceptions):
+            return True
+        status = error_status(exc)
+        return status is not None and status in (self.retry_statuses if statuses is None else statuses)
+
+    def delay_for(self, attempt: int, exc: BaseException) -> float:
+        """Seconds to wait before retry number attempt (0-based)"""
+        requested = retry_after_seconds(exc)
+        if requested is not None:
+            self.counters.increment(f"{self.name}.retry_after_honoured")
+            return min(requested, self.max_delay)
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        statuses: Optional[Iterable[int]] = None,
+        exceptions: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> Any:
+        """
+        Call fn, retrying retryable failures
+
+        Args:
+            fn: Zero-argument callable
+            statuses: Override of the retryable statuses for this call
+            exceptions: Override of the retryable exceptions for this call
+
+        Returns:
+            fn's result
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.retries or not self.is_retryable(e, statuses, exceptions):
+                    if attempt:
+                        self.counters.increment(f"{self.name}.gave_up")
+                    raise
+                delay = self.delay_for(attempt, e)
+                self.counters.increment(f"{self.name}.retries")
+                self.counters.increment(f"{self.name}.backoff_seconds", delay)
+                attempt += 1
+                time.sleep(delay)
+
+    async def call_async(
+        self,
+        fn: Callable[[], Any],
+        statuses: Optional[Iterable[int]] = None,
+        exceptions: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> Any:
+        """Async counterpart of call; fn returns an awaitable"""
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt >= self.retries or not self.is_retryable(e, statuses, exceptions):
+                    if attempt:
+                        self.counters.increment(f"{self.name}.gave_up")
+                    raise
+                delay = self.delay_for(attempt, e)
+                self.counters.increment(f"{self.name}.retries")
+                self.counters.increment(f"{self.name}.backoff_seconds", delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated failures
+
+    Closed: calls pass. After failure_threshold consecutive failures the
+    circuit opens and calls raise CircuitOpenError for reset_timeout seconds.
+    Then one trial call is let through (half-open); success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        counters: Optional[ResilienceCounters] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.counters = counters or RESILIENCE_COUNTERS
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # Start time of the half-open trial call; a trial that never reports
+        # back (e.g. a cancelled task) is abandoned after reset_timeout
+        self._trial_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may proceed"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            trial_stale = self._trial_started is None or now - self._trial_started >= self.reset_timeout
+            if now - self._opened_at >= self.reset_timeout and trial_stale:
+                self._trial_started = now
+                return
+        self.counters.increment(f"circuit.{self.name}.rejected")
+        raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                self.counters.increment(f"circuit.{self.name}.closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            trial_failed = self._trial_started is not None
+            self._trial_started = None
+            if trial_failed or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self.counters.increment(f"circuit.{self.name}.opened")
+
+
+class CircuitBreakerRegistry:
+    """Lazily created circuit breakers, one per endpoint key"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        counters: Optional[ResilienceCounters] = None
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.counters = counters or RESILIENCE_COUNTERS
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout, self.counters)
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
+
+
+class TokenBucket:
+    """Client-side rate limiter; acquire blocks until enough tokens accrue"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        name: str = "rate_limit",
+        counters: Optional[ResilienceCounters] = None
+    ):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Burst size (defaults to one second of tokens)
+            name: Counter name prefix
+            counters: Counters to report into
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.name = name
+        self.counters = counters or RESILIENCE_COUNTERS
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly going negative) and return the wait needed"""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self.counters.increment(f"{self.name}.throttled")
+            self.counters.increment(f"{self.name}.wait_seconds", wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self.counters.increment(f"{self.name}.throttled")
+            self.counters.increment(f"{self.name}.wait_seconds", wait)
+            await asyncio.sleep(wait)
+
+
+def settings_from_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Resilience settings with defaults
+
+    The retry count comes from agent_settings.retry_attempts; everything
+    else from the resilience_settings section.
+
+    Args:
+        config: Application config
+
+    Returns:
+        Settings dict
+    """
+    config = config or {}
+    settings = dict(config.get("resilience_settings", {}))
+    settings.setdefault("retry_attempts", config.get("agent_settings", {}).get("retry_attempts", 3))
+    settings.setdefault("retry_base_delay", 0.5)
+    settings.setdefault("retry_max_delay", 30.0)
+    settings.setdefault("circuit_failure_threshold", 5)
+    settings.setdefault("circuit_reset_timeout", 30.0)
+    return settings
+
+
+def create_retry_policy(
+    settings: Dict[str, Any],
+    name: str,
+    retry_exceptions: Tuple[Type[BaseException], ...] = ()
+) -> RetryPolicy:
+    """Build a RetryPolicy from settings_from_config() output"""
+    return RetryPolicy(
+        retries=int(settings["retry_attempts"]),
+        base_delay=float(settings["retry_base_delay"]),
+        max_delay=float(settings["retry_max_delay"]),
+        retry_exceptions=retry_exceptions,
+        name=name
+    )
+
+
+def create_circuit_breakers(settings: Dict[str, Any]) -> CircuitBreakerRegistry:
+    """Build a CircuitBreakerRegistry from settings_from_config() output"""
+    return CircuitBreakerRegistry(
+        failure_threshold=int(settings["circuit_failure_threshold"]),
+        reset_timeout=float(settings["circuit_reset_timeout"])
+    )
@@ -0,0 +1,134 @@
+"""
+Token Counting
+Exact token counts via tiktoken with cached encoders, and a knapsack packer
+that fills a context budget with the most valuable memories.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+DEFAULT_TOKEN_MODEL = "gpt-4"
+FALLBACK_ENCODING = "cl100k_base"
+
+# Tokens spent on the separator/bullet around each packed memory
+MEMORY_OVERHEAD_TOKENS = 2
+
+_encoders: Dict[str, Any] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model: str = DEFAULT_TOKEN_MODEL):
+    """
+    Get the cached tiktoken encoder for a model
+
+    Unknown models use cl100k_base. Returns None when tiktoken is not
+    installed or its encoding files cannot be loaded (e.g. offline); the
+    failure is cached too so it is only paid once.
+
+    Args:
+        model: Model name
+
+    Returns:
+        tiktoken Encoding or None
+    """
+    with _encoders_lock:
+        if model in _encoders:
+            return _encoders[model]
+
+        encoder = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                try:
+                    encoder = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoder = tiktoken.get_encoding(FALLBACK_ENCODING)
+            except Exception:
+                encoder = None
+        _encoders[model] = encoder
+        return encoder
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, used without an encoder and for embedding request packing"""
+    return len(text) // 4 + 1
+
+
+def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """
+    Count the tokens in text
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Token count (estimated as len/4 without tiktoken)
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode_ordinary(text))
+
+
+def count_tokens_many(texts: Sequence[str], model: str = DEFAULT_TOKEN_MODEL) -> List[int]:
+    """Count tokens for many texts (tiktoken encodes the batch in parallel)"""
+    encoder = get_encoder(model)
+    if encoder is None:
+        return [estimate_tokens(text) for text in texts]
+    if len(texts) == 1:
+        return [len(encoder.encode_ordinary(texts[0]))]
+    return [len(tokens) for tokens in encoder.encode_ordinary_batch(list(texts))]
+
+
+def pack_knapsack(items: Sequence[Tuple[int, float]], budget: int) -> List[int]:
+    """
+    Choose items maximizing total value within a token budget (0/1 knapsack)
+
+    Dynamic programming over the budget, vectorized per item:
+    O(len(items) * budget) time, with len(items) * budget bits for the
+    backtracking table.
+
+    Args:
+        items: (token cost, value) pairs
+        budget: Maximum total token cost
+
+    Returns:
+        Indices of the chosen items, in input order
+    """
+    if budget < 0 or not items:
+        return []
+
+    best = np.zeros(budget + 1, dtype=np.float64)
+    taken = np.zeros((len(items), budget + 1), dtype=bool)
+    for i, (cost, value) in enumerate(items):
+        if cost > budget or value <= 0:
+            continue
+        cost = max(int(cost), 0)
+        candidate = best[:budget + 1 - cost] + value
+        improved = candidate > best[cost:]
+        taken[i, cost:] = improved
+        best[cost:] = np.where(improved, candidate, best[cost:])
+
+    chosen = []
+    remaining = budget
+    for i in range(len(items) - 1, -1, -1):
+        if taken[i, remaining]:
+            chosen.append(i)
+            remaining -= max(int(items[i][0]), 0)
+    return chosen[::-1]
+
+
+def memory_tokens(memory: Dict[str, Any], model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """Token count of a memory, from its metadata when it was stored with one"""
+    token_count: Optional[int] = (memory.get("metadata") or {}).get("token_count")
+    if token_count is None:
+        token_count = count_tokens(memory["content"], model)
+    return int(token_count)
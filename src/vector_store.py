@@ -0,0 +1,1101 @@
+"""
+Vector Stores
+Storage backends for RAG memory: ChromaDB, an in-process NumPy store and a
+memory-mapped snapshot store. All return Chroma-shaped result dicts so
+RAGMemory can treat them alike.
+"""
+
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .ann_index import IVFIndex, create_ann_index
+from .collection_snapshot import SNAPSHOT_DTYPES, CollectionSnapshot, SnapshotWriter
+from .quantization import DEFAULT_RESCORE_FACTOR, QUANTIZATIONS, Quantizer, create_quantizer
+
+try:
+    import chromadb
+    from chromadb.config import Settings
+    CHROMADB_AVAILABLE = True
+except ImportError:
+    CHROMADB_AVAILABLE = False
+
+COLLECTION_METADATA = {"description": "Agent memory with RAG capabilities"}
+
+# Rows read, encoded or rewritten per block by the NumPy and memmap stores
+BLOCK_ROWS = 65536
+
+# Tries at opening the current snapshot while a writer replaces it
+SNAPSHOT_OPEN_ATTEMPTS = 5
+
+# Process-wide registries so every RAGMemory shares one database client per
+# persist directory (and one in-process store per NumPy or memmap collection)
+_chroma_clients: Dict[str, Any] = {}
+_numpy_stores: Dict[str, "NumpyVectorStore"] = {}
+_memmap_stores: Dict[str, "MemmapVectorStore"] = {}
+_registry_lock = threading.Lock()
+
+
+def get_chroma_client(persist_directory: str = "./chroma_db"):
+    """
+    Get the shared Chroma client for a persist directory, creating it lazily
+
+    Args:
+        persist_directory: Chroma data directory
+
+    Returns:
+        Chroma client shared by all collections in the directory
+    """
+    if not CHROMADB_AVAILABLE:
+        raise ImportError("chromadb not installed. Run: pip install chromadb")
+
+    key = os.path.abspath(persist_directory)
+    with _registry_lock:
+        client = _chroma_clients.get(key)
+        if client is None:
+            if hasattr(chromadb, "PersistentClient"):
+                client = chromadb.PersistentClient(path=persist_directory)
+            else:
+                # chromadb < 0.4 only understands the legacy settings
+                client = chromadb.Client(Settings(
+                    chroma_db_impl="duckdb+parquet",
+                    persist_directory=persist_directory
+                ))
+            _chroma_clients[key] = client
+    return client
+
+
+def similarity_from_distances(distances: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Convert query distances to cosine similarity
+
+    Args:
+        distances: Distances as returned by a store's query
+        metric: The store's distance_metric ("cosine", "ip" or "l2", where
+            l2 is Chroma's squared Euclidean distance and assumes
+            unit-length embeddings)
+
+    Returns:
+        Similarities in the same shape
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    if metric == "l2":
+        # |a - b|^2 = 2 - 2 cos(a, b) for unit vectors
+        return 1.0 - distances / 2.0
+    return 1.0 - distances
+
+
+def matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a Chroma-style metadata filter
+
+    Supports {"key": value}, {"key": {"$eq" | "$ne" | "$gt" | "$gte" |
+    "$lt" | "$lte" | "$in" | "$nin": value}} and the "$and" / "$or"
+    combinators. Multiple top-level keys are ANDed.
+
+    Args:
+        metadata: Memory metadata
+        where: Filter expression
+
+    Returns:
+        Whether the metadata satisfies the filter
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        present = key in metadata
+        value = metadata.get(key)
+        for op, operand in condition.items():
+            if op == "$eq":
+                ok = present and value == operand
+            elif op == "$ne":
+                ok = not present or value != operand
+            elif op == "$in":
+                ok = present and value in operand
+            elif op == "$nin":
+                ok = not present or value not in operand
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                try:
+                    ok = present and {
+                        "$gt": value > operand,
+                        "$gte": value >= operand,
+                        "$lt": value < operand,
+                        "$lte": value <= operand
+                    }[op]
+                except TypeError:
+                    ok = False
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+
+    return True
+
+
+class VectorStore:
+    """Interface for vector storage backends"""
+
+    # Meaning of the "distances" returned by query (see similarity_from_distances)
+    distance_metric: str = "cosine"
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """Add vectors with their documents and metadata"""
+        raise NotImplementedError
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Find the nearest stored vectors for each query embedding
+
+        Returns:
+            Dict with "ids", "documents", "metadatas" and "distances", each a
+            list with one result list per query
+        """
+        raise NotImplementedError
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Fetch stored items by ID and/or metadata filter
+
+        Returns:
+            Dict with "ids", "documents" and "metadatas"
+        """
+        raise NotImplementedError
+
+    def get_embeddings(self, ids: List[str]) -> np.ndarray:
+        """Stored vectors for the given IDs, one float32 row each"""
+        raise NotImplementedError
+
+    def delete(self, ids: List[str]):
+        """Delete items by ID"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of stored items"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every item"""
+        raise NotImplementedError
+
+    def persist(self):
+        """Flush pending state to disk (no-op for backends that do it themselves)"""
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a ChromaDB collection"""
+
+    def __init__(
+        self,
+        collection_name: str,
+        persist_directory: str = "./chroma_db",
+        hnsw: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the Chroma backend
+
+        Args:
+            collection_name: Name of the Chroma collection
+            persist_directory: Chroma data directory
+            hnsw: Chroma HNSW parameters ("hnsw:M", "hnsw:construction_ef",
+                "hnsw:search_ef"), applied when the collection is created
+        """
+        self.collection_name = collection_name
+        self.client = get_chroma_client(persist_directory)
+        self.metadata = {**COLLECTION_METADATA, **(hnsw or {})}
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name,
+            metadata=self.metadata
+        )
+
+    @property
+    def distance_metric(self) -> str:
+        return (self.collection.metadata or {}).get("hnsw:space", "l2")
+
+    def add(self, ids, embeddings, documents, metadatas):
+        # Chroma validates embeddings as plain lists
+        self.collection.add(
+            embeddings=np.asarray(embeddings, dtype=np.float32).tolist(),
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids
+        )
+
+    def query(self, query_embeddings, n_results=5, where=None):
+        return self.collection.query(
+            query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
+            n_results=n_results,
+            where=where
+        )
+
+    def get(self, ids=None, where=None):
+        return self.collection.get(ids=ids, where=where)
+
+    def get_embeddings(self, ids):
+        # Chroma does not promise to return IDs in the order requested
+        result = self.collection.get(ids=ids, include=["embeddings"])
+        vectors = dict(zip(result["ids"], result["embeddings"]))
+        return np.array([vectors[memory_id] for memory_id in ids], dtype=np.float32).reshape(len(ids), -1)
+
+    def delete(self, ids):
+        self.collection.delete(ids=ids)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def clear(self):
+        self.client.delete_collection(name=self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata=self.metadata
+        )
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store over a contiguous float32 matrix
+
+    Rows are L2-normalized on insert, so a query is one matrix-vector product
+    followed by an argpartition top-k. Distances are cosine distances
+    (1 - cosine similarity).
+
+    With an IVFIndex, each row also records its list number and, once the
+    store is large enough, queries only score the rows of the nearest
+    lists (see IVFIndex).
+
+    With a quantization other than float32, the in-memory matrix holds
+    float16, int8 or product-quantized codes instead (see quantization.py).
+    Queries rank by the approximate scores, then re-score the best
+    k * rescore_factor candidates exactly against the full-precision
+    vectors in the store's vector file, which are read through a memory
+    map rather than kept in RAM.
+
+    With a persist_directory, writes are appended to a vector file and a
+    JSON-lines record log, which are replayed on startup; the IVF centroids
+    and product-quantization codebooks are saved next to them.
+    """
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        initial_capacity: int = 1024,
+        ann: Optional[IVFIndex] = None,
+        quantization: str = "float32",
+        pq_subvectors: int = 0,
+        rescore_factor: int = DEFAULT_RESCORE_FACTOR
+    ):
+        """
+        Initialize the NumPy backend
+
+        Args:
+            persist_directory: Directory for the append-only log (in-memory
+                only when None)
+            initial_capacity: Rows allocated up front; grows by doubling
+            ann: Approximate index (exact search when None)
+            quantization: In-memory encoding, one of QUANTIZATIONS
+            pq_subvectors: Subvectors for "pq" (0 = dimensions / 16)
+            rescore_factor: Candidates re-scored at full precision per
+                result for lossy quantizations (needs a persist_directory)
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}")
+        if quantization == "pq" and not persist_directory:
+            raise ValueError("Product quantization needs a persist_directory to train from")
+        self.persist_directory = persist_directory
+        self.ann = ann
+        self.quantization = quantization
+        self.pq_subvectors = pq_subvectors
+        self.rescore_factor = max(1, rescore_factor)
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._initial_capacity = initial_capacity
+        self._reset(dimensions=0)
+
+        if persist_directory:
+            os.makedirs(persist_directory, exist_ok=True)
+            self._load()
+
+    def _reset(self, dimensions: int):
+        self.dimensions = dimensions
+        self.quantizer = create_quantizer(self.quantization, dimensions, self.pq_subvectors) \
+            if dimensions else Quantizer(0)
+        self._matrix = self.quantizer.empty(self._initial_capacity if dimensions else 0)
+        self._lists = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        # Row of each vector in the vector file, for full-precision reads
+        self._file_rows = np.zeros(self._matrix.shape[0], dtype=np.int64)
+        self._size = 0
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.persist_directory, name)
+
+    @property
+    def _vectors_path(self) -> str:
+        return self._path(f"vectors-{self._generation}.f32")
+
+    @property
+    def _records_path(self) -> str:
+        return self._path(f"records-{self._generation}.jsonl")
+
+    @property
+    def _ivf_path(self) -> str:
+        return self._path(f"ivf-{self._generation}.npz")
+
+    @property
+    def _quantizer_path(self) -> str:
+        return self._path(f"pq-{self._generation}.npz")
+
+    def _open_vectors(self) -> Optional[np.ndarray]:
+        """Read-only memory map of the full-precision vector file, if any"""
+        if not self.persist_directory or not os.path.exists(self._vectors_path):
+            return None
+        if not os.path.getsize(self._vectors_path):
+            return None
+        return np.memmap(self._vectors_path, dtype=np.float32, mode="r").reshape(-1, self.dimensions)
+
+    def _vectors(self, rows) -> np.ndarray:
+        """
+        Full-precision vectors of rows (an index array or slice)
+
+        Read from the vector file when the in-memory matrix is quantized,
+        decoded from the codes for an in-memory-only store.
+        """
+        if self.quantizer.lossy:
+            vectors = self._open_vectors()
+            if vectors is not None:
+                return np.asarray(vectors[self._file_rows[rows]])
+        return self.quantizer.decode(self._matrix[rows])
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes of vector data held in memory for the stored rows"""
+        return self._size * self.quantizer.bytes_per_vector
+
+    def _write_header(self):
+        """Atomically point the store at the current generation's files"""
+        tmp_path = self._path("header.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"dimensions": self.dimensions, "generation": self._generation}, f)
+        os.replace(tmp_path, self._path("header.json"))
+
+    def _load(self):
+        """Replay the on-disk log into memory"""
+        self._generation = 0
+        if not os.path.exists(self._path("header.json")):
+            return
+
+        with open(self._path("header.json"), "r") as f:
+            header = json.load(f)
+        self._generation = header["generation"]
+        dimensions = header["dimensions"]
+        if not os.path.exists(self._records_path):
+            return
+
+        live: Dict[str, Dict[str, Any]] = {}
+        with open(self._records_path, "r") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["op"] == "add":
+                    live[record["id"]] = record
+                else:
+                    live.pop(record["id"], None)
+
+        self._reset(dimensions)
+        records = list(live.values())
+        if not records:
+            return
+
+        vectors = self._open_vectors()
+        self.quantizer.load(self._quantizer_path)
+        ann_trained = self.ann is not None and self.ann.load(self._ivf_path)
+        for start in range(0, len(records), BLOCK_ROWS):
+            block = records[start:start + BLOCK_ROWS]
+            file_rows = np.array([record["row"] for record in block], dtype=np.int64)
+            rows = np.asarray(vectors[file_rows])
+            lists = None
+            if ann_trained:
+                lists = np.array([record.get("list", -1) for record in block], dtype=np.int32)
+                unassigned = lists < 0
+                if unassigned.any():
+                    lists[unassigned] = self.ann.assign(rows[unassigned])
+            self._append(
+                [record["id"] for record in block],
+                rows,
+                [record["document"] for record in block],
+                [record["metadata"] for record in block],
+                lists,
+                file_rows
+            )
+        self._train()
+
+    def _ensure_capacity(self, needed: int):
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity = max(capacity * 2, self._initial_capacity)
+        grown = self.quantizer.empty(capacity)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        lists = np.full(capacity, -1, dtype=np.int32)
+        lists[:self._size] = self._lists[:self._size]
+        self._lists = lists
+        file_rows = np.zeros(capacity, dtype=np.int64)
+        file_rows[:self._size] = self._file_rows[:self._size]
+        self._file_rows = file_rows
+
+    def _append(
+        self,
+        ids,
+        rows: np.ndarray,
+        documents,
+        metadatas,
+        lists: Optional[np.ndarray] = None,
+        file_rows: Optional[np.ndarray] = None
+    ):
+        start = self._size
+        self._ensure_capacity(start + len(ids))
+        self._matrix[start:start + len(ids)] = self.quantizer.encode(rows)
+        self._lists[start:start + len(ids)] = -1 if lists is None else lists
+        self._file_rows[start:start + len(ids)] = 0 if file_rows is None else file_rows
+        self._size += len(ids)
+        for offset, memory_id in enumerate(ids):
+            self._rows[memory_id] = start + offset
+        self._ids.extend(ids)
+        self._documents.extend(documents)
+        self._metadatas.extend(metadatas)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def add(self, ids, embeddings, documents, metadatas):
+        if not ids:
+            return
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            if not self.dimensions:
+                self._reset(vectors.shape[1])
+            if vectors.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dimensions}"
+                )
+            duplicates = [memory_id for memory_id in ids if memory_id in self._rows]
+            if duplicates or len(set(ids)) != len(ids):
+                raise ValueError(f"Duplicate memory IDs: {duplicates or ids}")
+
+            lists = self.ann.assign(vectors) if self.ann is not None else None
+            file_rows = None
+            if self.persist_directory:
+                first_row = self._log_add(ids, vectors, documents, metadatas, lists)
+                file_rows = np.arange(first_row, first_row + len(ids), dtype=np.int64)
+            self._append(list(ids), vectors, list(documents), [dict(m) for m in metadatas], lists, file_rows)
+            self._train()
+
+    def _train(self):
+        """(Re)train the product quantizer and IVF index once the store has grown enough"""
+        if self.quantizer.needs_training(self._size):
+            self.quantizer.train(self._vectors(self.quantizer.training_rows(self._size)), self._size)
+            for start in range(0, self._size, BLOCK_ROWS):
+                end = min(start + BLOCK_ROWS, self._size)
+                self._matrix[start:end] = self.quantizer.encode(self._vectors(slice(start, end)))
+            self.quantizer.save(self._quantizer_path)
+
+        if self.ann is not None and self.ann.needs_training(self._size):
+            self.ann.train(self._vectors(self.ann.training_rows(self._size)), self._size)
+            for start in range(0, self._size, BLOCK_ROWS):
+                end = min(start + BLOCK_ROWS, self._size)
+                self._lists[start:end] = self.ann.assign(self._vectors(slice(start, end)))
+            if self.persist_directory:
+                # Rewrite the log so every record carries its new list number
+                self._start_generation()
+
+    def _log_add(self, ids, vectors: np.ndarray, documents, metadatas, lists: Optional[np.ndarray] = None) -> int:
+        """Append to the vector file and record log; returns the first vector file row"""
+        if not os.path.exists(self._path("header.json")):
+            self._write_header()
+        first_row = os.path.getsize(self._vectors_path) // (4 * self.dimensions) \
+            if os.path.exists(self._vectors_path) else 0
+        with open(self._vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+        with open(self._records_path, "a") as f:
+            for offset, (memory_id, document, metadata) in enumerate(zip(ids, documents, metadatas)):
+                record = {
+                    "op": "add",
+                    "id": memory_id,
+                    "row": first_row + offset,
+                    "document": document,
+                    "metadata": metadata
+                }
+                if lists is not None and lists[offset] >= 0:
+                    record["list"] = int(lists[offset])
+                f.write(json.dumps(record) + "\n")
+        return first_row
+
+    def _filter_mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        return np.fromiter(
+            (matches_where(metadata, where) for metadata in self._metadatas),
+            dtype=bool,
+            count=self._size
+        )
+
+    def query(self, query_embeddings, n_results=5, where=None):
+        queries = self._normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        results: Dict[str, List[List[Any]]] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        with self._lock:
+            mask = self._filter_mask(where) if self._size else None
+            available = self._size if mask is None else int(mask.sum())
+            k = min(n_results, available)
+            approximate = (
+                k > 0 and self.ann is not None and self.ann.trained and self._size >= self.ann.min_size
+            )
+            # Lossy codes: rank more candidates, then re-score them exactly
+            fetch = k * self.rescore_factor if self.quantizer.lossy else k
+            if k > 0 and not approximate:
+                scores = self.quantizer.scores(self._matrix[:self._size], queries)
+                if mask is not None:
+                    scores[:, ~mask] = -np.inf
+
+            for q in range(len(queries)):
+                if k <= 0:
+                    rows, row_scores = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+                else:
+                    if approximate:
+                        rows, row_scores = self._search_lists(queries[q], fetch, mask)
+                    else:
+                        rows, row_scores = self._top_k(scores[q], fetch)
+                    found = np.isfinite(row_scores)
+                    rows, row_scores = self._rescore(rows[found], row_scores[found], queries[q], k)
+                results["ids"].append([self._ids[r] for r in rows])
+                results["documents"].append([self._documents[r] for r in rows])
+                results["metadatas"].append([self._metadatas[r] for r in rows])
+                results["distances"].append([float(1.0 - score) for score in row_scores])
+
+        return results
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int):
+        """Positions and values of the k highest scores, best first"""
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")][:k]
+        return top, scores[top]
+
+    def _search_lists(self, query: np.ndarray, k: int, mask: Optional[np.ndarray]):
+        """Top k rows among the nprobe nearest IVF lists (all rows if they hold fewer than k)"""
+        probed = np.zeros(len(self.ann.centroids) + 1, dtype=bool)  # last entry: unassigned (-1)
+        probed[self.ann.probe(query)] = True
+        candidates = np.flatnonzero(probed[self._lists[:self._size]])
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if len(candidates) < k:
+            scores = self.quantizer.scores(self._matrix[:self._size], query[None])[0]
+            if mask is not None:
+                scores[~mask] = -np.inf
+            return self._top_k(scores, k)
+        top, scores = self._top_k(self.quantizer.scores(self._matrix[candidates], query[None])[0], k)
+        return candidates[top], scores
+
+    def _rescore(self, rows: np.ndarray, scores: np.ndarray, query: np.ndarray, k: int):
+        """Exact top k of ranked candidate rows from full-precision vectors (lossy codes only)"""
+        if not self.quantizer.lossy or not len(rows):
+            return rows[:k], scores[:k]
+        top, exact = self._top_k(self._vectors(rows) @ query, min(k, len(rows)))
+        return rows[top], exact
+
+    def get(self, ids=None, where=None):
+        with self._lock:
+            if ids is None:
+                rows = range(self._size)
+            else:
+                rows = [self._rows[memory_id] for memory_id in ids if memory_id in self._rows]
+            rows = [r for r in rows if matches_where(self._metadatas[r], where)]
+            return {
+                "ids": [self._ids[r] for r in rows],
+                "documents": [self._documents[r] for r in rows],
+                "metadatas": [self._metadatas[r] for r in rows]
+            }
+
+    def get_embeddings(self, ids: List[str]) -> np.ndarray:
+        """Normalized stored vectors for the given IDs (full precision when on disk)"""
+        with self._lock:
+            rows = np.array([self._rows[memory_id] for memory_id in ids], dtype=np.int64)
+            return np.array(self._vectors(rows), dtype=np.float32)
+
+    def delete(self, ids):
+        with self._lock:
+            doomed = [memory_id for memory_id in ids if memory_id in self._rows]
+            if not doomed:
+                return
+            if self.persist_directory:
+                with open(self._records_path, "a") as f:
+                    for memory_id in doomed:
+                        f.write(json.dumps({"op": "delete", "id": memory_id}) + "\n")
+
+            # Move the last row into each hole to keep the matrix contiguous
+            for memory_id in doomed:
+                row = self._rows.pop(memory_id)
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._lists[row] = self._lists[last]
+                    self._file_rows[row] = self._file_rows[last]
+                    self._ids[row] = self._ids[last]
+                    self._documents[row] = self._documents[last]
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[self._ids[row]] = row
+                self._ids.pop()
+                self._documents.pop()
+                self._metadatas.pop()
+                self._size -= 1
+
+    def count(self) -> int:
+        return self._size
+
+    def clear(self):
+        with self._lock:
+            self._reset(self.dimensions)
+            if self.ann is not None:
+                self.ann.reset()
+            if self.persist_directory:
+                self._start_generation()
+
+    def persist(self):
+        """Compact the on-disk log down to the live rows"""
+        if not self.persist_directory:
+            return
+        with self._lock:
+            self._start_generation()
+
+    def _start_generation(self):
+        """Write the live rows to a new log generation and drop the old one"""
+        old_files = [self._vectors_path, self._records_path, self._ivf_path, self._quantizer_path]
+        # Quantized rows are copied at full precision from the old vector file
+        old_vectors = self._open_vectors() if self.quantizer.lossy else None
+        self._generation += 1
+        for start in range(0, self._size, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, self._size)
+            if old_vectors is not None:
+                vectors = np.asarray(old_vectors[self._file_rows[start:end]])
+            else:
+                vectors = self._matrix[start:end]
+            first_row = self._log_add(
+                self._ids[start:end],
+                vectors,
+                self._documents[start:end],
+                self._metadatas[start:end],
+                self._lists[start:end]
+            )
+            self._file_rows[start:end] = np.arange(first_row, first_row + end - start)
+        del old_vectors
+        if self.ann is not None:
+            self.ann.save(self._ivf_path)
+        self.quantizer.save(self._quantizer_path)
+        if self.dimensions:
+            self._write_header()
+        for path in old_files:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class MemmapVectorStore(VectorStore):
+    """
+    Read-optimized store over a memory-mapped collection snapshot
+
+    The collection lives in an immutable snapshot (see collection_snapshot.py)
+    whose files are memory-mapped rather than read, so a process opens a
+    collection of any size in milliseconds and every process serving it
+    shares one page-cached copy of the matrix. Queries score every row
+    exactly, like a NumpyVectorStore without an index.
+
+    Writes go to a small persisted NumpyVectorStore (the delta) and a log of
+    deleted snapshot IDs; persist() folds both into the next snapshot
+    generation and switches header.json to it atomically. Every call checks
+    header.json, so other processes see a process's writes once it has
+    persisted them. One process should write to a collection at a time.
+    """
+
+    def __init__(self, persist_directory: str, dtype: str = "float32"):
+        """
+        Open a collection, creating its directory if needed
+
+        Args:
+            persist_directory: Directory holding the snapshot generations
+            dtype: Matrix element type of new snapshots, one of
+                SNAPSHOT_DTYPES ("float16" halves memory and disk use)
+        """
+        if dtype not in SNAPSHOT_DTYPES:
+            raise ValueError(f"Unknown snapshot dtype: {dtype}")
+        self.persist_directory = persist_directory
+        self.dtype = dtype
+        self._lock = threading.RLock()
+        self._generation = -1
+        self._header_signature = None
+        self._snapshot = CollectionSnapshot.empty(dtype)
+        self._delta: Optional[NumpyVectorStore] = None
+        self._deleted = np.zeros(0, dtype=bool)
+        self._deleted_count = 0
+        os.makedirs(persist_directory, exist_ok=True)
+        self._refresh()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.persist_directory, name)
+
+    @property
+    def _deleted_path(self) -> str:
+        return self._path(f"deleted-{self._generation}.jsonl")
+
+    @property
+    def dimensions(self) -> int:
+        return self._snapshot.dimensions or self._delta.dimensions
+
+    def _refresh(self):
+        """Open the generation header.json points at, unless it is already open"""
+        for _ in range(SNAPSHOT_OPEN_ATTEMPTS):
+            try:
+                stat = os.stat(self._path("header.json"))
+                signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            if self._generation >= 0 and signature == self._header_signature:
+                return
+            try:
+                generation = 0  # Never persisted: empty
+                if signature is not None:
+                    with open(self._path("header.json"), "r") as f:
+                        generation = json.load(f)["generation"]
+                if generation != self._generation:
+                    self._open(generation)
+                self._header_signature = signature
+                return
+            except FileNotFoundError:
+                # A writer moved on and removed this generation while it was opened
+                continue
+        raise RuntimeError(f"Could not open a consistent snapshot in {self.persist_directory}")
+
+    def _open(self, generation: int):
+        if generation:
+            snapshot = CollectionSnapshot(self._path(f"snapshot-{generation}"))
+        else:
+            snapshot = CollectionSnapshot.empty(self.dtype)
+        delta = NumpyVectorStore(self._path(f"delta-{generation}"))
+
+        old_snapshot = self._snapshot
+        self._snapshot, self._delta, self._generation = snapshot, delta, generation
+        self._deleted = np.zeros(snapshot.count, dtype=bool)
+        if os.path.exists(self._deleted_path):
+            with open(self._deleted_path, "r") as f:
+                rows = snapshot.rows_for([json.loads(line) for line in f])
+            self._deleted[rows[rows >= 0]] = True
+        self._deleted_count = int(self._deleted.sum())
+        old_snapshot.close()
+
+    def _live_rows(self, ids: List[str]) -> np.ndarray:
+        """Snapshot row of each ID (-1 where absent or deleted)"""
+        rows = self._snapshot.rows_for(ids)
+        live = rows >= 0
+        live[live] = ~self._deleted[rows[live]]
+        return np.where(live, rows, -1)
+
+    def add(self, ids, embeddings, documents, metadatas):
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            self._refresh()
+            dimensions = self._snapshot.dimensions
+            if dimensions and vectors.shape[-1] != dimensions:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[-1]} does not match store dimension {dimensions}"
+                )
+            duplicates = [memory_id for memory_id, row in zip(ids, self._live_rows(ids)) if row >= 0]
+            if duplicates:
+                raise ValueError(f"Duplicate memory IDs: {duplicates}")
+            self._delta.add(ids, vectors, documents, metadatas)
+
+    def query(self, query_embeddings, n_results=5, where=None):
+        queries = NumpyVectorStore._normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        results: Dict[str, List[List[Any]]] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        with self._lock:
+            self._refresh()
+            scores = None
+            if self._snapshot.count and n_results > 0:
+                scores = self._snapshot.scores(queries)
+                if self._deleted_count:
+                    scores[:, self._deleted] = -np.inf
+            delta = self._delta.query(queries, n_results, where) if self._delta.count() else None
+
+            for q in range(len(queries)):
+                # (distance, id, document, metadata), merged across snapshot and delta
+                hits = self._top_rows(scores[q], n_results, where) if scores is not None else []
+                if delta is not None:
+                    hits.extend(zip(delta["distances"][q], delta["ids"][q],
+                                    delta["documents"][q], delta["metadatas"][q]))
+                    hits = sorted(hits, key=lambda hit: hit[0])[:n_results]
+                results["ids"].append([hit[1] for hit in hits])
+                results["documents"].append([hit[2] for hit in hits])
+                results["metadatas"].append([hit[3] for hit in hits])
+                results["distances"].append([hit[0] for hit in hits])
+
+        return results
+
+    def _top_rows(self, scores: np.ndarray, k: int, where: Optional[Dict[str, Any]]):
+        """Best k snapshot rows passing the filter, decoding records only for candidates"""
+        fetch = k
+        while True:
+            rows, row_scores = NumpyVectorStore._top_k(scores, min(fetch, len(scores)))
+            found = np.isfinite(row_scores)
+            hits = []
+            for row, score in zip(rows[found], row_scores[found]):
+                document, metadata = self._snapshot.record(row)
+                if matches_where(metadata, where):
+                    hits.append((float(1.0 - score), self._snapshot.id(row), document, metadata))
+                    if len(hits) == k:
+                        return hits
+            if fetch >= len(scores) or not found.all():
+                return hits
+            # The filter rejected too many candidates: widen the search
+            fetch *= 4
+
+    def get(self, ids=None, where=None):
+        with self._lock:
+            self._refresh()
+            snapshot = self._snapshot
+            if ids is None:
+                items = [(snapshot.id(row), *snapshot.record(row)) for row in np.flatnonzero(~self._deleted)]
+                delta = self._delta.get()
+                items.extend(zip(delta["ids"], delta["documents"], delta["metadatas"]))
+            else:
+                delta = self._delta.get(ids)
+                in_delta = dict(zip(delta["ids"], zip(delta["documents"], delta["metadatas"])))
+                items = []
+                for memory_id, row in zip(ids, self._live_rows(ids)):
+                    if row >= 0:
+                        items.append((memory_id, *snapshot.record(row)))
+                    elif memory_id in in_delta:
+                        items.append((memory_id, *in_delta[memory_id]))
+            items = [item for item in items if matches_where(item[2], where)]
+            return {
+                "ids": [item[0] for item in items],
+                "documents": [item[1] for item in items],
+                "metadatas": [item[2] for item in items]
+            }
+
+    def get_embeddings(self, ids):
+        """Normalized stored vectors for the given IDs"""
+        with self._lock:
+            self._refresh()
+            rows = self._live_rows(ids)
+            in_snapshot = rows >= 0
+            vectors = np.zeros((len(ids), self.dimensions), dtype=np.float32)
+            if in_snapshot.any():
+                vectors[in_snapshot] = self._snapshot.embeddings(rows[in_snapshot])
+            if not in_snapshot.all():
+                vectors[~in_snapshot] = self._delta.get_embeddings(
+                    [ids[i] for i in np.flatnonzero(~in_snapshot)]
+                )
+            return vectors
+
+    def delete(self, ids):
+        with self._lock:
+            self._refresh()
+            rows = self._live_rows(ids)
+            doomed = [memory_id for memory_id, row in zip(ids, rows) if row >= 0]
+            if doomed:
+                with open(self._deleted_path, "a") as f:
+                    for memory_id in doomed:
+                        f.write(json.dumps(memory_id) + "\n")
+                self._deleted[rows[rows >= 0]] = True
+                self._deleted_count = int(self._deleted.sum())
+            self._delta.delete(ids)
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._snapshot.count - self._deleted_count + self._delta.count()
+
+    def clear(self):
+        with self._lock:
+            self._refresh()
+            self._write_generation([], self.dimensions)
+
+    def persist(self):
+        """Fold the delta and deletions into a new snapshot generation"""
+        with self._lock:
+            self._refresh()
+            if self._delta.count() or self._deleted_count:
+                self._write_generation(self._live_batches(), self.dimensions)
+
+    def import_collection(self, source: VectorStore, batch_size: int = BLOCK_ROWS):
+        """
+        Replace the collection with another store's contents
+
+        The source is read once (IDs, documents and metadata, then the
+        embeddings in batches) and written straight into a new snapshot,
+        e.g. to convert a ChromaDB collection.
+
+        Args:
+            source: Store to copy, which must implement get_embeddings
+            batch_size: Embeddings fetched per source call
+        """
+        items = source.get()
+
+        def batches():
+            for start in range(0, len(items["ids"]), batch_size):
+                ids = items["ids"][start:start + batch_size]
+                yield (
+                    ids,
+                    NumpyVectorStore._normalize(source.get_embeddings(ids)),
+                    items["documents"][start:start + batch_size],
+                    items["metadatas"][start:start + batch_size]
+                )
+
+        with self._lock:
+            self._refresh()
+            self._write_generation(batches(), 0)
+
+    def _live_batches(self):
+        """Blocks of (ids, vectors, documents, metadatas) of every live row"""
+        snapshot = self._snapshot
+        for start in range(0, snapshot.count, BLOCK_ROWS):
+            rows = np.arange(start, min(start + BLOCK_ROWS, snapshot.count))
+            rows = rows[~self._deleted[rows]]
+            records = [snapshot.record(row) for row in rows]
+            yield (
+                [snapshot.id(row) for row in rows],
+                snapshot.embeddings(rows),
+                [document for document, _ in records],
+                [metadata for _, metadata in records]
+            )
+        delta = self._delta.get()
+        for start in range(0, len(delta["ids"]), BLOCK_ROWS):
+            ids = delta["ids"][start:start + BLOCK_ROWS]
+            yield (
+                ids,
+                self._delta.get_embeddings(ids),
+                delta["documents"][start:start + BLOCK_ROWS],
+                delta["metadatas"][start:start + BLOCK_ROWS]
+            )
+
+    def _write_generation(self, batches, dimensions: int):
+        """Write rows as the next snapshot, switch the header to it and drop older generations"""
+        generation = self._generation + 1
+        writer = SnapshotWriter(self._path(f"snapshot-{generation}"), self.dtype, dimensions)
+        try:
+            for batch in batches:
+                writer.append(*batch)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+        tmp_path = self._path("header.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"generation": generation}, f)
+        os.replace(tmp_path, self._path("header.json"))
+        self._refresh()
+
+        # Other processes keep reading their old maps until they next refresh
+        current = {f"snapshot-{generation}", f"delta-{generation}", f"deleted-{generation}.jsonl"}
+        for name in os.listdir(self.persist_directory):
+            if name in current or not name.startswith(("snapshot-", "delta-", "deleted-")):
+                continue
+            path = self._path(name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def create_vector_store(collection_name: str, config: Optional[Dict[str, Any]] = None) -> VectorStore:
+    """
+    Create the vector store selected by rag_settings.vector_store
+
+    Args:
+        collection_name: Collection name
+        config: Application config
+
+    Returns:
+        "chroma" (default), "numpy" or "memmap" vector store; the NumPy
+        store gets the IVF index selected by rag_settings.ann_index and the
+        in-memory encoding selected by rag_settings.quantization, the
+        memmap store the matrix type selected by rag_settings.memmap_dtype
+    """
+    rag_settings = (config or {}).get("rag_settings", {})
+    backend = rag_settings.get("vector_store", "chroma")
+    persist_directory = rag_settings.get("persist_directory", "./chroma_db")
+
+    if backend == "chroma":
+        # Chroma's own HNSW index; ef trades recall for latency
+        hnsw = {
+            f"hnsw:{key}": int(rag_settings[setting])
+            for key, setting in (("M", "hnsw_m"), ("construction_ef", "hnsw_construction_ef"),
+                                 ("search_ef", "hnsw_search_ef"))
+            if rag_settings.get(setting)
+        }
+        return ChromaVectorStore(collection_name, persist_directory, hnsw)
+    if backend == "numpy":
+        path = os.path.abspath(os.path.join(persist_directory, "numpy", collection_name))
+        with _registry_lock:
+            store = _numpy_stores.get(path)
+            if store is None:
+                store = NumpyVectorStore(
+                    path,
+                    ann=create_ann_index(config),
+                    quantization=rag_settings.get("quantization", "float32"),
+                    pq_subvectors=int(rag_settings.get("pq_subvectors", 0)),
+                    rescore_factor=int(rag_settings.get("rescore_factor", DEFAULT_RESCORE_FACTOR))
+                )
+                _numpy_stores[path] = store
+        return store
+    if backend == "memmap":
+        path = os.path.abspath(os.path.join(persist_directory, "memmap", collection_name))
+        with _registry_lock:
+            store = _memmap_stores.get(path)
+            if store is None:
+                store = MemmapVectorStore(path, dtype=rag_settings.get("memmap_dtype", "float32"))
+                _memmap_stores[path] = store
+        return store
+    raise ValueError(f"Unknown vector store backend: {backend}")
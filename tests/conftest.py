@@ -0,0 +1,30 @@
+"""
+Shared fixtures; tests run offline against the NumPy store and local
+hashing embeddings
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rag_memory import RAGMemory
+
+
+@pytest.fixture
+def rag_config(tmp_path):
+    return {
+        "rag_settings": {
+            "vector_store": "numpy",
+            "persist_directory": str(tmp_path / "store"),
+            "embedding_model": "local-hashing",
+            "embedding_dimensions": 64
+        }
+    }
+
+
+@pytest.fixture
+def memory(rag_config):
+    return RAGMemory(collection_name="test", config=rag_config)
@@ -0,0 +1,84 @@
+from src.agent_registry import COMPACT_MIN_RECORDS, COMPACT_RATIO, AgentRegistry
+
+
+def line_count(path) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def test_replay_keeps_latest_record(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    registry.put({"name": "a", "version": 1})
+    registry.put({"name": "b", "version": 1})
+    registry.put({"name": "a", "version": 2})
+    registry.delete("b")
+
+    assert AgentRegistry(registry.path).load() == {"a": {"name": "a", "version": 2}}
+
+
+def test_missing_file_loads_empty(tmp_path):
+    assert AgentRegistry(str(tmp_path / "none" / "agents.jsonl")).load() == {}
+
+
+def test_compact_keeps_live_agents(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    for version in range(5):
+        registry.put({"name": "a", "version": version})
+    registry.put({"name": "b"})
+    registry.delete("b")
+    before = registry.load()
+
+    registry.compact()
+
+    assert line_count(registry.path) == 1
+    assert registry.load() == before
+
+
+def test_load_compacts_mostly_superseded_file(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    for version in range(COMPACT_MIN_RECORDS):
+        registry.put({"name": f"agent{version % 3}", "version": version})
+    agents = registry.load()
+
+    assert line_count(registry.path) == 3
+    assert AgentRegistry(registry.path).load() == agents
+
+
+def test_load_leaves_live_file_alone(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    for i in range(COMPACT_MIN_RECORDS):
+        registry.put({"name": f"agent{i}"})
+    registry.load()
+
+    assert line_count(registry.path) == COMPACT_MIN_RECORDS
+
+
+def test_needs_compaction():
+    assert not AgentRegistry.needs_compaction(COMPACT_MIN_RECORDS - 1, 0)
+    assert AgentRegistry.needs_compaction(COMPACT_MIN_RECORDS, 1)
+    assert not AgentRegistry.needs_compaction(COMPACT_MIN_RECORDS * COMPACT_RATIO - 1, COMPACT_MIN_RECORDS)
+
+
+def test_torn_tail_is_cut_before_appending(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    registry.put({"name": "a"})
+    with open(registry.path, "a", encoding="utf-8") as f:
+        f.write('{"op":"put","agent":{"name":"b"')
+
+    registry = AgentRegistry(registry.path)
+    registry.put({"name": "c"})
+    registry.delete("a")
+
+    assert AgentRegistry(registry.path).load() == {"c": {"name": "c"}}
+
+
+def test_complete_tail_without_newline_is_kept(tmp_path):
+    registry = AgentRegistry(str(tmp_path / "agents.jsonl"))
+    registry.put({"name": "a"})
+    with open(registry.path, "a", encoding="utf-8") as f:
+        f.write('{"op":"put","agent":{"name":"b"}}')
+
+    registry = AgentRegistry(registry.path)
+    registry.put({"name": "c"})
+
+    assert set(AgentRegistry(registry.path).load()) == {"a", "b", "c"}
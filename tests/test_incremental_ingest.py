@@ -0,0 +1,86 @@
+import os
+
+from src.ingestion import IngestManifest, dedupe_chunks, iter_chunks
+
+CHUNKING = {"chunk_size": 200, "chunk_overlap": 20}
+
+
+def write(path, text: str, mtime: float):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def paragraph(topic: str, count: int = 60) -> str:
+    return " ".join(f"{topic}{i}" for i in range(count))
+
+
+def expected_ids(paths, chunk_size=200, chunk_overlap=20):
+    return {chunk.memory_id for chunk in dedupe_chunks(iter_chunks(paths, chunk_size, chunk_overlap))}
+
+
+def assert_stores_exactly(memory, ids):
+    assert memory.store.count() == len(ids)
+    assert set(memory.store.get(ids=sorted(ids))["ids"]) == ids
+
+
+def test_unchanged_files_are_skipped(memory, tmp_path):
+    path = str(tmp_path / "a.txt")
+    write(path, paragraph("alpha"), 1000)
+
+    first = memory.ingest(path, **CHUNKING)
+    second = memory.ingest(path, **CHUNKING)
+
+    assert first.chunks > 0
+    assert second.unchanged_sources == 1 and second.chunks == 0
+    assert_stores_exactly(memory, expected_ids([path]))
+
+
+def test_edited_file_replaces_its_chunks(memory, tmp_path):
+    path = str(tmp_path / "a.txt")
+    write(path, paragraph("alpha") + " " + paragraph("beta"), 1000)
+    memory.ingest(path, **CHUNKING)
+
+    write(path, paragraph("alpha"), 2000)
+    stats = memory.ingest(path, **CHUNKING)
+
+    assert stats.deleted_chunks > 0
+    assert_stores_exactly(memory, expected_ids([path]))
+
+
+def test_chunk_shared_with_another_file_is_kept(memory, tmp_path):
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    write(a, paragraph("gamma"), 1000)
+    write(b, paragraph("gamma"), 1000)
+    memory.ingest([a, b], **CHUNKING)
+
+    write(a, paragraph("delta"), 2000)
+    stats = memory.ingest([a, b], **CHUNKING)
+
+    assert stats.deleted_chunks == 0
+    assert_stores_exactly(memory, expected_ids([a, b]))
+
+
+def test_prune_deletes_chunks_of_removed_files(memory, tmp_path):
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    write(a, paragraph("alpha"), 1000)
+    write(b, paragraph("beta"), 1000)
+    memory.ingest([a, b], **CHUNKING)
+
+    os.remove(b)
+    stats = memory.ingest([a], **CHUNKING)
+
+    assert stats.removed_sources == 1
+    assert_stores_exactly(memory, expected_ids([a]))
+    assert list(IngestManifest(memory.manifest_path).sources) == [os.path.abspath(a)]
+
+
+def test_chunking_change_rechunks_unchanged_files(memory, tmp_path):
+    path = str(tmp_path / "a.txt")
+    write(path, paragraph("alpha", 200), 1000)
+    memory.ingest(path, **CHUNKING)
+
+    stats = memory.ingest(path, chunk_size=500, chunk_overlap=0)
+
+    assert stats.unchanged_sources == 0 and stats.deleted_chunks > 0
+    assert_stores_exactly(memory, expected_ids([path], 500, 0))
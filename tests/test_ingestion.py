@@ -0,0 +1,68 @@
+import io
+import random
+
+import pytest
+
+from src import ingestion
+from src.ingestion import chunk_text, extract_text
+
+
+def words(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def test_chunks_respect_size_and_keep_word_order():
+    text = " ".join(words(5000))
+    chunks = list(chunk_text([text], chunk_size=300, chunk_overlap=0))
+
+    assert all(0 < len(chunk) <= 300 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_consecutive_chunks_overlap():
+    text = " ".join(words(5000))
+    chunks = list(chunk_text([text], chunk_size=300, chunk_overlap=60))
+
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    restored = chunks[0]
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # Each chunk starts with (at most chunk_overlap of) the previous one's end
+        shared = max(k for k in range(61) if previous.endswith(chunk[:k]))
+        assert shared > 0
+        restored += chunk[shared:]
+    assert restored.split() == text.split()
+
+
+def test_whitespace_is_collapsed():
+    assert list(chunk_text(["  one\n\n two\t", "three  "], chunk_size=100, chunk_overlap=0)) == ["one two three"]
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(0, 0), (100, 100), (100, -1)])
+def test_invalid_chunking_is_rejected(chunk_size, chunk_overlap):
+    with pytest.raises(ValueError):
+        list(chunk_text(["text"], chunk_size=chunk_size, chunk_overlap=chunk_overlap))
+
+
+@pytest.mark.parametrize("read_size", [13, 100, 4096])
+def test_words_stay_whole_across_reads(monkeypatch, read_size):
+    monkeypatch.setattr(ingestion, "TEXT_READ_SIZE", read_size)
+    source = words(20000)
+    text = " ".join(source) + "\n"
+
+    blocks = list(extract_text(io.StringIO(text), "text"))
+    assert "".join(blocks) == text
+    assert all(blocks)
+
+    chunks = chunk_text(extract_text(io.StringIO(text), "text"), chunk_size=500, chunk_overlap=0)
+    assert " ".join(chunks).split() == source
+
+
+def test_long_run_without_whitespace_stays_bounded(monkeypatch):
+    monkeypatch.setattr(ingestion, "TEXT_READ_SIZE", 1024)
+    text = "a " + "x" * 200000
+
+    blocks = list(extract_text(io.StringIO(text), "text"))
+
+    assert "".join(blocks) == text
+    assert all(0 < len(block) < 2 * 1024 for block in blocks)
@@ -0,0 +1,76 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.memory_ids import (
+    ENCODED_LENGTH,
+    MemoryIdGenerator,
+    memory_id_timestamp,
+    new_memory_id,
+    new_memory_ids
+)
+
+
+def test_ids_increase_within_a_thread():
+    ids = new_memory_ids(10000)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_ids_are_unique_across_threads():
+    threads, per_thread = 16, 2000
+    barrier = threading.Barrier(threads)
+
+    def worker(_):
+        barrier.wait()
+        return [new_memory_id() for _ in range(per_thread)]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        sequences = list(pool.map(worker, range(threads)))
+
+    assert all(ids == sorted(ids) for ids in sequences)
+    assert len({memory_id for ids in sequences for memory_id in ids}) == threads * per_thread
+
+
+def test_generators_do_not_collide():
+    first, second = MemoryIdGenerator(), MemoryIdGenerator()
+    ids = first.new_ids(1000) + second.new_ids(1000)
+    assert len(set(ids)) == len(ids)
+
+
+def test_ids_survive_a_wall_clock_step_back(monkeypatch):
+    generator = MemoryIdGenerator()
+    before = generator.new_ids(100)
+    monkeypatch.setattr(time, "time_ns", lambda: 0)
+    after = generator.new_ids(100)
+    assert before + after == sorted(before + after)
+
+
+def _child_ids(queue):
+    queue.put(new_memory_ids(1000))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_children_reseed():
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    new_memory_ids(10)  # Advance the parent's sequence before forking
+    children = [context.Process(target=_child_ids, args=(queue,)) for _ in range(4)]
+    for child in children:
+        child.start()
+    ids = [memory_id for _ in children for memory_id in queue.get(timeout=30)]
+    for child in children:
+        child.join()
+    ids += new_memory_ids(1000)
+    assert len(set(ids)) == len(ids)
+
+
+def test_prefix_and_timestamp():
+    memory_id = new_memory_id()
+    assert memory_id.startswith("mem_") and len(memory_id) == len("mem_") + ENCODED_LENGTH
+    assert len(new_memory_id(prefix="")) == ENCODED_LENGTH
+    assert abs(memory_id_timestamp(memory_id) - datetime.now()) < timedelta(seconds=5)